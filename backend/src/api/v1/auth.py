@@ -7,7 +7,7 @@ Security Features:
     - HttpOnly cookies for token storage (XSS protection)
     - JWT tokens with unique JTI for precise invalidation
     - Token rotation on refresh (prevents replay attacks)
-    - Bcrypt password hashing with 12 rounds
+    - Argon2id password hashing (legacy bcrypt hashes upgraded on login)
     - Secure cookie flags (Secure, SameSite=lax)
     - Access tokens (30min TTL) and refresh tokens (7-day TTL)
 
@@ -23,7 +23,7 @@ Token Management:
     - Refresh tokens: Long-lived (7 days) for token renewal
     - JTI tracking: Unique IDs allow precise token invalidation
     - Token rotation: Old refresh tokens invalidated on use
-    - In-memory blacklist: Invalidated tokens tracked (use Redis in production)
+    - Redis blacklist: Invalidated JTIs expire together with their tokens
 
 Cookie Security:
     - HttpOnly: Prevents JavaScript access (XSS protection)
@@ -34,19 +34,22 @@ Cookie Security:
 Dependencies:
     - FastAPI for routing and dependency injection
     - SQLAlchemy for database operations
-    - Jose for JWT token handling
+    - PyJWT for token verification; tokens are signed with a pre-keyed HMAC
+      (services.auth_service)
     - Passlib for password hashing
     - Pydantic for request/response validation
 """
 
 import logging
+import time
 
 from core.config import settings
 from core.dependencies import get_current_active_user
-from database import get_db
+from core.error_handlers import ErrorMap, handle_auth_errors
+from database import get_async_db
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
-from jose import JWTError
+from jwt import PyJWTError
 from models.user import User
 from pydantic import ValidationError
 from api.v1.docs.auth_docs import signup_docs, login_docs
@@ -58,76 +61,179 @@ from schemas.auth import (
     UserResponse,
 )
 from services.auth_service import (
-    TOKEN_TYPE_ACCESS,
     TOKEN_TYPE_REFRESH,
     AuthService,
     UserService,
 )
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+# Cookie attributes derived from settings once at import
+_ACCESS_MAX_AGE = settings.access_token_expire_minutes * 60
+_REFRESH_MAX_AGE = settings.refresh_token_expire_days * 24 * 60 * 60
+_SECURE_COOKIES = settings.is_production
 
-def _safely_invalidate_token(token: str | None, token_type: str) -> None:
-    """Safely invalidate a token with proper error handling.
 
-    This helper function attempts to invalidate a token and logs any errors
+def _cookie_attributes(max_age: int, samesite: str) -> str:
+    """Build the static attribute suffix of an auth Set-Cookie header"""
+    attributes = f"; HttpOnly; Max-Age={max_age}; Path=/; SameSite={samesite}"
+    return attributes + ("; Secure" if _SECURE_COOKIES else "")
+
+
+# (access, refresh) Set-Cookie suffixes per SameSite policy
+_COOKIE_SUFFIXES = {
+    samesite: (
+        _cookie_attributes(_ACCESS_MAX_AGE, samesite),
+        _cookie_attributes(_REFRESH_MAX_AGE, samesite),
+    )
+    for samesite in ("lax", "strict")
+}
+
+
+def _set_auth_cookies(
+    response: Response, access_token: str, refresh_token: str, samesite: str = "lax"
+) -> None:
+    """Set the access and refresh token cookies on a response.
+
+    Equivalent to two ``response.set_cookie`` calls, but appends pre-built
+    headers directly instead of serializing a SimpleCookie per request. JWTs
+    only contain URL-safe characters, so no cookie-value quoting is needed.
+
+    Args:
+        response: FastAPI response object for setting cookies.
+        access_token: Encoded access token.
+        refresh_token: Encoded refresh token.
+        samesite: SameSite policy, either "lax" or "strict".
+    """
+    access_suffix, refresh_suffix = _COOKIE_SUFFIXES[samesite]
+    response.raw_headers.append(
+        (b"set-cookie", f"access_token={access_token}{access_suffix}".encode())
+    )
+    response.raw_headers.append(
+        (b"set-cookie", f"refresh_token={refresh_token}{refresh_suffix}".encode())
+    )
+
+
+# Exception -> HTTP error mappings for the auth routes (see core.error_handlers).
+# IntegrityError on signup is handled inline to report the conflicting field.
+_SIGNUP_ERRORS: ErrorMap = {
+    ValidationError: (status.HTTP_400_BAD_REQUEST, "Invalid user data: {exc}"),
+    SQLAlchemyError: (
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        "Database error occurred while creating user account",
+    ),
+    ValueError: (status.HTTP_400_BAD_REQUEST, "Invalid input: {exc}"),
+}
+_LOGIN_ERRORS: ErrorMap = {
+    SQLAlchemyError: (
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        "Database error during login",
+    ),
+}
+_REFRESH_ERRORS: ErrorMap = {
+    PyJWTError: (status.HTTP_401_UNAUTHORIZED, "Invalid or expired refresh token"),
+    ValueError: (status.HTTP_401_UNAUTHORIZED, "Invalid refresh token format"),
+    KeyError: (status.HTTP_401_UNAUTHORIZED, "Malformed refresh token"),
+    AttributeError: (status.HTTP_401_UNAUTHORIZED, "Malformed refresh token"),
+    SQLAlchemyError: (
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        "Database error during token refresh",
+    ),
+}
+
+
+# Browsers may reuse a /me response briefly and revalidate it via its ETag
+_ME_CACHE_CONTROL = "private, max-age=30"
+
+
+def _user_etag(user: User) -> str:
+    """Weak ETag for a user's profile, changing whenever the row is updated"""
+    changed_at = user.updated_at or user.created_at
+    return f'W/"{user.id}-{changed_at.timestamp() if changed_at else 0}"'
+
+
+def _conflicting_field(exc: IntegrityError) -> str | None:
+    """Return the user field ("email" or "username") behind a unique violation.
+
+    Uses the constraint name reported by PostgreSQL, falling back to the error
+    message for other backends (e.g. SQLite's "UNIQUE constraint failed: users.email").
+    """
+    diag = getattr(exc.orig, "diag", None)
+    source = getattr(diag, "constraint_name", None) or str(exc.orig)
+    for field in ("email", "username"):
+        if field in source:
+            return field
+    return None
+
+
+async def _safely_invalidate_tokens(tokens: list[tuple[str | None, str]]) -> None:
+    """Safely invalidate tokens with proper error handling.
+
+    This helper function attempts to invalidate each token and logs any errors
     that occur during the process. It's designed to be used during logout
     where token invalidation failure shouldn't prevent successful logout.
+    All valid tokens are blacklisted together in a single round trip.
+
+    The tokens are being discarded anyway, so their claims are read without
+    verifying the signature. Expiry is capped at the longest token lifetime so
+    forged claims cannot pin blacklist entries indefinitely.
 
     Args:
-        token: The token string to invalidate, or None if no token.
-        token_type: The type of token (TOKEN_TYPE_ACCESS or TOKEN_TYPE_REFRESH) for logging.
+        tokens: (token, token_type) pairs, where token may be None if absent and
+            token_type is "access" or "refresh" (used for logging).
     """
-    if not token:
-        return
-
-    try:
-        # Use appropriate constant based on token_type string
-        token_type_const = (
-            TOKEN_TYPE_ACCESS if token_type == "access" else TOKEN_TYPE_REFRESH
-        )
-        payload = AuthService.verify_token(token, token_type=token_type_const)
-        if payload:
-            jti = payload.get("jti")
+    max_exp = int(time.time()) + _REFRESH_MAX_AGE
+    entries: list[tuple[str, int]] = []
+    for token, token_type in tokens:
+        if not token:
+            continue
+
+        try:
+            claims = AuthService.get_unverified_claims(token)
+            jti = claims.get("jti")
             if jti:
-                AuthService.invalidate_token(jti)
-                logger.debug(
-                    f"Successfully invalidated {token_type} token with JTI: {jti}"
-                )
+                entries.append((jti, min(int(claims["exp"]), max_exp)))
             else:
                 logger.warning(f"No JTI found in {token_type} token payload")
-        else:
-            # Token is already invalid/expired, which is acceptable during logout
+        except PyJWTError as exc:
+            # Malformed tokens are acceptable during logout
+            logger.debug(f"JWT error during {token_type} token invalidation: {exc}")
+        except (ValueError, TypeError) as exc:
+            # Token format/parsing errors
             logger.debug(
-                f"Token verification failed for {token_type} token (likely expired/invalid)"
+                f"Token format error during {token_type} token invalidation: {exc}"
             )
-    except JWTError as exc:
-        # JWT-specific errors (expired, invalid signature, malformed, etc.)
-        logger.debug(f"JWT error during {token_type} token invalidation: {exc}")
-    except ValueError as exc:
-        # Token format/parsing errors
+        except (KeyError, AttributeError) as exc:
+            # Missing required fields in token payload
+            logger.warning(
+                f"Token payload structure error for {token_type} token: {exc}"
+            )
+
+    if not entries:
+        return
+
+    try:
+        await AuthService.invalidate_tokens(entries)
         logger.debug(
-            f"Token format error during {token_type} token invalidation: {exc}"
+            f"Successfully invalidated tokens with JTIs: {[e[0] for e in entries]}"
         )
-    except (KeyError, AttributeError) as exc:
-        # Missing required fields in token payload
-        logger.warning(f"Token payload structure error for {token_type} token: {exc}")
     except Exception as exc:
-        # Last resort for truly unexpected errors - should be rare
+        # Last resort for truly unexpected errors (e.g. blacklist store unreachable)
         logger.error(
-            f"Unexpected error invalidating {token_type} token: {exc.__class__.__name__}: {exc}",
+            f"Unexpected error invalidating tokens: {exc.__class__.__name__}: {exc}",
             exc_info=True,
         )
 
 
 @router.post("/signup", response_model=SignupResponse, **signup_docs)
+@handle_auth_errors(_SIGNUP_ERRORS)
 async def signup(
-    user_data: UserCreate, response: Response, db: Session = Depends(get_db)
+    user_data: UserCreate, response: Response, db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new user account and set secure HttpOnly cookies.
 
@@ -139,105 +245,62 @@ async def signup(
         user_data (UserCreate): User registration data including email, username,
             password, and optional full_name.
         response (Response): FastAPI response object for setting cookies.
-        db (Session): Database session dependency for user operations.
+        db (AsyncSession): Database session dependency for user operations.
 
     Returns:
         SignupResponse: Contains success message and created user information.
 
     Raises:
-        HTTPException: 400 if user with email/username already exists.
+        HTTPException: 409 if user with email/username already exists.
         HTTPException: 500 if user creation fails due to internal error.
 
     Security:
-        - Passwords are hashed using bcrypt with 12 rounds
+        - Passwords are hashed using argon2id
         - Access tokens expire in 30 minutes
         - Refresh tokens expire in 7 days
         - Cookies are HttpOnly, Secure (in production), and SameSite=lax
     """
-    # Check if user already exists
-    if UserService.user_exists(db, user_data.email, user_data.username):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User with this email or username already exists",
-        )
-
-    # Create new user
+    # Create new user; uniqueness is enforced by the database constraints
     try:
-        user = UserService.create_user(
+        user = await UserService.create_user(
             db=db,
             email=user_data.email,
             username=user_data.username,
             password=user_data.password,
             full_name=user_data.full_name,
         )
-
-        # Create tokens
-        access_token, access_jti = AuthService.create_access_token(
-            data={"sub": user.username}
-        )
-        refresh_token, refresh_jti = AuthService.create_refresh_token(
-            data={"sub": user.username}
-        )
-
-        # Set HttpOnly cookies
-        response.set_cookie(
-            key="access_token",
-            value=access_token,
-            max_age=settings.access_token_expire_minutes * 60,
-            httponly=True,
-            secure=settings.environment == "production",
-            samesite="lax",
-        )
-        response.set_cookie(
-            key="refresh_token",
-            value=refresh_token,
-            max_age=settings.refresh_token_expire_days * 24 * 60 * 60,
-            httponly=True,
-            secure=settings.environment == "production",
-            samesite="lax",
-        )
-
-        logger.info(
-            f"New user account created successfully: {user.username} ({user.email})"
-        )
-        return SignupResponse(
-            message="User created successfully", user=UserResponse.model_validate(user)
-        )
-    except ValidationError as exc:
-        # Handle Pydantic validation errors
-        logger.warning(f"User data validation error during signup: {exc}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid user data: {exc}",
-        )
     except IntegrityError as exc:
         # Handle database constraint violations (e.g., unique email/username)
         logger.warning(f"Database integrity error during signup: {exc}")
+        field = _conflicting_field(exc)
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User with this email or username may already exist",
-        )
-    except SQLAlchemyError as exc:
-        # Handle other database-related errors
-        logger.error(f"Database error during user creation: {exc}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error occurred while creating user account",
-        )
-    except ValueError as exc:
-        # Handle other validation issues
-        logger.warning(f"Value error during signup: {exc}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid input: {exc}",
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{field.capitalize()} already exists"
+            if field
+            else "User with this email or username already exists",
         )
 
+    # Create tokens
+    access_token, access_jti, refresh_token, refresh_jti = (
+        AuthService.create_token_pair(user.username)
+    )
+
+    # Set HttpOnly cookies
+    _set_auth_cookies(response, access_token, refresh_token)
+
+    logger.info(
+        f"New user account created successfully: {user.username} ({user.email})"
+    )
+    # response_model validates the ORM user once (from_attributes)
+    return {"message": "User created successfully", "user": user}
+
 
 @router.post("/login", response_model=LoginResponse, **login_docs)
+@handle_auth_errors(_LOGIN_ERRORS)
 async def login(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Authenticate user and set secure HttpOnly cookies.
 
@@ -248,7 +311,7 @@ async def login(
         response (Response): FastAPI response object for setting cookies.
         form_data (OAuth2PasswordRequestForm): OAuth2 compatible form with
             username and password fields.
-        db (Session): Database session dependency for user operations.
+        db (AsyncSession): Database session dependency for user operations.
 
     Returns:
         LoginResponse: Contains success message and authenticated user information.
@@ -258,12 +321,14 @@ async def login(
         HTTPException: 400 if user account is inactive.
 
     Security:
-        - Uses bcrypt for password verification
+        - Uses argon2id for password verification (bcrypt hashes are upgraded)
         - Generates JWT tokens with unique JTI for invalidation
         - Sets HttpOnly cookies with appropriate security flags
         - Access tokens expire in 30 minutes, refresh tokens in 7 days
     """
-    user = UserService.authenticate_user(db, form_data.username, form_data.password)
+    user = await UserService.authenticate_user(
+        db, form_data.username, form_data.password
+    )
 
     if not user:
         raise HTTPException(
@@ -277,41 +342,22 @@ async def login(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user account"
         )
 
-    # Create tokens with JTI
-    access_token, access_jti = AuthService.create_access_token(
-        data={"sub": user.username}
-    )
-    refresh_token, refresh_jti = AuthService.create_refresh_token(
-        data={"sub": user.username}
+    # Create tokens
+    access_token, access_jti, refresh_token, refresh_jti = (
+        AuthService.create_token_pair(user.username)
     )
 
     # Set HttpOnly cookies
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        max_age=settings.access_token_expire_minutes * 60,
-        httponly=True,
-        secure=settings.environment == "production",
-        samesite="strict",
-    )
-    response.set_cookie(
-        key="refresh_token",
-        value=refresh_token,
-        max_age=settings.refresh_token_expire_days * 24 * 60 * 60,
-        httponly=True,
-        secure=settings.environment == "production",
-        samesite="strict",
-    )
+    _set_auth_cookies(response, access_token, refresh_token, samesite="strict")
 
     logger.info(f"User login successful: {user.username}")
-    return LoginResponse(
-        message="Login successful", user=UserResponse.model_validate(user)
-    )
+    return {"message": "Login successful", "user": user}
 
 
 @router.post("/refresh", response_model=RefreshResponse)
+@handle_auth_errors(_REFRESH_ERRORS)
 async def refresh_token(
-    request: Request, response: Response, db: Session = Depends(get_db)
+    request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
 ):
     """Refresh access token using refresh token from HttpOnly cookie.
 
@@ -322,7 +368,7 @@ async def refresh_token(
     Args:
         request (Request): FastAPI request object for reading cookies.
         response (Response): FastAPI response object for setting new cookies.
-        db (Session): Database session dependency for user validation.
+        db (AsyncSession): Database session dependency for user validation.
 
     Returns:
         RefreshResponse: Contains success message confirming token refresh.
@@ -349,107 +395,66 @@ async def refresh_token(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token not found"
         )
 
-    try:
-        # Verify refresh token
-        payload = AuthService.verify_token(refresh_token, token_type=TOKEN_TYPE_REFRESH)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
-            )
-
-        username = payload.get("sub")
-        if not username:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
-            )
-
-        # Get user
-        user = UserService.get_user_by_username(db, username)
-        if not user or not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found or inactive",
-            )
-
-        # Invalidate old refresh token (token rotation for security)
-        old_jti = payload.get("jti")
-        if old_jti:
-            AuthService.invalidate_token(old_jti)
-
-        # Create new tokens
-        new_access_token, access_jti = AuthService.create_access_token(
-            data={"sub": username}
-        )
-        new_refresh_token, refresh_jti = AuthService.create_refresh_token(
-            data={"sub": username}
-        )
-
-        # Set new HttpOnly cookies
-        response.set_cookie(
-            key="access_token",
-            value=new_access_token,
-            max_age=settings.access_token_expire_minutes * 60,
-            httponly=True,
-            secure=settings.environment == "production",
-            samesite="lax",
-        )
-        response.set_cookie(
-            key="refresh_token",
-            value=new_refresh_token,
-            max_age=settings.refresh_token_expire_days * 24 * 60 * 60,
-            httponly=True,
-            secure=settings.environment == "production",
-            samesite="lax",
+    # Verify refresh token
+    payload = await AuthService.verify_token(
+        refresh_token, token_type=TOKEN_TYPE_REFRESH
+    )
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
         )
 
-        logger.info(f"Token refresh successful for user: {username}")
-        return RefreshResponse(message="Tokens refreshed successfully")
-
-    except HTTPException:
-        # Re-raise HTTP exceptions (these are expected and handled by FastAPI)
-        raise
-    except JWTError as exc:
-        # Handle JWT-specific errors (expired, invalid signature, etc.)
-        logger.warning(f"JWT error during token refresh: {exc}")
+    username = payload.get("sub")
+    if not username:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired refresh token",
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
         )
-    except ValueError as exc:
-        # Handle token format/validation errors
-        logger.warning(f"Token validation error during refresh: {exc}")
+
+    # Get user
+    user = await UserService.get_user_by_username(db, username)
+    if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid refresh token format",
-        )
-    except (KeyError, AttributeError) as exc:
-        # Handle missing fields in token payload
-        logger.warning(f"Token payload structure error during refresh: {exc}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Malformed refresh token"
-        )
-    except SQLAlchemyError as exc:
-        # Handle database errors during user lookup
-        logger.error(f"Database error during token refresh: {exc}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error during token refresh",
+            detail="User not found or inactive",
         )
 
+    # Invalidate old refresh token (token rotation for security)
+    old_jti = payload.get("jti")
+    if old_jti:
+        await AuthService.invalidate_token(old_jti, payload["exp"])
+
+    # Create new tokens
+    new_access_token, access_jti, new_refresh_token, refresh_jti = (
+        AuthService.create_token_pair(username)
+    )
+
+    # Set HttpOnly cookies
+    _set_auth_cookies(response, new_access_token, new_refresh_token)
+
+    logger.info(f"Token refresh successful for user: {username}")
+    return RefreshResponse(message="Tokens refreshed successfully")
+
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_info(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+):
     """Get current authenticated user information.
 
     This endpoint returns the profile information of the currently authenticated user.
     Authentication is handled automatically through HttpOnly cookies or Authorization header.
 
     Args:
+        request (Request): FastAPI request object for reading If-None-Match.
+        response (Response): FastAPI response object for caching headers.
         current_user (User): Current authenticated and active user from dependency.
 
     Returns:
         UserResponse: User profile information including id, email, username,
-            full_name, account status, and timestamps.
+            full_name, account status, and timestamps. An empty 304 response if
+            the client's cached copy (ETag) is still current.
 
     Raises:
         HTTPException: 401 if user is not authenticated (handled by dependency).
@@ -459,8 +464,20 @@ async def get_current_user_info(current_user: User = Depends(get_current_active_
         - Requires valid access token (from cookie or Authorization header)
         - Only returns information for active user accounts
         - No sensitive information (like password hashes) included in response
+        - Cache-Control is private, so shared caches never store the profile
     """
-    return UserResponse.model_validate(current_user)
+    headers = {
+        "Cache-Control": _ME_CACHE_CONTROL,
+        "ETag": _user_etag(current_user),
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and headers["ETag"] in (
+        tag.strip() for tag in if_none_match.split(",")
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return current_user
 
 
 @router.post("/logout")
@@ -494,8 +511,9 @@ async def logout(request: Request, response: Response):
     refresh_token = request.cookies.get("refresh_token")
 
     # Safely invalidate tokens using helper function
-    _safely_invalidate_token(access_token, "access")
-    _safely_invalidate_token(refresh_token, "refresh")
+    await _safely_invalidate_tokens(
+        [(access_token, "access"), (refresh_token, "refresh")]
+    )
 
     # Clear cookies
     response.delete_cookie(key="access_token", httponly=True, samesite="lax")
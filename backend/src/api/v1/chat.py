@@ -1,11 +1,12 @@
 import logging
 import uuid
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from typing import Awaitable, Callable, List, Optional, TypeVar
 
-from database import get_db
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db
 from core.dependencies import get_current_active_user
 from models.user import User
 
@@ -13,25 +14,44 @@ from models.user import User
 router = APIRouter(prefix="/chat", tags=["Chat"])
 logger = logging.getLogger(__name__)
 
-# Pydantic models for requests/responses
-class CreateChatSessionRequest(BaseModel):
+# Request bodies are decoded straight from bytes by msgspec
+class CreateChatSessionRequest(msgspec.Struct):
     name: Optional[str] = None
     document_ids: Optional[List[int]] = None
 
-class SendMessageRequest(BaseModel):
+class SendMessageRequest(msgspec.Struct):
     message: str
     session_id: str
 
-class SearchDocumentsRequest(BaseModel):
+class SearchDocumentsRequest(msgspec.Struct):
     query: str
     limit: Optional[int] = 10
     document_ids: Optional[List[int]] = None
-    
+
+
+T = TypeVar("T")
+
+
+def _json_body(struct_type: type[T]) -> Callable[[Request], Awaitable[T]]:
+    """Build a dependency that decodes the JSON request body into struct_type"""
+    decoder = msgspec.json.Decoder(struct_type)
+
+    async def parse(request: Request) -> T:
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+            )
+
+    return parse
+
+
 
 @router.post("/sessions", status_code=status.HTTP_201_CREATED)
 async def create_chat_session(
-    request: CreateChatSessionRequest,
-    db: Session = Depends(get_db),
+    request: CreateChatSessionRequest = Depends(_json_body(CreateChatSessionRequest)),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
@@ -42,8 +62,8 @@ async def create_chat_session(
 
 @router.post("/message", status_code=status.HTTP_200_OK)
 async def send_message(
-    request: SendMessageRequest,
-    db: Session = Depends(get_db),
+    request: SendMessageRequest = Depends(_json_body(SendMessageRequest)),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
@@ -54,8 +74,8 @@ async def send_message(
 
 @router.post("/search", status_code=status.HTTP_200_OK)
 async def search_documents(
-    request: SearchDocumentsRequest,
-    db: Session = Depends(get_db),
+    request: SearchDocumentsRequest = Depends(_json_body(SearchDocumentsRequest)),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
@@ -68,7 +88,7 @@ async def search_documents(
 async def list_chat_sessions(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """List all chat sessions for the user."""
@@ -79,7 +99,7 @@ async def get_chat_history(
     session_id: str,
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get chat history for a session."""
@@ -88,7 +108,7 @@ async def get_chat_history(
 @router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_chat_session(
     session_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Delete a chat session."""
@@ -4,6 +4,7 @@ signup_docs = {
     "responses": {
         200: {"description": "User signed up successfully"},
         400: {"description": "Invalid input"},
+        409: {"description": "Email or username already registered"},
     },
 }
 
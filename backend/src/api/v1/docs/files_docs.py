@@ -3,25 +3,42 @@ upload_file_docs = {
     "description": """
     Upload a PDF document for processing and analysis. The endpoint will:
     - Validate the PDF file (type, size, structure)
-    - Extract bibliographic metadata using pdf2bib
-    - Convert PDF content to markdown using Mistral API
-    - Store the document in vector database for semantic search
-    - Save document metadata to SQL database
+    - Store the file and create a document record with status "pending"
+    - Queue background processing, which extracts bibliographic metadata
+      (pdf2bib), converts the PDF to markdown (Mistral API) and indexes it
+      in the vector database
+    
+    Returns 202 immediately; track progress via GET /files/upload/{document_id}/status.
     
     Maximum file size: 50MB
     Supported formats: PDF only
     """,
+    # The body is streamed by the handler, so describe it explicitly
+    "openapi_extra": {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"]
+                    }
+                }
+            }
+        }
+    },
     "responses": {
-        201: {
-            "description": "File uploaded and processed successfully",
+        202: {
+            "description": "File uploaded and queued for processing",
             "content": {
                 "application/json": {
                     "example": {
-                        "message": "Upload completed",
+                        "message": "Upload accepted for processing",
                         "user_id": 1,
                         "document_id": 123,
                         "filename": "research_paper.pdf",
-                        "title": "Machine Learning in Healthcare: A Comprehensive Review"
+                        "status": "pending"
                     }
                 }
             }
@@ -46,6 +63,10 @@ upload_file_docs = {
                         "suspicious_content": {
                             "summary": "Suspicious content",
                             "value": {"detail": "PDF contains suspicious content"}
+                        },
+                        "invalid_content_length": {
+                            "summary": "Invalid Content-Length header",
+                            "value": {"detail": "Invalid Content-Length header"}
                         }
                     }
                 }
@@ -174,4 +195,42 @@ get_upload_status_docs = {
             }
         }
     }
-}
\ No newline at end of file
+}
+
+get_upload_events_docs = {
+    "summary": "Stream Document Processing Events",
+    "description": """
+    Server-Sent Events stream of a document's processing status. Prefer this
+    over polling the status endpoint.
+    
+    The first event carries the current state; subsequent events are pushed at
+    each pipeline stage ("started", "markdown_ready", "completed" or "failed").
+    The stream closes once the document is completed or has failed.
+    """,
+    "responses": {
+        200: {
+            "description": "Event stream",
+            "content": {
+                "text/event-stream": {
+                    "example": 'event: status\ndata: {"document_id": 123, "stage": "markdown_ready", "status": "processing", "progress": 0.7, "status_message": "Indexing document"}\n\n'
+                }
+            }
+        },
+        401: {
+            "description": "Authentication required",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Not authenticated"}
+                }
+            }
+        },
+        404: {
+            "description": "Document not found",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Document not found"}
+                }
+            }
+        }
+    }
+}
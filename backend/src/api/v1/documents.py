@@ -1,62 +1,80 @@
 import logging
 from uuid import UUID
-from typing import List, Optional
-from database import get_db
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from core.dependencies import get_current_active_user
-from models.user import User
-from models.document import Document
-from services.document_service import get_document_service, DocumentService
-from schemas.file import DocumentStatusResponse
-
-router = APIRouter(prefix="/documents", tags=["Documents"])
+from typing import AsyncIterator, List, Optional
+import orjson
+from database import AsyncSessionLocal
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+
+from core.dependencies import CurrentUser, DocumentServiceDep, get_current_active_user
+from services.document_service import DocumentService
+
+# Every document route requires an authenticated, active user
+router = APIRouter(
+    prefix="/documents",
+    tags=["Documents"],
+    dependencies=[Depends(get_current_active_user)],
+)
 logger = logging.getLogger(__name__)
 
 
+def _listing_response(rows) -> Response:
+    """Serialize listing rows straight to JSON, skipping response validation.
+
+    Rows are already shaped and their timestamps formatted by the query.
+    """
+    return Response(orjson.dumps(rows, default=dict), media_type="application/json")
+
+
+async def _stream_user_documents(
+    user_id: int, limit: int, offset: int, before: Optional[int]
+) -> AsyncIterator[bytes]:
+    """Encode a user's listing rows as a JSON array while they are fetched.
+
+    Dependency sessions are closed before a streamed body is sent, so the
+    generator opens its own.
+    """
+    async with AsyncSessionLocal() as db:
+        yield b"["
+        rows = DocumentService(db).iter_user_documents(user_id, limit, offset, before)
+        first = True
+        async for row in rows:
+            if not first:
+                yield b","
+            first = False
+            yield orjson.dumps(row, default=dict)
+        yield b"]"
+
+
 @router.get("/", response_model=List[dict])
-def get_user_documents(
+async def get_user_documents(
+    current_user: CurrentUser,
     limit: int = 100,
     offset: int = 0,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    before: Optional[int] = None,
 ):
-    """Get all documents for the current user with pagination"""
-    
-    document_service = get_document_service(db)
-    documents = document_service.get_user_documents(
-        user_id=current_user.id,
-        limit=limit,
-        offset=offset
+    """Get all documents for the current user with pagination
+
+    Pass the ID of the last document received as ``before`` to fetch the
+    next page without an offset. Rows are streamed, so memory use stays flat
+    for large pages.
+    """
+    
+    return StreamingResponse(
+        _stream_user_documents(current_user.id, limit, offset, before),
+        media_type="application/json",
     )
-    
-    return [
-        {
-            "id": str(doc.id),
-            "filename": doc.filename,
-            "title": doc.title,
-            "description": doc.description,
-            "file_size": doc.file_size,
-            "mime_type": doc.mime_type,
-            "created_at": doc.created_at.isoformat() if doc.created_at else None,
-            "updated_at": doc.updated_at.isoformat() if doc.updated_at else None,
-            "metadata": doc.metadata
-        }
-        for doc in documents
-    ]
 
 
 @router.get("/{document_id}")
-def get_document(
+async def get_document(
     document_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    document_service: DocumentServiceDep,
+    current_user: CurrentUser,
 ):
     """Get a specific document by ID"""
     
-    document_service = get_document_service(db)
-    document = document_service.get_document(document_id, current_user.id)
+    document = await document_service.get_document(document_id, current_user.id)
     
     if not document:
         raise HTTPException(
@@ -72,24 +90,22 @@ def get_document(
         "file_size": document.file_size,
         "mime_type": document.mime_type,
         "file_path": document.file_path,
-        "created_at": document.created_at.isoformat() if document.created_at else None,
-        "updated_at": document.updated_at.isoformat() if document.updated_at else None,
+        "created_at": document.created_at,
+        "updated_at": document.updated_at,
         "metadata": document.metadata
     }
 
 
 @router.put("/{document_id}")
-def update_document(
+async def update_document(
     document_id: UUID,
+    document_service: DocumentServiceDep,
+    current_user: CurrentUser,
     title: Optional[str] = None,
     description: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
 ):
     """Update a document's metadata"""
     
-    document_service = get_document_service(db)
-    
     updates = {}
     if title is not None:
         updates["title"] = title
@@ -102,7 +118,7 @@ def update_document(
             detail="No update fields provided"
         )
     
-    document = document_service.update_document(
+    document = await document_service.update_document(
         document_id=document_id,
         user_id=current_user.id,
         **updates
@@ -119,20 +135,19 @@ def update_document(
         "filename": document.filename,
         "title": document.title,
         "description": document.description,
-        "updated_at": document.updated_at.isoformat() if document.updated_at else None
+        "updated_at": document.updated_at
     }
 
 
 @router.delete("/{document_id}")
-def delete_document(
+async def delete_document(
     document_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    document_service: DocumentServiceDep,
+    current_user: CurrentUser,
 ):
     """Delete a document"""
     
-    document_service = get_document_service(db)
-    success = document_service.delete_document(document_id, current_user.id)
+    success = await document_service.delete_document(document_id, current_user.id)
     
     if not success:
         raise HTTPException(
@@ -143,30 +158,18 @@ def delete_document(
     return {"message": "Document deleted successfully"}
 
 
-@router.get("/search/{search_term}")
-def search_documents(
+@router.get("/search/{search_term}", response_model=List[dict])
+async def search_documents(
     search_term: str,
+    document_service: DocumentServiceDep,
+    current_user: CurrentUser,
     limit: int = 50,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
 ):
     """Search documents by title, filename, or description"""
     
-    document_service = get_document_service(db)
-    documents = document_service.search_documents(
+    rows = await document_service.search_documents(
         user_id=current_user.id,
         search_term=search_term,
         limit=limit
     )
-    
-    return [
-        {
-            "id": str(doc.id),
-            "filename": doc.filename,
-            "title": doc.title,
-            "description": doc.description,
-            "created_at": doc.created_at.isoformat() if doc.created_at else None,
-            "metadata": doc.metadata
-        }
-        for doc in documents
-    ]
\ No newline at end of file
+    return _listing_response(rows)
\ No newline at end of file
@@ -1,23 +1,33 @@
+import asyncio
+import hashlib
+import json
 import logging
-from database import get_db
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, File, UploadFile
-from pydantic import ValidationError
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session
+import os
+import tempfile
 import uuid
 
-from schemas.file import FileUploadResponse, DocumentStatusResponse
-from core.config import settings
-from core.dependencies import get_current_active_user
+from api.v1.docs.files_docs import (
+    get_upload_events_docs,
+    get_upload_status_docs,
+    upload_file_docs,
+)
+from core.dependencies import CurrentUser, DocumentServiceDep
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from models.user import User
-from api.v1.docs.files_docs import upload_file_docs, get_upload_status_docs
+from services.document_events import document_events
+from services.document_pipeline import EVENT_FIELDS, TERMINAL_STATUSES
+from services.document_service import DocumentService
+from services.queue import task_queue
 from services.storage_service import get_storage
-from services.pdf_processor import PDFProcessor
-from services.vectordb_service import VectorDBInterface, ChromaVectorDB, DocumentChunk
-from services.document_service import get_document_service, DocumentService
-from models.document import Document
+from sse_starlette.sse import EventSourceResponse
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.parser import ParseFailedException
+from streaming_form_data.targets import FileTarget
+from streaming_form_data.validators import MaxSizeValidator
+from streaming_form_data.validators import ValidationError as FormValidationError
 
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+MULTIPART_OVERHEAD = 64 * 1024  # Allowance for multipart boundaries and headers
 
 router = APIRouter(prefix="/files", tags=["Files"])
 
@@ -25,32 +35,57 @@ router = APIRouter(prefix="/files", tags=["Files"])
 logger = logging.getLogger(__name__)
 
 
-def validate_pdf_structure(file_content: bytes) -> bool:
+class HashingFileTarget(FileTarget):
+    """FileTarget that also computes the SHA-256 of the data it writes."""
+
+    def __init__(self, filename: str, *args, **kwargs):
+        super().__init__(filename, *args, **kwargs)
+        self.sha256 = hashlib.sha256()
+
+    def on_data_received(self, chunk: bytes):
+        self.sha256.update(chunk)
+        super().on_data_received(chunk)
+
+
+def validate_pdf_structure(file_path: str) -> bool:
     return True  # TODO: implement actual PDF structure validation
 
-def scan_pdf_content(file_content: bytes) -> bool:
+def scan_pdf_content(file_path: str) -> bool:
     return True  # TODO: implement actual PDF content scanning
-from functools import lru_cache
 
-@lru_cache()
-def get_pdf_processor() -> PDFProcessor:
-    """Create singleton PDFProcessor via dependency injection"""
-    return PDFProcessor()
 
-@lru_cache()
-def get_vector_db() -> VectorDBInterface:
-    return ChromaVectorDB()
+def check_content_length(request: Request) -> None:
+    """
+    Reject uploads whose declared size exceeds the limit before any of the
+    body is read. Runs ahead of authentication, and the server closes the
+    connection instead of draining the rest of the body.
+    Chunked requests without Content-Length are limited while streaming.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is None:
+        return
+    if not content_length.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if int(content_length) > MAX_FILE_SIZE + MULTIPART_OVERHEAD:
+        raise HTTPException(status_code=413, detail="File too large")
 
-@router.post("/upload", status_code=status.HTTP_201_CREATED,  **upload_file_docs)
+
+@router.post(
+    "/upload",
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(check_content_length)],
+    **upload_file_docs,
+)
 async def upload_file(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    pdf_processor: PDFProcessor = Depends(get_pdf_processor),  # Reuses same instance
-    vector_db: VectorDBInterface = Depends(get_vector_db),  # Reuses same instance
-    current_user: User = Depends(get_current_active_user),
+    request: Request,
+    document_service: DocumentServiceDep,
+    current_user: CurrentUser,
 ):
     """
     Endpoint to handle file uploads.
+
+    The multipart body is streamed chunk by chunk into a temporary file, so the
+    PDF is never held in memory and oversized uploads are rejected mid-stream.
     """
     # TODO: decide how to deal with images
     
@@ -58,30 +93,63 @@ async def upload_file(
     
     logger.info("Starting file upload")
     logger.info(f"Starting upload for user {current_user.id}")
-    logger.info(f"File: {file.filename}, Size: {file.size}, Content-Type: {file.content_type}")
-    
-    # 1: get file  from request
-    file_content = await file.read()
-    logger.info(f"Read {len(file_content)} bytes from file")
 
+    fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        # 1: stream the file part from the request to disk
+        file = HashingFileTarget(tmp_path, validator=MaxSizeValidator(MAX_FILE_SIZE))
+        parser = StreamingFormDataParser(headers=request.headers)
+        parser.register("file", file)
+        try:
+            async for chunk in request.stream():
+                # Parsing writes to disk, so keep it off the event loop
+                await asyncio.to_thread(parser.data_received, chunk)
+        except FormValidationError:
+            raise HTTPException(status_code=413, detail="File too large")
+        except ParseFailedException:
+            raise HTTPException(status_code=400, detail="Malformed multipart body")
+        finally:
+            file.finish()
+
+        if file.multipart_filename is None:
+            raise HTTPException(status_code=400, detail="No file provided")
+        file_size = os.path.getsize(tmp_path)
+        logger.info(f"File: {file.multipart_filename}, Size: {file_size}, Content-Type: {file.multipart_content_type}")
+
+        return await _accept_upload(
+            tmp_path, file_size, file.multipart_filename, file.multipart_content_type,
+            file.sha256.hexdigest(), document_service, current_user,
+        )
+    finally:
+        os.unlink(tmp_path)
+
+
+async def _accept_upload(
+    tmp_path: str,
+    file_size: int,
+    filename: str,
+    content_type: str | None,
+    content_hash: str,
+    document_service: DocumentService,
+    current_user: User,
+) -> dict:
+    """Validate and store an uploaded PDF spooled to disk, then queue its processing."""
     # 2: validate file type and size
-    if file.content_type != "application/pdf":
+    if content_type != "application/pdf":
         logger.error("Invalid file type")
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
-    if len(file_content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=413, detail="File too large")
-    
-    if len(file_content) < 100:  # Too small to be valid PDF
+    if file_size < 100:  # Too small to be valid PDF
         raise HTTPException(status_code=400, detail="File too small")
     
     # 3. Validate PDF structure
-    if not validate_pdf_structure(file_content):
+    if not validate_pdf_structure(tmp_path):
         raise HTTPException(status_code=400, detail="Invalid or corrupted PDF")
     
 
     # 4. Scan for malicious content
-    if not scan_pdf_content(file_content):
+    if not scan_pdf_content(tmp_path):
         raise HTTPException(status_code=400, detail="PDF contains suspicious content")
     
     # 5. Save file to storage with a secure filename
@@ -89,76 +157,92 @@ async def upload_file(
     file_uuid = str(uuid.uuid4())
     secure_filename = f"{file_uuid}.pdf"
     storage = get_storage()
-    file_path = await storage.save_file(file_content, secure_filename)
+    file_path = await storage.save_file_from_path(tmp_path, secure_filename)
     logger.info(f"File saved to storage at {file_path}")
 
-    # 6: extract bib metadata using pdf2bib and if not found use filename as title
-    logger.info("Extracting bibliographic metadata from PDF")
-    bib_metadata = await pdf_processor.extract_bib_metadata(file_path)
-    logger.info(f"Extracted metadata: {bib_metadata}")
-    if not bib_metadata:
-        bib_metadata = {"title": secure_filename}
-    logger.info("Processing PDF to extract markdown text")
+    # 6: record the pending document so its status can be tracked
+    document = await document_service.create_document(
+        filename=filename,
+        file_path=file_path,
+        user_id=current_user.id,
+        title=filename,
+    )
+    logger.info(f"Document saved to database with ID: {document.id}")
 
-    # 6: use mistral api to get .md file
-    markdown_text = await pdf_processor.process_pdf(file_content, secure_filename)
-    
-    # 5: add .md file to vector db
-    logger.info("Adding document to vector database")
-    await vector_db.add_document(
-        document_id=file_uuid,
-        content=markdown_text,
-        metadata={
-            "user_id": current_user.id,
-            "filename": file.filename,
-            "document_title": bib_metadata.get("title", file.filename)
-        }
+    # 7: metadata extraction, markdown conversion and indexing run in a worker;
+    # the content hash lets it reuse results from an earlier upload of the same file
+    await task_queue.enqueue(
+        "process_pdf", document.id, file_path, current_user.id, content_hash
     )
-    
-    # 6: add info to sql db
-    logger.info("Saving document info to database")
-    try:
-        document_service = get_document_service(db)
-        document = document_service.create_document(
-            filename=file.filename,
-            file_path=file_path,
-            user_id=current_user.id,
-            title=bib_metadata.get("title", file.filename)
-        )
-        logger.info(f"Document saved to database with ID: {document.id}")
-    except Exception as e:
-        logger.error(f"Failed to save document to database: {str(e)}")
-        # Continue even if database save fails, as the file and vector db are already processed
-    
+    logger.info(f"Queued processing of document {document.id} for user {current_user.id}")
 
-    logger.info(f"Upload completed for user {current_user.id}")
-    
     return {
-        "message": "Upload completed", 
+        "message": "Upload accepted for processing",
         "user_id": current_user.id,
-        "document_id": document.id if 'document' in locals() else None,
-        "filename": file.filename,
-        "title": bib_metadata.get("title", file.filename)
+        "document_id": document.id,
+        "filename": filename,
+        "status": document.status,
     }
     
+
 @router.get("/upload/{document_id}/status", **get_upload_status_docs)
 async def get_upload_status(
     document_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    document_service: DocumentServiceDep,
+    current_user: CurrentUser,
 ):
     """
     Get the status of a file upload/processing task.
     """
-    # TODO: Query document from database
-    # TODO: Check if document belongs to current user
-    # TODO: Return status, progress, and metadata
-    
+    document = await document_service.get_document(document_id, current_user.id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+
     return {
-        "document_id": document_id,
-        "status": "processing",  # processing, completed, failed
-        "progress": 0.5,  # 0.0 to 1.0
-        "message": "Extracting text from PDF...",
-        "created_at": "2024-10-02T10:30:00Z",
-        "updated_at": "2024-10-02T10:30:30Z"
-    }
\ No newline at end of file
+        "document_id": document.id,
+        "status": document.status,  # pending, processing, completed, failed
+        "progress": document.progress,  # 0.0 to 1.0
+        "message": document.error_message or document.status_message,
+        "created_at": document.created_at,
+        "updated_at": document.updated_at,
+    }
+
+
+@router.get("/upload/{document_id}/events", **get_upload_events_docs)
+async def get_upload_events(
+    document_id: int,
+    document_service: DocumentServiceDep,
+    current_user: CurrentUser,
+):
+    """
+    Stream processing status changes for a document as Server-Sent Events.
+
+    The current state is sent first, then one event per pipeline stage until
+    the document is completed or has failed.
+    """
+    # Subscribe before reading the row so no transition is missed in between
+    subscription = await document_events.subscribe(document_id)
+    try:
+        document = await document_service.get_document(document_id, current_user.id)
+        if document is None:
+            raise HTTPException(status_code=404, detail="Document not found")
+    except BaseException:
+        await subscription.close()
+        raise
+
+    initial = {"document_id": document.id, "stage": "current"}
+    initial.update((key, getattr(document, key)) for key in EVENT_FIELDS)
+
+    async def stream():
+        try:
+            yield {"event": "status", "data": json.dumps(initial)}
+            if document.status in TERMINAL_STATUSES:
+                return
+            async for event in subscription:
+                yield {"event": "status", "data": json.dumps(event)}
+                if event.get("status") in TERMINAL_STATUSES:
+                    return
+        finally:
+            await subscription.close()
+
+    return EventSourceResponse(stream())
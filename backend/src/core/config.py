@@ -3,16 +3,36 @@ Configuration settings for the application
 """
 
 import logging
+from functools import cached_property, lru_cache
 
-from pydantic_settings import BaseSettings
+from pydantic import computed_field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+# Default or guessable secret keys
+_WEAK_KEYS = frozenset(
+    {
+        "your-secret-key-change-in-production",
+        "your-super-secret-key-change-in-production-please",
+        "secret",
+        "development",
+        "test",
+        "password",
+    }
+)
+
 
 class Settings(BaseSettings):
     """Application settings"""
 
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=False,  # Allow lowercase env variables
+        frozen=True,
+    )
+
     # Security - These MUST be set via environment variables
     secret_key: str
     algorithm: str = "HS256"
@@ -36,6 +56,37 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./scholarmind.db"
 
+    # Redis (shared token blacklist); in-process fallback when empty
+    redis_url: str = ""
+
+    # Embedding: texts per model forward pass, and chunks embedded and
+    # written to the vector database per call
+    embedding_batch_size: int = 64
+    vector_write_batch_size: int = 256
+    # Chunks per Chroma add request; keeps each HNSW/SQLite write small
+    chroma_add_batch_size: int = 128
+    # HTTP connections the Chroma client keeps open (concurrent requests)
+    chroma_pool_size: int = 64
+    # Cosine similarity at which a query reuses a cached query's search results
+    search_cache_threshold: float = 0.92
+
+    # Browser origins allowed to call the API with credentials (comma-separated)
+    allowed_origins: str = "http://localhost:3000"
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def cors_origins(self) -> tuple[str, ...]:
+        """Allowed CORS origins as a tuple (parsed once)"""
+        return tuple(
+            origin.strip() for origin in self.allowed_origins.split(",") if origin.strip()
+        )
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def is_production(self) -> bool:
+        """Whether the app runs in production (computed once)"""
+        return self.environment == "production"
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -47,17 +98,8 @@ class Settings(BaseSettings):
             )
 
         # Warn about default/weak keys
-        weak_keys = [
-            "your-secret-key-change-in-production",
-            "your-super-secret-key-change-in-production-please",
-            "secret",
-            "development",
-            "test",
-            "password",
-        ]
-
-        if self.secret_key in weak_keys:
-            if self.environment == "production":
+        if self.secret_key in _WEAK_KEYS:
+            if self.is_production:
                 raise ValueError(
                     "Using a default or weak SECRET_KEY in production is not allowed!"
                 )
@@ -66,9 +108,11 @@ class Settings(BaseSettings):
                     "Using a weak SECRET_KEY. Generate a secure one for production!"
                 )
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False  # Allow lowercase env variables
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide, immutable settings instance"""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
@@ -2,12 +2,15 @@
 Authentication dependencies for FastAPI
 """
 
-from database import get_db
+from typing import Annotated
+
+from database import get_async_db
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from models.user import User
 from services.auth_service import TOKEN_TYPE_ACCESS, AuthService, UserService
-from sqlalchemy.orm import Session
+from services.document_service import DocumentService, get_document_service
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # OAuth2 password bearer for token extraction (optional for API clients)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
@@ -15,7 +18,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 async def get_current_user(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str | None = Depends(oauth2_scheme),
 ) -> User:
     """Get current authenticated user from HttpOnly cookies or Authorization header"""
@@ -32,7 +35,7 @@ async def get_current_user(
         raise credentials_exception
 
     # Verify token
-    payload = AuthService.verify_token(access_token, token_type=TOKEN_TYPE_ACCESS)
+    payload = await AuthService.verify_token(access_token, token_type=TOKEN_TYPE_ACCESS)
     if payload is None:
         raise credentials_exception
 
@@ -40,8 +43,8 @@ async def get_current_user(
     if username is None:
         raise credentials_exception
 
-    # Get user from database
-    user = UserService.get_user_by_username(db, username=username)
+    # Get user from the caches or the database
+    user = await UserService.get_user_for_request(db, username)
     if user is None:
         raise credentials_exception
 
@@ -57,3 +60,9 @@ async def get_current_active_user(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
     return current_user
+
+
+# Shorthands for route parameters. FastAPI resolves each dependency once per
+# request, so routers that also list get_current_active_user share the result.
+CurrentUser = Annotated[User, Depends(get_current_active_user)]
+DocumentServiceDep = Annotated[DocumentService, Depends(get_document_service)]
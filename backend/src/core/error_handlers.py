@@ -0,0 +1,54 @@
+"""
+Exception-to-HTTP error mapping for route handlers
+"""
+
+import functools
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+# Exception class -> (status code, detail); detail may reference the exception as {exc}
+ErrorMap = dict[type[Exception], tuple[int, str]]
+
+
+def handle_auth_errors(error_map: ErrorMap) -> Callable:
+    """Translate exceptions raised by an async route into HTTPExceptions.
+
+    The most specific mapped class in the exception's MRO wins, so subclasses
+    (e.g. pydantic's ValidationError, a ValueError) can be mapped separately.
+    HTTPExceptions and unmapped exceptions propagate unchanged.
+
+    Args:
+        error_map: Exception classes mapped to (status code, detail).
+    """
+
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await fn(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as exc:
+                mapped = next(
+                    (error_map[cls] for cls in type(exc).__mro__ if cls in error_map),
+                    None,
+                )
+                if mapped is None:
+                    raise
+                status_code, detail = mapped
+                if status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                    logger.error(f"Error in {fn.__name__}: {exc}", exc_info=True)
+                else:
+                    logger.warning(f"Error in {fn.__name__}: {exc}")
+                raise HTTPException(
+                    status_code=status_code, detail=detail.format(exc=exc)
+                ) from exc
+
+        return wrapper
+
+    return decorator
@@ -1,36 +1,110 @@
 import logging
 import os
+from datetime import UTC, datetime
 
-from sqlalchemy import MetaData, create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import MetaData, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 logger = logging.getLogger(__name__)
 
 # SQLite database URL for development
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./scholarmind.db")
 
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+# Server databases get a pool sized for concurrent requests and workers. Size
+# DB_POOL_SIZE to roughly the server's connection limit divided by the number
+# of worker processes.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+_POOL_OPTIONS = (
+    {}
+    if IS_SQLITE
+    else {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+    }
+)
+
 # Create SQLAlchemy engine
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False}
-    if DATABASE_URL.startswith("sqlite")
-    else {},
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
+    **_POOL_OPTIONS,
     echo=False,
 )
 
+
+def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+    """Use WAL with relaxed syncing so commits do not fsync on every write"""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+    cursor.close()
+
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the same database, used by request handlers and jobs
+_ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "postgresql://": "postgresql+asyncpg://",
+    "postgresql+psycopg2://": "postgresql+asyncpg://",
+}
+
+
+def _async_url(url: str) -> str:
+    """Return the async-driver equivalent of a sync database URL"""
+    for prefix, async_prefix in _ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix) :]
+    return url
+
+
+ASYNC_DATABASE_URL = _async_url(DATABASE_URL)
+
+# Create async SQLAlchemy engine
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **_POOL_OPTIONS,
+    echo=False,
+)
+if IS_SQLITE:
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
 # Create Base class for models
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
+
+
+def utcnow() -> datetime:
+    """Current UTC time as a naive datetime, as stored in DateTime columns"""
+    return datetime.now(UTC).replace(tzinfo=None)
+
 
 # Metadata for migrations
 metadata = MetaData()
 
 
 def get_db():
-    """Database session dependency"""
+    """Sync database session dependency, for scripts and tooling"""
     db = SessionLocal()
     try:
         yield db
@@ -42,13 +116,35 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Async database session dependency
+
+    The session returns its connection to the pool when the request ends.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {str(e)}")
+            await db.rollback()
+            raise
+
+
 def init_db():
     """Initialize database tables"""
     try:
         # Import models to register them with Base
+        from models.document import create_search_index
 
         # Create all tables
         Base.metadata.create_all(bind=engine)
+
+        # Existing tables do not get indexes added to their models later
+        with engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
+            create_search_index(connection)
         logger.info("✅ SQLite database tables created successfully")
         logger.info(f"📂 Database location: {DATABASE_URL}")
     except Exception as e:
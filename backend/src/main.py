@@ -1,27 +1,78 @@
 import logging
-from datetime import datetime
+import time
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
 
 from api.v1.auth import router as auth_router
 from api.v1.files import router as files_router
 from api.v1.chat import router as chat_router
 from api.v1.documents import router as documents_router
-from database import init_db
+from core.config import settings
+from database import async_engine, init_db
+from services.queue import task_queue
+from services.storage_service import get_storage
+from services.vectordb_service import get_vector_db as get_shared_vector_db
 from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+APP_VERSION = "1.0.0"
+
+
+# Application lifecycle
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize database connections and services, and clean them up on exit"""
+    logger.info("Starting ScholarMind API...")
+
+    try:
+        # Initialize SQLite database and create tables
+        init_db()
+
+        # Load the processing services now rather than on the first upload
+        await task_queue.start()
+
+        logger.info("ScholarMind API started successfully")
+    except Exception as e:
+        logger.error(f"Failed to start application: {str(e)}")
+        raise
+
+    yield
+
+    logger.info("Shutting down ScholarMind API...")
+
+    # Release pooled async database connections
+    await async_engine.dispose()
+
+    # Flush in-process job services and release the job queue's Redis connections
+    await task_queue.close()
+
+    # Close the shared storage client's connection pool
+    await get_storage().close()
+
+    # TODO: Close database connections
+    # if db_connection:
+    #     db_connection.close()
+
+    logger.info("ScholarMind API shut down successfully")
+
+
 # Create FastAPI app
 app = FastAPI(
     title="ScholarMind API",
     description="AI-powered research paper analysis and knowledge extraction platform",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
+    version=APP_VERSION,
+    # The OpenAPI schema (and the docs UIs built on it) is not served in production
+    docs_url=None if settings.is_production else "/docs",
+    redoc_url=None if settings.is_production else "/redoc",
+    openapi_url=None if settings.is_production else "/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.include_router(auth_router)
@@ -32,10 +83,13 @@ app.include_router(chat_router)
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure this properly for production
+    # An explicit list is matched by set lookup; with credentials allowed,
+    # "*" would reflect any origin back to the browser
+    allow_origins=list(settings.cors_origins),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[],
 )
 
 
@@ -75,6 +129,10 @@ class QueryResponse(BaseModel):
     query_time: float
 
 
+class QueryBatchRequest(BaseModel):
+    queries: list[QueryRequest]
+
+
 # Global variables for database connections
 db_connection = None
 vector_db_client = None
@@ -101,15 +159,19 @@ async def health_check():
         # TODO: Add actual database health checks
         db_status = "connected"  # Replace with actual DB ping
         vector_db_status = "connected"  # Replace with actual vector DB ping
-        print(
+        logger.debug(
             f"Health check: DB status={db_status}, Vector DB status={vector_db_status}"
         )
-        return HealthResponse(
-            status="healthy",
-            timestamp=datetime.utcnow(),
-            version="1.0.0",
-            database_status=db_status,
-            vector_db_status=vector_db_status,
+        # Probes call this constantly; return the JSON directly instead of
+        # building a HealthResponse for FastAPI to validate again
+        return ORJSONResponse(
+            {
+                "status": "healthy",
+                "timestamp": datetime.now(UTC),
+                "version": APP_VERSION,
+                "database_status": db_status,
+                "vector_db_status": vector_db_status,
+            }
         )
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
@@ -125,22 +187,27 @@ async def root():
     """Root endpoint"""
     return {
         "message": "Welcome to ScholarMind API",
-        "version": "1.0.0",
+        "version": APP_VERSION,
         "docs": "/docs",
         "health": "/health",
     }
 
 
 # Paper management endpoints
-@app.post("/papers/upload", response_model=PaperResponse)
+@app.post(
+    "/papers/upload",
+    response_model=PaperResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def upload_paper(paper: PaperUpload, db=Depends(get_database)):
     """Upload a new research paper"""
     try:
         # TODO: Implement paper upload logic
-        # 1. Save paper metadata to database
-        # 2. Process PDF and extract text
-        # 3. Generate embeddings and store in vector DB
-        # 4. Return paper information
+        # 1. Save paper metadata to database with status "pending"
+        # 2. Enqueue the "process_pdf" job (services.queue.task_queue), which
+        #    extracts text, generates embeddings and stores them in the vector
+        #    DB in a worker, as POST /files/upload does
+        # 3. Return paper information; clients poll or subscribe to status
 
         logger.info(f"Uploading paper: {paper.title}")
 
@@ -150,7 +217,7 @@ async def upload_paper(paper: PaperUpload, db=Depends(get_database)):
             title=paper.title,
             authors=paper.authors,
             abstract=paper.abstract,
-            upload_date=datetime.utcnow(),
+            upload_date=datetime.now(UTC),
             status="processing",
         )
     except Exception as e:
@@ -221,6 +288,50 @@ async def search_papers(query: QueryRequest, vector_db=Depends(get_vector_db)):
         )
 
 
+@app.post("/search/batch", response_model=list[QueryResponse])
+async def search_papers_batch(
+    batch: QueryBatchRequest, vector_db=Depends(get_shared_vector_db)
+):
+    """Search papers for several queries in one request
+
+    Queries are grouped by limit; each group costs one embedding pass and one
+    vector database query. Responses are returned in request order.
+    """
+    try:
+        logger.info(f"Searching papers: {len(batch.queries)} queries")
+
+        groups: dict[int, list[int]] = {}
+        for i, query in enumerate(batch.queries):
+            groups.setdefault(query.limit or 10, []).append(i)
+
+        responses: list[QueryResponse | None] = [None] * len(batch.queries)
+        for limit, positions in groups.items():
+            started = time.perf_counter()
+            group_results = await vector_db.search_batch(
+                [batch.queries[i].query for i in positions], limit
+            )
+            query_time = time.perf_counter() - started
+            for i, search_results in zip(positions, group_results, strict=True):
+                results = [
+                    {
+                        "id": result.chunk.id,
+                        "content": result.chunk.content,
+                        "metadata": result.chunk.metadata,
+                        "score": result.score,
+                    }
+                    for result in search_results
+                ]
+                responses[i] = QueryResponse(
+                    results=results, total_results=len(results), query_time=query_time
+                )
+        return responses
+    except Exception as e:
+        logger.error(f"Batch search failed: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Search failed"
+        )
+
+
 @app.post("/chat")
 async def chat_with_papers(
     query: QueryRequest, db=Depends(get_database), vector_db=Depends(get_vector_db)
@@ -248,43 +359,6 @@ async def chat_with_papers(
         )
 
 
-# Application lifecycle events
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database connections and services"""
-    global db_connection, vector_db_client
-
-    logger.info("Starting ScholarMind API...")
-
-    try:
-        # Initialize SQLite database and create tables
-        init_db()
-
-        # TODO: Initialize vector database client
-        # vector_db_client = create_chroma_client()
-
-        logger.info("ScholarMind API started successfully")
-    except Exception as e:
-        logger.error(f"Failed to start application: {str(e)}")
-        raise
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up resources"""
-    logger.info("Shutting down ScholarMind API...")
-
-    # TODO: Close database connections
-    # if db_connection:
-    #     db_connection.close()
-
-    # TODO: Close vector database connections
-    # if vector_db_client:
-    #     vector_db_client.close()
-
-    logger.info("ScholarMind API shut down successfully")
-
-
 # Exception handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
@@ -300,4 +374,12 @@ async def internal_error_handler(request, exc):
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        log_level="info",
+        loop="uvloop",
+        http="httptools",
+    )
@@ -1,7 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON, Index, event, text
 from sqlalchemy.orm import relationship
-from database import Base
-from datetime import datetime
+from database import Base, utcnow
 
 class Document(Base):
     __tablename__ = "documents"
@@ -16,12 +15,82 @@ class Document(Base):
     authors = Column(JSON, nullable=True)  # Store as JSON array
     bibtex = Column(Text, nullable=True)
     
+    # Processing state, updated by the background pipeline
+    status = Column(String(20), default="pending", nullable=False, index=True)
+    progress = Column(Float, default=0.0, nullable=False)
+    status_message = Column(String(255), nullable=True)
+    error_message = Column(Text, nullable=True)
+    
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
     updated_at = Column(DateTime, nullable=True)
     
     # Foreign key
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Relationship
-    #user = relationship("User", back_populates="documents")
\ No newline at end of file
+    #user = relationship("User", back_populates="documents")
+
+
+# Per-user listings ordered by recency (id breaks ties) become an index range scan
+Index(
+    "ix_documents_user_created",
+    Document.user_id,
+    Document.created_at.desc(),
+    Document.id.desc(),
+)
+
+
+# SQLite full-text index over titles and filenames, kept in sync by triggers
+SEARCH_INDEX_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5("
+    "title, filename, content='documents', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_ai AFTER INSERT ON documents BEGIN "
+    "INSERT INTO documents_fts(rowid, title, filename) VALUES (new.id, new.title, new.filename); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_ad AFTER DELETE ON documents BEGIN "
+    "INSERT INTO documents_fts(documents_fts, rowid, title, filename) "
+    "VALUES ('delete', old.id, old.title, old.filename); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_au AFTER UPDATE OF title, filename ON documents BEGIN "
+    "INSERT INTO documents_fts(documents_fts, rowid, title, filename) "
+    "VALUES ('delete', old.id, old.title, old.filename); "
+    "INSERT INTO documents_fts(rowid, title, filename) VALUES (new.id, new.title, new.filename); "
+    "END",
+)
+
+
+# PostgreSQL trigram indexes, so ILIKE '%term%' searches can use an index
+POSTGRES_SEARCH_INDEX_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_documents_title_trgm "
+    "ON documents USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_documents_filename_trgm "
+    "ON documents USING gin (filename gin_trgm_ops)",
+)
+
+
+def create_search_index(connection) -> None:
+    """Create the title/filename search index for the connection's database
+
+    SQLite gets a full-text index, backfilled from existing rows; PostgreSQL
+    gets trigram indexes. Other databases are left without one.
+    """
+    if connection.dialect.name == "postgresql":
+        for statement in POSTGRES_SEARCH_INDEX_DDL:
+            connection.execute(text(statement))
+        return
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = 'documents_fts'")
+    ).first()
+    for statement in SEARCH_INDEX_DDL:
+        connection.execute(text(statement))
+    if not exists:
+        connection.execute(text("INSERT INTO documents_fts(documents_fts) VALUES ('rebuild')"))
+
+
+@event.listens_for(Document.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    create_search_index(connection)
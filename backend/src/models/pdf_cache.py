@@ -0,0 +1,14 @@
+from database import Base, utcnow
+from sqlalchemy import JSON, Column, DateTime, String, Text
+
+
+class PdfCache(Base):
+    """Processing results shared by every upload of the same PDF bytes"""
+
+    __tablename__ = "pdf_cache"
+
+    sha256 = Column(String(64), primary_key=True)  # Hex digest of the file content
+    bib_metadata = Column(JSON, nullable=True)
+    markdown_text = Column(Text, nullable=False)
+
+    created_at = Column(DateTime, default=utcnow, nullable=False)
@@ -2,28 +2,166 @@
 Authentication service for user operations
 """
 
-import uuid
-from datetime import datetime, timedelta
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
 
+import jwt
+import orjson
+from cachetools import TLRUCache, TTLCache
 from core.config import settings
-from jose import JWTError, jwt
+from jwt import PyJWTError
 from models.user import User
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from services.token_blacklist import token_blacklist
+from services.user_cache import shared_user_cache
+from sqlalchemy import bindparam, exists, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Token type constants - clearly not passwords
 TOKEN_TYPE_ACCESS = "access"
 TOKEN_TYPE_REFRESH = "refresh"
 
-# Password hashing context - bcrypt already includes salting
+# Password hashing context - argon2id for new hashes; existing bcrypt hashes
+# still verify and are upgraded on the next successful login
 pwd_context = CryptContext(
-    schemes=["bcrypt"],
+    schemes=["argon2", "bcrypt"],
     deprecated="auto",
-    bcrypt__rounds=12,  # Explicit rounds configuration
+    argon2__type="ID",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+    bcrypt__rounds=12,
+)
+
+# Password hashing gets its own threads, one per core: concurrent logins
+# queue for a core instead of oversubscribing the CPU (and argon2 memory),
+# and they do not take over the default executor used for file I/O
+_hash_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="password-hash"
+)
+
+
+async def _run_hash(func, *args):
+    """Run CPU-bound password hashing work on the hashing threads"""
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+
+
+# Verified against when a username is unknown, so failed logins take the same
+# time whether or not the account exists
+_DUMMY_HASH = pwd_context.hash("dummy-password-for-timing")
+
+# Short-lived cache of verified token payloads, keyed by token digest and type.
+# Each entry expires after VERIFIED_TOKEN_CACHE_TTL seconds or at the token's
+# own exp, whichever is sooner, and a cache hit still honours the
+# invalidation blacklist.
+VERIFIED_TOKEN_CACHE_SIZE = 10_000
+VERIFIED_TOKEN_CACHE_TTL = 60
+
+
+def _verified_token_expiry(_key: bytes, payload: dict, now: float) -> float:
+    return min(payload["exp"], now + VERIFIED_TOKEN_CACHE_TTL)
+
+
+verified_token_cache: TLRUCache = TLRUCache(
+    maxsize=VERIFIED_TOKEN_CACHE_SIZE, ttu=_verified_token_expiry, timer=time.time
+)
+_verified_token_lock = threading.Lock()
+
+# Tokens that failed verification are remembered briefly, so floods of the
+# same forged or expired token are rejected without decoding them again
+REJECTED_TOKEN_CACHE_SIZE = 10_000
+REJECTED_TOKEN_CACHE_TTL = 5
+rejected_token_cache: TTLCache = TTLCache(
+    maxsize=REJECTED_TOKEN_CACHE_SIZE, ttl=REJECTED_TOKEN_CACHE_TTL
+)
+
+
+# Short-lived cache of user rows by username. Plain column snapshots are
+# stored rather than ORM instances so entries are not bound to a session.
+USER_CACHE_SIZE = 5_000
+USER_CACHE_TTL = 60
+user_cache: TTLCache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+_user_cache_lock = threading.Lock()
+_USER_COLUMNS = tuple(column.key for column in User.__table__.columns)
+
+# Statements are built once and executed with bound parameters per request
+_SELECT_USER_BY_EMAIL = select(User).where(User.email == bindparam("email")).limit(1)
+_SELECT_USER_BY_USERNAME = (
+    select(User).where(User.username == bindparam("username")).limit(1)
+)
+_USER_EXISTS = select(
+    exists().where(
+        (User.email == bindparam("email")) | (User.username == bindparam("username"))
+    )
+)
+_UPDATE_PASSWORD_HASH = (
+    update(User)
+    .where(User.id == bindparam("user_id"))
+    .values(hashed_password=bindparam("hashed_password"))
 )
 
-# In-memory store for invalidated tokens (use Redis in production)
-invalidated_tokens: set[str] = set()
+
+# HMAC keyed once with the secret; each signature works on a copy so the key
+# schedule is not recomputed per token. None for non-HMAC algorithms.
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+_HMAC_TEMPLATE = (
+    hmac.new(settings.secret_key.encode(), digestmod=_HMAC_DIGESTS[settings.algorithm])
+    if settings.algorithm in _HMAC_DIGESTS
+    else None
+)
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as required by JWS"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# The JOSE header is invariant for a given algorithm, so encode it once
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": settings.algorithm, "typ": "JWT"}))
+
+
+def _sign_jwt(payload: dict) -> str:
+    """Sign a payload with the pre-keyed HMAC and return the compact JWT"""
+    payload_segment = _b64url(orjson.dumps(payload))
+    signing_input = _JWT_HEADER_B64 + b"." + payload_segment
+    mac = _HMAC_TEMPLATE.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode()
+
+
+# JTIs are sliced from a buffer of random bytes refilled 4 KiB at a time,
+# avoiding a urandom syscall per token. Forked workers must not share it.
+_JTI_BYTES = 16
+_RAND_BUF = bytearray()
+_RAND_LOCK = threading.Lock()
+os.register_at_fork(after_in_child=_RAND_BUF.clear)
+
+
+def _new_jti() -> str:
+    """Return a random 128-bit token ID as 32 hex characters"""
+    with _RAND_LOCK:
+        if len(_RAND_BUF) < _JTI_BYTES:
+            _RAND_BUF.extend(os.urandom(4096))
+        jti = _RAND_BUF[:_JTI_BYTES].hex()
+        del _RAND_BUF[:_JTI_BYTES]
+    return jti
+
+
+def _token_cache_key(token: str, token_type: str | None) -> bytes:
+    """Build the verified-token cache key without retaining the raw token"""
+    return hashlib.sha256(token.encode()).digest() + (token_type or "").encode()
 
 
 class AuthService:
@@ -31,7 +169,7 @@ class AuthService:
 
     @staticmethod
     def get_password_hash(password: str) -> str:
-        """Hash password with bcrypt (includes automatic salting)"""
+        """Hash password with argon2id (includes automatic salting)"""
         hashed: str = pwd_context.hash(password)
         return hashed
 
@@ -41,20 +179,29 @@ class AuthService:
         result: bool = pwd_context.verify(plain_password, hashed_password)
         return result
 
+    @staticmethod
+    def verify_and_update_password(
+        plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """Verify password and return a replacement hash if the scheme is outdated"""
+        result: tuple[bool, str | None] = pwd_context.verify_and_update(
+            plain_password, hashed_password
+        )
+        return result
+
     @staticmethod
     def create_access_token(
         data: dict, expires_delta: timedelta | None = None
     ) -> tuple[str, str]:
         """Create JWT access token with JTI for invalidation"""
         to_encode = data.copy()
-        jti = str(uuid.uuid4())  # Unique token ID
+        jti = _new_jti()  # Unique token ID
 
+        now = datetime.now(UTC)
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + expires_delta
         else:
-            expire = datetime.utcnow() + timedelta(
-                minutes=settings.access_token_expire_minutes
-            )
+            expire = now + timedelta(minutes=settings.access_token_expire_minutes)
 
         to_encode.update({"exp": expire, "jti": jti, "type": TOKEN_TYPE_ACCESS})
         encoded_jwt: str = jwt.encode(
@@ -66,8 +213,8 @@ class AuthService:
     def create_refresh_token(data: dict) -> tuple[str, str]:
         """Create JWT refresh token with JTI for invalidation"""
         to_encode = data.copy()
-        jti = str(uuid.uuid4())  # Unique token ID
-        expire = datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
+        jti = _new_jti()  # Unique token ID
+        expire = datetime.now(UTC) + timedelta(days=settings.refresh_token_expire_days)
 
         to_encode.update({"exp": expire, "jti": jti, "type": TOKEN_TYPE_REFRESH})
         encoded_jwt: str = jwt.encode(
@@ -76,86 +223,243 @@ class AuthService:
         return encoded_jwt, jti
 
     @staticmethod
-    def verify_token(token: str, token_type: str | None = None) -> dict | None:
-        """Verify JWT token and return payload"""
+    def create_token_pair(username: str) -> tuple[str, str, str, str]:
+        """Create access and refresh tokens for a user in one pass
+
+        Both tokens use the precomputed header and the pre-keyed HMAC.
+
+        Returns:
+            (access_token, access_jti, refresh_token, refresh_jti)
+        """
+        if _HMAC_TEMPLATE is None:
+            access_token, access_jti = AuthService.create_access_token(
+                {"sub": username}
+            )
+            refresh_token, refresh_jti = AuthService.create_refresh_token(
+                {"sub": username}
+            )
+            return access_token, access_jti, refresh_token, refresh_jti
+
+        now = int(time.time())
+        access_jti = _new_jti()
+        refresh_jti = _new_jti()
+        access_token = _sign_jwt(
+            {
+                "sub": username,
+                "exp": now + settings.access_token_expire_minutes * 60,
+                "jti": access_jti,
+                "type": TOKEN_TYPE_ACCESS,
+            },
+        )
+        refresh_token = _sign_jwt(
+            {
+                "sub": username,
+                "exp": now + settings.refresh_token_expire_days * 86400,
+                "jti": refresh_jti,
+                "type": TOKEN_TYPE_REFRESH,
+            },
+        )
+        return access_token, access_jti, refresh_token, refresh_jti
+
+    @staticmethod
+    async def verify_token(token: str, token_type: str | None = None) -> dict | None:
+        """Verify JWT token and return payload
+
+        Successfully verified payloads are cached for a few seconds so that a
+        bearer token reused across requests skips the signature check.
+        Rejected tokens are remembered for a few seconds as well.
+        """
+        cache_key = _token_cache_key(token, token_type)
+        with _verified_token_lock:
+            cached: dict | None = verified_token_cache.get(cache_key)
+            rejected = cache_key in rejected_token_cache
+        if rejected:
+            return None
+        if cached is not None:
+            jti = cached.get("jti")
+            if jti and await token_blacklist.contains(jti):
+                return None
+            return cached
+
         try:
             payload: dict = jwt.decode(
-                token, settings.secret_key, algorithms=[settings.algorithm]
+                token,
+                settings.secret_key,
+                algorithms=[settings.algorithm],
+                options={"require": ["exp", "jti", "sub"]},
             )
+        except PyJWTError:
+            payload = None
 
-            # Check if token is invalidated
+        if payload is not None:
+            # Reject invalidated tokens, and tokens of another type if one is required
             jti = payload.get("jti")
-            if jti and jti in invalidated_tokens:
-                return None
+            if (jti and await token_blacklist.contains(jti)) or (
+                token_type and payload.get("type") != token_type
+            ):
+                payload = None
 
-            # Check token type if specified
-            if token_type and payload.get("type") != token_type:
-                return None
+        with _verified_token_lock:
+            if payload is None:
+                rejected_token_cache[cache_key] = True
+            else:
+                verified_token_cache[cache_key] = payload
+        return payload
 
-            return payload
-        except JWTError:
-            return None
+    @staticmethod
+    def get_unverified_claims(token: str) -> dict:
+        """Read JWT claims without verifying the signature or expiry
+
+        Only suitable when the token is about to be discarded (e.g. logout).
+
+        Raises:
+            PyJWTError: If the token is malformed.
+        """
+        claims: dict = jwt.decode(token, options={"verify_signature": False})
+        return claims
+
+    @staticmethod
+    async def invalidate_token(jti: str, exp: int) -> None:
+        """Invalidate a token by its JTI until it expires"""
+        await token_blacklist.add(jti, exp)
 
     @staticmethod
-    def invalidate_token(jti: str) -> None:
-        """Invalidate a token by its JTI"""
-        invalidated_tokens.add(jti)
+    async def invalidate_tokens(entries: list[tuple[str, int]]) -> None:
+        """Invalidate several tokens, given as (jti, exp) pairs, at once"""
+        await token_blacklist.add_many(entries)
 
 
 class UserService:
-    """User management service"""
+    """User management service
+
+    Queries run on an AsyncSession; CPU-bound password hashing runs on the
+    hashing threads so it does not stall the event loop.
+    """
 
     @staticmethod
-    def get_user_by_email(db: Session, email: str) -> User | None:
+    async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
         """Get user by email"""
-        return db.query(User).filter(User.email == email).first()
+        return await db.scalar(_SELECT_USER_BY_EMAIL, {"email": email})
+
+    @staticmethod
+    async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
+        """Get user by username
+
+        Results are cached for a short time; cache hits return a detached
+        User built from the cached column values.
+        """
+        with _user_cache_lock:
+            row: dict | None = user_cache.get(username)
+        if row is not None:
+            return User(**row)
+
+        user = await db.scalar(_SELECT_USER_BY_USERNAME, {"username": username})
+        if user is not None:
+            row = {column: getattr(user, column) for column in _USER_COLUMNS}
+            with _user_cache_lock:
+                user_cache[username] = row
+        return user
+
+    @staticmethod
+    async def get_user_for_request(db: AsyncSession, username: str) -> User | None:
+        """Get the user behind an authenticated request
+
+        Checks the in-process cache, then the shared Redis cache, then the
+        database. Users served from the shared cache have no password hash.
+        """
+        with _user_cache_lock:
+            row: dict | None = user_cache.get(username)
+        if row is not None:
+            return User(**row)
+
+        user = await shared_user_cache.get(username)
+        if user is not None:
+            return user
+
+        user = await UserService.get_user_by_username(db, username)
+        if user is not None:
+            await shared_user_cache.set(user)
+        return user
 
     @staticmethod
-    def get_user_by_username(db: Session, username: str) -> User | None:
-        """Get user by username"""
-        return db.query(User).filter(User.username == username).first()
+    def invalidate_user_cache(username: str) -> None:
+        """Drop a cached user, e.g. after a password change or deactivation"""
+        with _user_cache_lock:
+            user_cache.pop(username, None)
 
     @staticmethod
-    def get_user_by_id(db: Session, user_id: int) -> User | None:
-        """Get user by ID"""
-        return db.query(User).filter(User.id == user_id).first()
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
+        """Get user by ID, served from the session's identity map when loaded"""
+        return await db.get(User, user_id)
 
     @staticmethod
-    def create_user(
-        db: Session,
+    async def create_user(
+        db: AsyncSession,
         email: str,
         username: str,
         password: str,
         full_name: str | None = None,
     ) -> User:
-        """Create a new user"""
-        hashed_password = AuthService.get_password_hash(password)
-        db_user = User(
-            email=email,
-            username=username,
-            hashed_password=hashed_password,
-            full_name=full_name,
-        )
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        """Create a new user
+
+        Uniqueness is left to the database constraints, and the row is
+        returned by the INSERT itself, so signup costs one statement plus the
+        commit. On a conflict the session is rolled back and stays usable.
+
+        Raises:
+            IntegrityError: If the email or username is already taken.
+        """
+        hashed_password = await _run_hash(AuthService.get_password_hash, password)
+        try:
+            db_user: User = await db.scalar(
+                insert(User)
+                .values(
+                    email=email,
+                    username=username,
+                    hashed_password=hashed_password,
+                    full_name=full_name,
+                )
+                .returning(User)
+            )
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise
         return db_user
 
     @staticmethod
-    def authenticate_user(db: Session, username: str, password: str) -> User | None:
-        """Authenticate user with username and password"""
-        user = UserService.get_user_by_username(db, username)
+    async def authenticate_user(
+        db: AsyncSession, username: str, password: str
+    ) -> User | None:
+        """Authenticate user with username and password
+
+        Hashes using a deprecated scheme are transparently upgraded. Unknown
+        usernames are checked against a dummy hash to keep timing uniform.
+        """
+        user = await UserService.get_user_by_username(db, username)
         if not user:
+            # Spend the same hashing work as a real check to hide account existence
+            await _run_hash(AuthService.verify_password, password, _DUMMY_HASH)
             return None
-        if not AuthService.verify_password(password, user.hashed_password):
+        valid, new_hash = await _run_hash(
+            AuthService.verify_and_update_password, password, user.hashed_password
+        )
+        if not valid:
             return None
+        if new_hash:
+            # Cached users are detached, so update by primary key
+            await db.execute(
+                _UPDATE_PASSWORD_HASH,
+                {"user_id": user.id, "hashed_password": new_hash},
+            )
+            await db.commit()
+            UserService.invalidate_user_cache(username)
+            user.hashed_password = new_hash
         return user
 
     @staticmethod
-    def user_exists(db: Session, email: str, username: str) -> bool:
-        """Check if user exists by email or username"""
+    async def user_exists(db: AsyncSession, email: str, username: str) -> bool:
+        """Check if user exists by email or username, without loading a row"""
         return bool(
-            db.query(User)
-            .filter((User.email == email) | (User.username == username))
-            .first()
+            await db.scalar(_USER_EXISTS, {"email": email, "username": username})
         )
@@ -0,0 +1,66 @@
+"""
+Prompt assembly for chatting with documents
+
+Messages run from the most to the least stable part: system instructions,
+the retrieved context, earlier turns, then the new question. Consecutive
+turns of a session therefore share the longest possible prefix, which the
+LLM provider's prompt cache can reuse instead of processing it again.
+
+Not called by the app yet: the chat routes do not generate responses.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Protocol
+
+SYSTEM_PROMPT = (
+    "You are ScholarMind, a research assistant. Answer questions using the "
+    "document excerpts provided. Cite the excerpts you rely on by their "
+    "number, and say so when the excerpts do not contain the answer."
+)
+
+
+class ContextChunk(Protocol):
+    """Retrieved chunk, as returned by the vector database"""
+
+    id: str
+    content: str
+    metadata: dict[str, Any]
+
+
+def _chunk_order(chunk: ContextChunk) -> tuple:
+    return (
+        str(chunk.metadata.get("document_id", "")),
+        chunk.metadata.get("chunk_index", 0),
+        chunk.id,
+    )
+
+
+def format_context(chunks: Sequence[ContextChunk]) -> str:
+    """Render retrieved chunks as one numbered block.
+
+    Chunks are ordered by document and position rather than by score, so the
+    same set of chunks always renders to the same text.
+    """
+    excerpts = [
+        f"[{number}] {chunk.content}"
+        for number, chunk in enumerate(sorted(chunks, key=_chunk_order), start=1)
+    ]
+    return "Document excerpts:\n\n" + "\n\n".join(excerpts)
+
+
+def build_chat_messages(
+    context: str, history: Sequence[dict[str, str]], question: str
+) -> list[dict[str, str]]:
+    """Assemble chat messages with the cacheable prefix first.
+
+    Args:
+        context: Output of format_context(); keep it fixed within a session.
+        history: Earlier turns as {"role", "content"} messages, oldest first.
+        question: The new user message.
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "system", "content": context},
+        *history,
+        {"role": "user", "content": question},
+    ]
@@ -0,0 +1,112 @@
+"""
+Exact-match cache of deterministic LLM completions
+
+A completion requested with temperature 0 is keyed by the SHA-256 of its
+model, messages and tools, and reused for an identical request within the
+TTL. Sampled completions are never cached. Entries are stored in Redis so
+all workers share them; when no Redis URL is configured an in-process cache
+is used instead.
+
+Not consulted by the app yet, as nothing generates completions.
+"""
+
+import hashlib
+import logging
+from collections.abc import Sequence
+from typing import Any
+
+import orjson
+import redis.asyncio as redis
+from cachetools import TTLCache
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "completion:"
+COMPLETION_CACHE_TTL = 3600
+LOCAL_CACHE_SIZE = 1_000
+
+
+def completion_key(
+    model: str,
+    messages: Sequence[dict],
+    temperature: float,
+    tools: Sequence[dict] | None = None,
+) -> str:
+    """Hash a completion request; equal requests give equal keys"""
+    request = {
+        "model": model,
+        "messages": messages,
+        "tools": tools or [],
+        "temperature": temperature,
+    }
+    return hashlib.sha256(
+        orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+
+class CompletionCache:
+    """Cache of completion responses for temperature-0 requests"""
+
+    def __init__(self, redis_url: str = "", ttl: int = COMPLETION_CACHE_TTL):
+        self._redis: redis.Redis | None = (
+            redis.Redis.from_url(redis_url) if redis_url else None
+        )
+        self._ttl = ttl
+        # Fallback store: key -> serialized response
+        self._local: TTLCache = TTLCache(maxsize=LOCAL_CACHE_SIZE, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        model: str,
+        messages: Sequence[dict],
+        temperature: float,
+        tools: Sequence[dict] | None = None,
+    ) -> Any | None:
+        """Return the cached response for an identical request, or None"""
+        if temperature != 0:
+            return None
+        key = KEY_PREFIX + completion_key(model, messages, temperature, tools)
+        if self._redis is None:
+            data = self._local.get(key)
+        else:
+            try:
+                data = await self._redis.get(key)
+            except redis.RedisError as e:
+                logger.warning(f"Completion cache lookup failed: {e}")
+                data = None
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return orjson.loads(data)
+
+    async def set(
+        self,
+        model: str,
+        messages: Sequence[dict],
+        temperature: float,
+        response: Any,
+        tools: Sequence[dict] | None = None,
+    ) -> None:
+        """Cache a JSON-serializable response; ignored unless temperature is 0"""
+        if temperature != 0:
+            return
+        key = KEY_PREFIX + completion_key(model, messages, temperature, tools)
+        data = orjson.dumps(response)
+        if self._redis is None:
+            self._local[key] = data
+            return
+        try:
+            await self._redis.set(key, data, ex=self._ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Completion cache update failed: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """Hit and miss counts of this process"""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+completion_cache = CompletionCache(settings.redis_url)
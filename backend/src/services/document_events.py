@@ -0,0 +1,97 @@
+"""
+Publish/subscribe channel for document processing events
+
+The worker publishes a status event at each pipeline stage on the Redis
+channel ``doc:{id}:events``; the API streams them to clients over SSE.
+When no Redis URL is configured (jobs run in-process) events are delivered
+through in-memory queues instead.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import orjson
+import redis.asyncio as redis
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def channel_name(document_id: int) -> str:
+    """Redis channel carrying events for one document"""
+    return f"doc:{document_id}:events"
+
+
+class DocumentEvents:
+    """Document status event bus"""
+
+    def __init__(self, redis_url: str = ""):
+        self._redis: redis.Redis | None = (
+            redis.Redis.from_url(redis_url) if redis_url else None
+        )
+        # Fallback subscribers: document ID -> queues
+        self._local: dict[int, set[asyncio.Queue]] = {}
+
+    async def publish(self, document_id: int, event: dict) -> None:
+        """Send an event to every subscriber of a document"""
+        if self._redis is None:
+            for queue in self._local.get(document_id, ()):
+                queue.put_nowait(event)
+            return
+        await self._redis.publish(channel_name(document_id), orjson.dumps(event))
+
+    async def subscribe(self, document_id: int) -> "Subscription":
+        """Start receiving a document's events; close the subscription when done"""
+        if self._redis is None:
+            queue: asyncio.Queue = asyncio.Queue()
+            self._local.setdefault(document_id, set()).add(queue)
+            return Subscription(
+                self._iter_queue(queue),
+                lambda: self._unsubscribe_local(document_id, queue),
+            )
+
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel_name(document_id))
+
+        async def close() -> None:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+        return Subscription(self._iter_pubsub(pubsub), close)
+
+    async def _unsubscribe_local(self, document_id: int, queue: asyncio.Queue) -> None:
+        subscribers = self._local.get(document_id, set())
+        subscribers.discard(queue)
+        if not subscribers:
+            self._local.pop(document_id, None)
+
+    @staticmethod
+    async def _iter_queue(queue: asyncio.Queue) -> AsyncIterator[dict]:
+        while True:
+            yield await queue.get()
+
+    @staticmethod
+    async def _iter_pubsub(pubsub) -> AsyncIterator[dict]:
+        async for message in pubsub.listen():
+            yield orjson.loads(message["data"])
+
+
+class Subscription:
+    """Async iterator over one document's events"""
+
+    def __init__(
+        self, events: AsyncIterator[dict], close: Callable[[], Awaitable[None]]
+    ):
+        self._events = events
+        self._close = close
+
+    def __aiter__(self) -> AsyncIterator[dict]:
+        return self._events
+
+    async def close(self) -> None:
+        """Stop receiving events"""
+        await self._close()
+
+
+document_events = DocumentEvents(settings.redis_url)
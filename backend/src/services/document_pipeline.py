@@ -0,0 +1,221 @@
+"""
+Background processing pipeline for uploaded PDF documents
+
+Runs in a queue worker (see services.queue): extracts bibliographic metadata,
+converts the PDF to markdown, indexes it in the vector database and records
+progress on the document row at each stage, publishing each change as a
+document event.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from database import AsyncSessionLocal, utcnow
+from models.document import Document
+from services.document_events import document_events
+from services.pdf_cache import get_cached_pdf, store_cached_pdf
+from services.pdf_processor import PDFProcessor
+from services.storage_service import LocalStorage, StorageInterface, get_storage
+from services.vectordb_service import get_vector_db
+from sqlalchemy import update
+
+logger = logging.getLogger(__name__)
+
+# Document status values
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+def build_context() -> dict:
+    """Create the long-lived services a worker reuses across jobs"""
+    return {
+        "pdf_processor": PDFProcessor(),
+        "vector_db": get_vector_db(),
+        "storage": get_storage(),
+    }
+
+
+async def warm_up_context(ctx: dict) -> None:
+    """Connect services and load models ahead of the first job.
+
+    Failures are logged rather than raised; jobs connect lazily anyway.
+    """
+    warm_ups = [
+        service.warm_up() for service in ctx.values() if hasattr(service, "warm_up")
+    ]
+    for result in await asyncio.gather(*warm_ups, return_exceptions=True):
+        if isinstance(result, Exception):
+            logger.warning(f"Service warm-up failed: {result}")
+
+
+async def close_context(ctx: dict) -> None:
+    """Flush buffered work and close connections held by a worker context"""
+    for key in ("vector_db", "pdf_processor", "storage"):
+        service = ctx.get(key)
+        if hasattr(service, "close"):
+            await service.close()
+
+
+# Fields of a status event, mirroring GET /files/upload/{id}/status
+EVENT_FIELDS = ("status", "progress", "status_message", "error_message")
+TERMINAL_STATUSES = (STATUS_COMPLETED, STATUS_FAILED)
+
+
+async def update_status(document_id: int, stage: str, **values) -> None:
+    """Record pipeline progress on the document row and publish it as an event"""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(updated_at=utcnow(), **values)
+        )
+        await db.commit()
+
+    event = {"document_id": document_id, "stage": stage}
+    event.update((key, values[key]) for key in EVENT_FIELDS if key in values)
+    try:
+        await document_events.publish(document_id, event)
+    except Exception as e:
+        # Events are best effort; the row remains the source of truth
+        logger.warning(f"Failed to publish event for document {document_id}: {e}")
+
+
+async def _local_copy(storage: StorageInterface, file_path: str) -> tuple[str, bool]:
+    """Return a local path for a stored file and whether it is a temporary copy"""
+    if isinstance(storage, LocalStorage):
+        return file_path, False
+    fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        async for chunk in storage.get_file(file_path):
+            # Disk writes block, so keep them off the event loop
+            await asyncio.to_thread(f.write, chunk)
+    return tmp_path, True
+
+
+async def _extract(
+    ctx: dict, document_id: int, file_path: str
+) -> tuple[dict, str, bool]:
+    """Run metadata extraction and OCR on a stored PDF.
+
+    Returns (bib metadata, markdown, whether metadata extraction succeeded); a
+    failed extraction is logged and gives empty metadata.
+    """
+    pdf_processor: PDFProcessor = ctx["pdf_processor"]
+    local_path, is_temporary = await _local_copy(ctx["storage"], file_path)
+    try:
+        # Metadata extraction and OCR are independent, so run them concurrently
+        bib_metadata, markdown_text = await asyncio.gather(
+            pdf_processor.extract_bib_metadata(local_path),
+            pdf_processor.process_pdf(local_path, Path(file_path).name),
+            return_exceptions=True,
+        )
+    finally:
+        if is_temporary:
+            os.unlink(local_path)
+    if isinstance(markdown_text, BaseException):
+        raise markdown_text
+    if isinstance(bib_metadata, BaseException):
+        logger.warning(
+            f"Metadata extraction failed for document {document_id}: {bib_metadata}"
+        )
+        return {}, markdown_text, False
+    return bib_metadata, markdown_text, True
+
+
+async def process_pdf(
+    ctx: dict,
+    document_id: int,
+    file_path: str,
+    user_id: int,
+    content_hash: str | None = None,
+) -> None:
+    """Extract metadata, convert and index a stored PDF.
+
+    Args:
+        ctx: Worker context from build_context().
+        document_id: ID of the pending document row.
+        file_path: Storage path returned by StorageInterface.save_file_from_path.
+        user_id: Owner of the document.
+        content_hash: SHA-256 hex digest of the file; when set, results of a
+            previous upload of the same bytes are reused.
+    """
+    stored_name = Path(file_path).name
+
+    try:
+        await update_status(
+            document_id,
+            "started",
+            status=STATUS_PROCESSING,
+            progress=0.1,
+            status_message="Extracting metadata and text from PDF",
+        )
+        cached = None
+        if content_hash:
+            async with AsyncSessionLocal() as db:
+                cached = await get_cached_pdf(db, content_hash)
+        if cached is not None:
+            logger.info(f"Reusing cached results for document {document_id}")
+            bib_metadata, markdown_text = cached
+        else:
+            bib_metadata, markdown_text, metadata_extracted = await _extract(
+                ctx, document_id, file_path
+            )
+            # Only cache complete results, so a transient metadata failure is
+            # retried on the next upload of the same file
+            if content_hash and metadata_extracted:
+                async with AsyncSessionLocal() as db:
+                    await store_cached_pdf(
+                        db, content_hash, bib_metadata, markdown_text
+                    )
+        logger.info(f"Extracted metadata: {bib_metadata}")
+        metadata_values = {
+            "abstract": bib_metadata.get("summary"),
+            "authors": bib_metadata.get("authors"),
+            "bibtex": bib_metadata.get("bibtex"),
+        }
+        if bib_metadata.get("title"):
+            metadata_values["title"] = bib_metadata["title"]
+
+        await update_status(
+            document_id,
+            "markdown_ready",
+            status=STATUS_PROCESSING,
+            progress=0.7,
+            status_message="Indexing document",
+            **metadata_values,
+        )
+        await ctx["vector_db"].add_document(
+            document_id=Path(file_path).stem,
+            content=markdown_text,
+            metadata={
+                "user_id": user_id,
+                "document_id": document_id,
+                "document_title": metadata_values.get("title", stored_name),
+            },
+        )
+
+        await update_status(
+            document_id,
+            "completed",
+            status=STATUS_COMPLETED,
+            progress=1.0,
+            status_message="Document processed successfully",
+        )
+        logger.info(f"Processing completed for document {document_id}")
+    except Exception as e:
+        logger.error(
+            f"Processing failed for document {document_id}: {e}", exc_info=True
+        )
+        await update_status(
+            document_id,
+            "failed",
+            status=STATUS_FAILED,
+            status_message="Failed to process document",
+            error_message=str(e),
+        )
+        raise
@@ -1,16 +1,119 @@
+import re
 from uuid import UUID
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, List, Optional, Dict, Any
+from database import get_async_db, utcnow
+from fastapi import Depends
+from sqlalchemy import String, bindparam, cast, column, delete, literal_column, or_, select, table, tuple_, update
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 
 from models.document import Document
 
+
+class IsoTimestamp(FunctionElement):
+    """Render a naive UTC timestamp column as an ISO 8601 string in SQL"""
+    type = String()
+    inherit_cache = True
+
+
+@compiles(IsoTimestamp)
+def _compile_iso_timestamp(element, compiler, **kw):
+    return f"CAST({compiler.process(element.clauses, **kw)} AS VARCHAR)"
+
+
+@compiles(IsoTimestamp, "sqlite")
+def _compile_iso_timestamp_sqlite(element, compiler, **kw):
+    return f"strftime('%Y-%m-%dT%H:%M:%SZ', {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(IsoTimestamp, "postgresql")
+def _compile_iso_timestamp_postgresql(element, compiler, **kw):
+    return f"to_char({compiler.process(element.clauses, **kw)}, 'YYYY-MM-DD\"T\"HH24:MI:SS\"Z\"')"
+
+
+# Columns returned by document listings, serialized by the database
+LISTING_COLUMNS = (
+    cast(Document.id, String).label("id"),
+    Document.filename,
+    Document.title,
+    Document.authors,
+    Document.status,
+    IsoTimestamp(Document.created_at).label("created_at"),
+    IsoTimestamp(Document.updated_at).label("updated_at"),
+)
+
+# Fields that update_document may set
+UPDATABLE_FIELDS = frozenset({"title", "abstract", "authors", "bibtex"})
+
+# Statements are built once and executed with bound parameters per request
+_SELECT_DOCUMENT = select(Document).where(
+    Document.id == bindparam("document_id"),
+    Document.user_id == bindparam("user_id"),
+)
+_SELECT_USER_DOCUMENTS = (
+    select(*LISTING_COLUMNS)
+    .where(Document.user_id == bindparam("user_id"))
+    .order_by(Document.created_at.desc(), Document.id.desc())
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+# Keyset page: rows listed after the user's document with ID :before
+_listing_cursor = (
+    select(Document.created_at, Document.id)
+    .where(Document.id == bindparam("before"), Document.user_id == bindparam("user_id"))
+    .scalar_subquery()
+)
+_SELECT_USER_DOCUMENTS_BEFORE = _SELECT_USER_DOCUMENTS.where(
+    tuple_(Document.created_at, Document.id) < _listing_cursor
+)
+_SEARCH_DOCUMENTS = (
+    select(*LISTING_COLUMNS)
+    .where(
+        Document.user_id == bindparam("user_id"),
+        or_(
+            Document.title.ilike(bindparam("pattern")),
+            Document.filename.ilike(bindparam("pattern")),
+        ),
+    )
+    .order_by(Document.created_at.desc(), Document.id.desc())
+    .limit(bindparam("limit"))
+)
+
+# On SQLite, search goes through the documents_fts full-text index
+_documents_fts = table("documents_fts", column("rowid"))
+_SEARCH_DOCUMENTS_FTS = (
+    select(*LISTING_COLUMNS)
+    .join(_documents_fts, _documents_fts.c.rowid == Document.id)
+    .where(
+        Document.user_id == bindparam("user_id"),
+        literal_column("documents_fts").op("MATCH")(bindparam("query")),
+    )
+    .order_by(Document.created_at.desc(), Document.id.desc())
+    .limit(bindparam("limit"))
+)
+
+
+def _listing_query(user_id, limit: int, offset: int, before: Optional[int]) -> tuple:
+    """Pick the listing statement and its parameters for offset or keyset paging"""
+    params = {"user_id": user_id, "limit": limit, "offset": offset}
+    if before is None:
+        return _SELECT_USER_DOCUMENTS, params
+    return _SELECT_USER_DOCUMENTS_BEFORE, {**params, "before": before}
+
+
+def _fts_query(search_term: str) -> str:
+    """Turn free text into an FTS5 query matching every word as a prefix"""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", search_term))
+
 class DocumentService:
-    """Service for handling document CRUD operations"""
+    """Service for handling document CRUD operations on an async session"""
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
     
-    def create_document(
+    async def create_document(
         self, 
         filename: str, 
         file_path: str, 
@@ -29,93 +132,115 @@ class DocumentService:
         )
         
         self.db_session.add(document)
-        self.db_session.commit()
-        self.db_session.refresh(document)
+        await self.db_session.commit()
+        await self.db_session.refresh(document)
         
         return document
     
-    def get_document(self, document_id: UUID, user_id: UUID) -> Optional[Document]:
+    async def get_document(self, document_id: UUID, user_id: UUID) -> Optional[Document]:
         """Get a document by ID for a specific user"""
         
-        return self.db_session.query(Document).filter(
-            Document.id == document_id,
-            Document.user_id == user_id
-        ).first()
+        return await self.db_session.scalar(
+            _SELECT_DOCUMENT, {"document_id": document_id, "user_id": user_id}
+        )
     
-    def get_user_documents(self, user_id: UUID, limit: int = 100, offset: int = 0) -> List[Document]:
-        """Get all documents for a specific user with pagination"""
+    async def get_user_documents(
+        self, user_id: UUID, limit: int = 100, offset: int = 0, before: Optional[int] = None
+    ) -> List[RowMapping]:
+        """Get listing rows for a specific user's documents with pagination
         
-        return (
-            self.db_session.query(Document)
-            .filter(Document.user_id == user_id)
-            .order_by(Document.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-            .all()
+        Passing the ID of the last row seen as ``before`` returns the next
+        page by index seek, which stays fast however deep the page is. No
+        rows are returned if that document no longer exists.
+        """
+        
+        result = await self.db_session.execute(*_listing_query(user_id, limit, offset, before))
+        return result.mappings().all()
+    
+    async def iter_user_documents(
+        self,
+        user_id: UUID,
+        limit: int = 100,
+        offset: int = 0,
+        before: Optional[int] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[RowMapping]:
+        """Yield listing rows for a user's documents, fetched batch_size at a time"""
+        
+        result = await self.db_session.stream(
+            *_listing_query(user_id, limit, offset, before),
+            execution_options={"yield_per": batch_size},
         )
+        async for row in result.mappings():
+            yield row
     
-    def update_document(
+    async def update_document(
         self, 
         document_id: UUID, 
         user_id: UUID,
         **updates
     ) -> Optional[Document]:
-        """Update a document record"""
+        """Update a document record
         
-        # First verify the document belongs to the user
-        document = self.get_document(document_id, user_id)
-        if not document:
-            return None
+        The ownership check and the update run as one UPDATE ... RETURNING
+        statement. Fields outside UPDATABLE_FIELDS are ignored.
+        """
         
-        # Update the document
-        for key, value in updates.items():
-            if hasattr(document, key):
-                setattr(document, key, value)
+        values = {key: value for key, value in updates.items() if key in UPDATABLE_FIELDS}
+        if not values:
+            return await self.get_document(document_id, user_id)
+        values["updated_at"] = utcnow()
         
-        self.db_session.commit()
+        document = await self.db_session.scalar(
+            update(Document)
+            .where(Document.id == document_id, Document.user_id == user_id)
+            .values(**values)
+            .returning(Document)
+        )
+        await self.db_session.commit()
         
-        # Return updated document
         return document
     
-    def delete_document(self, document_id: UUID, user_id: UUID) -> bool:
-        """Delete a document record"""
-        
-        document = self.get_document(document_id, user_id)
-        if not document:
-            return False
+    async def delete_document(self, document_id: UUID, user_id: UUID) -> bool:
+        """Delete a document record owned by the user in a single statement"""
         
-        self.db_session.delete(document)
-        self.db_session.commit()
+        result = await self.db_session.execute(
+            delete(Document).where(Document.id == document_id, Document.user_id == user_id)
+        )
+        await self.db_session.commit()
         
-        return True
+        return result.rowcount > 0
     
-    def search_documents(
+    async def search_documents(
         self, 
         user_id: UUID, 
         search_term: str,
         limit: int = 50
-    ) -> List[Document]:
-        """Search documents by title or filename"""
+    ) -> List[RowMapping]:
+        """Search documents by title or filename, returning listing rows
         
-        from sqlalchemy import or_
+        On SQLite every word of the search term must prefix-match a word of
+        the title or filename; other databases match it as a substring.
+        """
         
-        return (
-            self.db_session.query(Document)
-            .filter(
-                Document.user_id == user_id,
-                or_(
-                    Document.title.ilike(f"%{search_term}%"),
-                    Document.filename.ilike(f"%{search_term}%")
-                )
+        if self.db_session.bind.dialect.name == "sqlite":
+            query = _fts_query(search_term)
+            if not query:
+                return []
+            result = await self.db_session.execute(
+                _SEARCH_DOCUMENTS_FTS,
+                {"user_id": user_id, "query": query, "limit": limit},
             )
-            .order_by(Document.created_at.desc())
-            .limit(limit)
-            .all()
-        )
+        else:
+            result = await self.db_session.execute(
+                _SEARCH_DOCUMENTS,
+                {"user_id": user_id, "pattern": f"%{search_term}%", "limit": limit},
+            )
+        return result.mappings().all()
 
 
-def get_document_service(db_session: Session) -> DocumentService:
-    """Factory function to create DocumentService instance"""
-    return DocumentService(db_session)
+def get_document_service(db: AsyncSession = Depends(get_async_db)) -> DocumentService:
+    """FastAPI dependency providing a DocumentService bound to the request session"""
+    return DocumentService(db)
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
\ No newline at end of file
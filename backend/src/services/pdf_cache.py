@@ -0,0 +1,44 @@
+"""
+Content-addressed cache of PDF processing results
+
+Bibliographic metadata and OCR markdown depend only on the file bytes, so
+they are stored under the file's SHA-256 digest and reused when the same
+paper is uploaded again, skipping the Mistral OCR and metadata lookups.
+"""
+
+import logging
+
+from models.pdf_cache import PdfCache
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+async def get_cached_pdf(db: AsyncSession, sha256: str) -> tuple[dict, str] | None:
+    """Return cached (bib metadata, markdown) for a digest, or None on a miss"""
+    row = (
+        await db.execute(
+            select(PdfCache.bib_metadata, PdfCache.markdown_text).where(
+                PdfCache.sha256 == sha256
+            )
+        )
+    ).first()
+    if row is None:
+        return None
+    return row.bib_metadata or {}, row.markdown_text
+
+
+async def store_cached_pdf(
+    db: AsyncSession, sha256: str, bib_metadata: dict, markdown_text: str
+) -> None:
+    """Cache processing results; a concurrent insert of the same digest wins"""
+    db.add(
+        PdfCache(sha256=sha256, bib_metadata=bib_metadata, markdown_text=markdown_text)
+    )
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        logger.info(f"PDF {sha256[:12]} was cached by a concurrent job")
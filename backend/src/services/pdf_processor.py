@@ -1,29 +1,211 @@
 from mistralai import Mistral
 from core.config import settings
 import logging
-import json
 import pdf2bib
 import asyncio
+import codecs
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import httpx
 
 logger = logging.getLogger(__name__)
 pdf2bib.config.set('verbose',False)
 
+
+def _init_bib_worker():
+    pdf2bib.config.set('verbose',False)
+
+
+# pdf2bib parses PDFs in Python, so it runs in worker processes to use every
+# core rather than contending for the GIL in threads. Processes start lazily.
+_bib_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_bib_worker)
+
+# Fast path for document info: read the trailer and the /Info object only
+TRAILER_READ_SIZE = 2048
+OBJECT_READ_SIZE = 4096
+MAX_XREF_SECTIONS = 8  # /Prev hops followed for incrementally updated files
+
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_INFO_REF_RE = re.compile(rb"/Info\s+(\d+)\s+(\d+)\s+R")
+_PREV_RE = re.compile(rb"/Prev\s+(\d+)")
+_SUBSECTION_RE = re.compile(rb"(\d+)\s+(\d+)\s*$")
+_LITERAL_ESCAPES = {
+    ord("n"): b"\n", ord("r"): b"\r", ord("t"): b"\t", ord("b"): b"\b",
+    ord("f"): b"\f", ord("("): b"(", ord(")"): b")", ord("\\"): b"\\",
+}
+
+
+def _read_at(f, offset: int, size: int) -> bytes:
+    f.seek(offset)
+    return f.read(size)
+
+
+def _xref_offset(f, xref_start: int, obj_num: int) -> tuple[int | None, bytes]:
+    """Look up an object in a classic xref section; return its offset and the trailer"""
+    data = _read_at(f, xref_start, OBJECT_READ_SIZE)
+    if not data.startswith(b"xref"):
+        return None, b""  # Cross-reference stream (PDF 1.5+): not handled here
+    lines = iter(data[4:].splitlines())
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith(b"trailer"):
+            return None, data[data.find(b"trailer"):]
+        match = _SUBSECTION_RE.match(line)
+        if not match:
+            return None, b""
+        first, count = int(match.group(1)), int(match.group(2))
+        if first <= obj_num < first + count:
+            for _ in range(obj_num - first):
+                next(lines, None)
+            entry = next(lines, b"").split()
+            if len(entry) == 3 and entry[2] == b"n":
+                return int(entry[0]), b""
+            return None, b""
+        for _ in range(count):
+            if next(lines, None) is None:
+                return None, b""  # Section larger than the read window
+    return None, b""
+
+
+def _parse_string(data: bytes, start: int) -> bytes | None:
+    """Parse a literal (...) or hex <...> PDF string beginning at start"""
+    if data[start:start + 1] == b"<":
+        end = data.find(b">", start)
+        if end < 0:
+            return None
+        digits = re.sub(rb"\s", b"", data[start + 1:end])
+        try:
+            return bytes.fromhex((digits + b"0" * (len(digits) % 2)).decode())
+        except ValueError:
+            return None
+    out = bytearray()
+    depth = 0
+    i = start
+    while i < len(data):
+        c = data[i]
+        if c == ord("\\") and i + 1 < len(data):
+            nxt = data[i + 1]
+            if nxt in _LITERAL_ESCAPES:
+                out += _LITERAL_ESCAPES[nxt]
+                i += 2
+            elif ord("0") <= nxt <= ord("7"):
+                octal = re.match(rb"[0-7]{1,3}", data[i + 1:i + 4]).group()
+                out.append(int(octal, 8) & 0xFF)
+                i += 1 + len(octal)
+            else:
+                i += 2  # Line continuation or unknown escape
+            continue
+        if c == ord("("):
+            depth += 1
+            if depth > 1:
+                out.append(c)
+        elif c == ord(")"):
+            depth -= 1
+            if depth == 0:
+                return bytes(out)
+            out.append(c)
+        else:
+            out.append(c)
+        i += 1
+    return None
+
+
+def _decode_text(raw: bytes) -> str:
+    """Decode a PDF text string (UTF-16 with BOM, UTF-8 with BOM, else PDFDocEncoding)"""
+    if raw.startswith(codecs.BOM_UTF16_BE):
+        return raw[2:].decode("utf-16-be", errors="replace").strip()
+    if raw.startswith(codecs.BOM_UTF8):
+        return raw[3:].decode("utf-8", errors="replace").strip()
+    # Latin-1 matches PDFDocEncoding for all printable text characters
+    return raw.decode("latin-1").strip()
+
+
+def _info_value(obj: bytes, key: bytes) -> str | None:
+    match = re.search(rb"/" + key + rb"\s*([(<])", obj)
+    if not match or obj[match.start(1):match.start(1) + 2] == b"<<":
+        return None
+    raw = _parse_string(obj, match.start(1))
+    value = _decode_text(raw) if raw is not None else ""
+    return value or None
+
+
+def fast_extract_info(file_path: str) -> dict | None:
+    """
+    Read /Title and /Author from the document information dictionary by
+    following startxref -> trailer -> /Info, without parsing the whole PDF.
+    Returns None when the file uses structures this fast path does not cover
+    (cross-reference streams, compressed object streams).
+    """
+    with open(file_path, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        tail = _read_at(f, max(0, size - TRAILER_READ_SIZE), TRAILER_READ_SIZE)
+        matches = _STARTXREF_RE.findall(tail)
+        info_ref = _INFO_REF_RE.findall(tail)
+        if not matches or not info_ref:
+            return None
+        obj_num, gen = (int(x) for x in info_ref[-1])
+
+        xref_start = int(matches[-1])
+        offset = None
+        for _ in range(MAX_XREF_SECTIONS):
+            offset, trailer = _xref_offset(f, xref_start, obj_num)
+            prev = _PREV_RE.search(trailer)
+            if offset is not None or not prev:
+                break
+            xref_start = int(prev.group(1))
+        if offset is None:
+            return None
+
+        obj = _read_at(f, offset, OBJECT_READ_SIZE)
+        if not re.match(rb"\s*%d\s+%d\s+obj" % (obj_num, gen), obj):
+            return None
+        end = obj.find(b"endobj")
+        obj = obj[:end] if end >= 0 else obj
+
+    title = _info_value(obj, b"Title")
+    author = _info_value(obj, b"Author")
+    return {
+        "title": title,
+        "authors": [a.strip() for a in author.split(";") if a.strip()] if author else None,
+    }
+
+# Connection settings for the Mistral API client shared by all uploads
+MISTRAL_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+MISTRAL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
 class PDFProcessor:
     def __init__(self):
-        self.mistral_client = Mistral(api_key=settings.mistral_api_key)
+        # One keep-alive HTTP/2 client per processor, so concurrent jobs reuse
+        # (and multiplex over) the same TLS connections to the Mistral API
+        self.http_client = httpx.AsyncClient(
+            http2=True, timeout=MISTRAL_TIMEOUT, limits=MISTRAL_LIMITS
+        )
+        self.mistral_client = Mistral(
+            api_key=settings.mistral_api_key, async_client=self.http_client
+        )
     
-    async def process_pdf(self, file_content: bytes, file_name: str) -> str:
+    async def close(self) -> None:
+        """Close the pooled connections to the Mistral API"""
+        await self.http_client.aclose()
+    
+    async def process_pdf(self, file_path: str, file_name: str) -> str:
         """
-        Process the PDF file content and return extracted markdown text.
+        Process the PDF file at file_path and return extracted markdown text.
+        The file is streamed to Mistral rather than read into memory.
         """
         # TODO : handle retry l;ogic and rate limiting + error handling
-        uploaded_file = await self.mistral_client.files.upload_async(
-            file = {
-                'file_name': file_name,
-                'content': file_content,
-            },
-            purpose= 'ocr'
-        )
+        with open(file_path, "rb") as file_content:
+            uploaded_file = await self.mistral_client.files.upload_async(
+                file = {
+                    'file_name': file_name,
+                    'content': file_content,
+                },
+                purpose= 'ocr'
+            )
         logger.info(f"Uploaded file to Mistral with ID: {uploaded_file.id}")
         pdf_response = await self.mistral_client.ocr.process_async(
             document={
@@ -31,38 +213,43 @@ class PDFProcessor:
                 "file_id": uploaded_file.id,
             },
             model="mistral-ocr-latest",
-            include_image_base64=True
+            # Images are not indexed, so do not download them inline
+            include_image_base64=False
         )
 
-        # Process the response
-        response_dict = json.loads(pdf_response.model_dump_json())
-        
         # Extract only markdown content (no images)
-        return self._extract_markdown_content(response_dict)
+        return self._extract_markdown_content(pdf_response)
     
-    def _extract_markdown_content(self, response_dict: dict) -> str:
+    def _extract_markdown_content(self, pdf_response) -> str:
         """
         Private method to extract markdown content from Mistral OCR response.
         Images are ignored for vector database storage.
         """
         # TODO: decide how to deal with images
-        markdown_content = ""
-        
-        # Process pages
-        for page in response_dict.get("pages", []):
-            # Add page markdown content
-            if page.get("markdown"):
-                markdown_content += page["markdown"] + "\n\n"
-        
-        return markdown_content.strip()
+        pages = [page.markdown for page in pdf_response.pages if page.markdown]
+        return "\n\n".join(pages).strip()
 
     async def extract_bib_metadata(self, file_path: str) -> dict:
         """
         Extract bibliographic metadata from the PDF file content.
         """
+        # Well-formed PDFs usually carry /Title in their info dictionary
+        try:
+            info = await asyncio.to_thread(fast_extract_info, file_path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Fast info extraction failed for {file_path}: {e}")
+            info = None
+        if info and info.get("title"):
+            return {
+                "title": info["title"],
+                "summary": None,
+                "bibtex": None,
+                "authors": info["authors"],
+            }
+
         # TODO : handle cases where pdf2bib fails because the file is not a paper
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, pdf2bib.pdf2bib, file_path)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(_bib_pool, pdf2bib.pdf2bib, file_path)
         
         title = result["metadata"]["title"]
         summary = result['validation_info']["summary"]
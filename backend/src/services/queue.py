@@ -0,0 +1,79 @@
+"""
+Background job queue
+
+Jobs are published to an arq queue in Redis and executed by the worker
+process (``arq worker.WorkerSettings``). When no Redis URL is configured
+(local development, tests) jobs run as tasks on the current event loop.
+"""
+
+import asyncio
+import logging
+
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+from core.config import settings
+from services import document_pipeline
+
+logger = logging.getLogger(__name__)
+
+# Job functions by name; the worker registers the same set
+JOBS = {
+    "process_pdf": document_pipeline.process_pdf,
+}
+
+
+class TaskQueue:
+    """Enqueue background jobs by name"""
+
+    def __init__(self, redis_url: str = ""):
+        self._redis_url = redis_url
+        self._pool: ArqRedis | None = None
+        # In-process fallback: shared job context and running tasks
+        self._local_ctx: dict | None = None
+        self._local_ctx_lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Prepare job services ahead of the first upload when jobs run in-process"""
+        if not self._redis_url:
+            await self._get_local_ctx()
+
+    async def enqueue(self, function: str, *args) -> None:
+        """Schedule a job to run in the background"""
+        if not self._redis_url:
+            ctx = await self._get_local_ctx()
+            self._run_locally(ctx, function, *args)
+            return
+
+        if self._pool is None:
+            self._pool = await create_pool(RedisSettings.from_dsn(self._redis_url))
+        await self._pool.enqueue_job(function, *args)
+
+    async def _get_local_ctx(self) -> dict:
+        """Build the in-process job context once, even under concurrent first uploads"""
+        if self._local_ctx is None:
+            async with self._local_ctx_lock:
+                if self._local_ctx is None:
+                    # Loading the embedding model blocks, so keep it off the event loop
+                    ctx = await asyncio.to_thread(document_pipeline.build_context)
+                    await document_pipeline.warm_up_context(ctx)
+                    self._local_ctx = ctx
+        return self._local_ctx
+
+    def _run_locally(self, ctx: dict, function: str, *args) -> None:
+        """Run a job on the current event loop, keeping a reference until done"""
+        task = asyncio.create_task(JOBS[function](ctx, *args))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """Flush in-process job services and release the Redis connection pool"""
+        if self._local_ctx is not None:
+            await document_pipeline.close_context(self._local_ctx)
+            self._local_ctx = None
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+task_queue = TaskQueue(settings.redis_url)
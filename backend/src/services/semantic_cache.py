@@ -0,0 +1,104 @@
+"""
+Semantic cache for vector search results
+
+A query whose embedding has a cosine similarity of at least the threshold
+with an earlier query's embedding is answered with that query's results
+instead of a new nearest-neighbour search. Entries expire after a TTL and
+are kept per namespace, so results requested with different parameters (or
+for different users) never mix. Embeddings are expected to be unit length.
+"""
+
+import logging
+import time
+from typing import Any, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_THRESHOLD = 0.92
+SEMANTIC_CACHE_TTL = 3600
+SEMANTIC_CACHE_SIZE = 1_000  # Entries per namespace
+
+
+class _Namespace:
+    """Entries of one namespace, oldest first"""
+
+    def __init__(self):
+        self.embeddings: list[np.ndarray] = []
+        self.values: list[Any] = []
+        self.expires: list[float] = []
+        # Stacked embeddings, rebuilt after the entries change
+        self._matrix: np.ndarray | None = None
+
+    def append(self, embedding: np.ndarray, value: Any, expires: float) -> None:
+        self.embeddings.append(embedding)
+        self.values.append(value)
+        self.expires.append(expires)
+        self._matrix = None
+
+    def drop_oldest(self, count: int) -> None:
+        if count:
+            del self.embeddings[:count], self.values[:count], self.expires[:count]
+            self._matrix = None
+
+    def prune(self, now: float) -> None:
+        """Drop expired entries; every entry has the same TTL, so they are the oldest"""
+        expired = 0
+        while expired < len(self.expires) and self.expires[expired] <= now:
+            expired += 1
+        self.drop_oldest(expired)
+
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = np.vstack(self.embeddings)
+        return self._matrix
+
+
+class SemanticCache:
+    """In-process cache of values keyed by query embeddings"""
+
+    def __init__(
+        self,
+        threshold: float = SIMILARITY_THRESHOLD,
+        ttl: float = SEMANTIC_CACHE_TTL,
+        maxsize: int = SEMANTIC_CACHE_SIZE,
+    ):
+        self._threshold = threshold
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._namespaces: dict[str, _Namespace] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, namespace: str, embedding: Sequence[float]) -> Any | None:
+        """Return the value cached for the most similar query, or None on a miss"""
+        entries = self._namespaces.get(namespace)
+        if entries is not None:
+            entries.prune(time.monotonic())
+        if not entries or not entries.values:
+            self.misses += 1
+            return None
+
+        scores = entries.matrix() @ np.asarray(embedding, dtype=np.float32)
+        best = int(np.argmax(scores))
+        if scores[best] < self._threshold:
+            self.misses += 1
+            return None
+        self.hits += 1
+        logger.debug(
+            f"Semantic cache hit in {namespace} (similarity {scores[best]:.3f})"
+        )
+        return entries.values[best]
+
+    def insert(self, namespace: str, embedding: Sequence[float], value: Any) -> None:
+        """Cache a value under a query embedding"""
+        entries = self._namespaces.setdefault(namespace, _Namespace())
+        now = time.monotonic()
+        entries.prune(now)
+        entries.drop_oldest(len(entries.values) + 1 - self._maxsize)
+        entries.append(np.asarray(embedding, dtype=np.float32), value, now + self._ttl)
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after the indexed documents change"""
+        self._namespaces.clear()
@@ -1,22 +1,51 @@
 from abc import ABC, abstractmethod
-from typing import BinaryIO
-import boto3
+from typing import AsyncIterator, BinaryIO
+import asyncio
+import aioboto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 import os
+import shutil
 from pathlib import Path
-import uuid
 from core.config import settings
 
+# Copy and multipart sizes: memory per transfer stays bounded by the chunk size
+COPY_CHUNK_SIZE = 1024 * 1024
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+)
+# One pooled client serves all concurrent requests; idle sockets are kept alive
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    s3={"addressing_style": "virtual"},
+)
+
 class StorageInterface(ABC):
-    """Abstract storage interface"""
+    """Abstract storage interface
+
+    Implementations keep the event loop free: local file I/O runs on dedicated
+    worker threads and S3 requests use the non-blocking aioboto3 client.
+    """
     
     @abstractmethod
-    async def save_file(self, file_content: bytes, filename: str) -> str:
-        """Save file and return the file path/URL"""
+    async def save_file(self, file_stream: BinaryIO, filename: str) -> str:
+        """Save a readable binary stream in chunks and return the file path/URL"""
         pass
     
     @abstractmethod
-    async def get_file(self, file_path: str) -> bytes:
-        """Retrieve file content"""
+    async def save_file_from_path(self, source_path: str, filename: str) -> str:
+        """Save a file from local disk without loading it into memory"""
+        pass
+
+    @abstractmethod
+    def get_file(self, file_path: str) -> AsyncIterator[bytes]:
+        """Yield file content in chunks of at most COPY_CHUNK_SIZE bytes"""
         pass
     
     @abstractmethod
@@ -24,6 +53,22 @@ class StorageInterface(ABC):
         """Delete file"""
         pass
 
+    async def close(self) -> None:
+        """Release connections held by the storage backend; a no-op unless overridden"""
+        return None
+
+# Local disk I/O gets a few threads of its own: concurrent uploads queue for
+# the disk instead of filling the default executor that parsing and embedding use
+LOCAL_IO_WORKERS = 4
+_local_io_executor = ThreadPoolExecutor(
+    max_workers=LOCAL_IO_WORKERS, thread_name_prefix="local-storage"
+)
+
+
+async def _run_local_io(func, *args):
+    """Run blocking file system work on the local storage threads"""
+    return await asyncio.get_running_loop().run_in_executor(_local_io_executor, func, *args)
+
 class LocalStorage(StorageInterface):
     """Local file system storage for development"""
     
@@ -31,21 +76,32 @@ class LocalStorage(StorageInterface):
         self.upload_dir = Path(upload_dir)
         self.upload_dir.mkdir(exist_ok=True)
     
-    async def save_file(self, file_content: bytes, filename: str) -> str:
+    async def save_file(self, file_stream: BinaryIO, filename: str) -> str:
         file_path = self.upload_dir / filename
-        
+        await _run_local_io(self._copy_stream, file_stream, file_path)
+        return str(file_path)
+
+    @staticmethod
+    def _copy_stream(file_stream: BinaryIO, file_path: Path) -> None:
         with open(file_path, "wb") as f:
-            f.write(file_content)
-        
+            shutil.copyfileobj(file_stream, f, length=COPY_CHUNK_SIZE)
+
+    async def save_file_from_path(self, source_path: str, filename: str) -> str:
+        file_path = self.upload_dir / filename
+        await _run_local_io(shutil.copyfile, source_path, file_path)
         return str(file_path)
     
-    async def get_file(self, file_path: str) -> bytes:
-        with open(file_path, "rb") as f:
-            return f.read()
+    async def get_file(self, file_path: str) -> AsyncIterator[bytes]:
+        f = await _run_local_io(open, file_path, "rb")
+        try:
+            while chunk := await _run_local_io(f.read, COPY_CHUNK_SIZE):
+                yield chunk
+        finally:
+            await _run_local_io(f.close)
     
     async def delete_file(self, file_path: str) -> bool:
         try:
-            os.remove(file_path)
+            await _run_local_io(os.remove, file_path)
             return True
         except OSError:
             return False
@@ -54,49 +110,83 @@ class S3Storage(StorageInterface):
     """AWS S3 storage for production"""
     
     def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
+        self._session = aioboto3.Session(
             aws_access_key_id=settings.aws_access_key_id,
             aws_secret_access_key=settings.aws_secret_access_key,
             region_name=settings.aws_region
         )
         self.bucket_name = settings.s3_bucket_name
+        # Long-lived client, opened on first use and released by close()
+        self._client_context = None
+        self._client = None
+        self._client_lock = asyncio.Lock()
+
+    async def _get_client(self):
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    context = self._session.client('s3', config=S3_CLIENT_CONFIG)
+                    self._client = await context.__aenter__()
+                    self._client_context = context
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared S3 client and its connection pool"""
+        if self._client_context is not None:
+            context, self._client_context, self._client = self._client_context, None, None
+            await context.__aexit__(None, None, None)
     
-    async def save_file(self, file_content: bytes, filename: str) -> str:
-        """Upload to S3 and return S3 key"""
+    async def save_file(self, file_stream: BinaryIO, filename: str) -> str:
+        """Upload a stream to S3 (multipart for large files) and return S3 key"""
         s3_key = f"documents/{filename}"
         
-        self.s3_client.put_object(
-            Bucket=self.bucket_name,
-            Key=s3_key,
-            Body=file_content,
-            ContentType='application/pdf'
+        s3 = await self._get_client()
+        await s3.upload_fileobj(
+            file_stream,
+            self.bucket_name,
+            s3_key,
+            ExtraArgs={'ContentType': 'application/pdf'},
+            Config=S3_TRANSFER_CONFIG
         )
         
         return s3_key  # Return S3 key as path
-    
-    async def get_file(self, file_path: str) -> bytes:
-        """Download from S3"""
-        response = self.s3_client.get_object(
-            Bucket=self.bucket_name,
-            Key=file_path
+
+    async def save_file_from_path(self, source_path: str, filename: str) -> str:
+        """Stream a local file to S3 (multipart for large files) and return S3 key"""
+        s3_key = f"documents/{filename}"
+
+        s3 = await self._get_client()
+        await s3.upload_file(
+            source_path,
+            self.bucket_name,
+            s3_key,
+            ExtraArgs={'ContentType': 'application/pdf'},
+            Config=S3_TRANSFER_CONFIG
         )
-        return response['Body'].read()
+
+        return s3_key
+    
+    async def get_file(self, file_path: str) -> AsyncIterator[bytes]:
+        """Stream a download from S3"""
+        s3 = await self._get_client()
+        response = await s3.get_object(Bucket=self.bucket_name, Key=file_path)
+        async with response['Body'] as body:
+            async for chunk in body.iter_chunks(COPY_CHUNK_SIZE):
+                yield chunk
     
     async def delete_file(self, file_path: str) -> bool:
         """Delete from S3"""
         try:
-            self.s3_client.delete_object(
-                Bucket=self.bucket_name,
-                Key=file_path
-            )
+            s3 = await self._get_client()
+            await s3.delete_object(Bucket=self.bucket_name, Key=file_path)
             return True
         except Exception:
             return False
 
 # Storage factory
+@cache
 def get_storage() -> StorageInterface:
-    """Return storage implementation based on configuration"""
+    """Return the process-wide storage implementation based on configuration"""
     if settings.storage_provider == "s3":
         return S3Storage()
     else:
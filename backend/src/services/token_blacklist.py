@@ -0,0 +1,105 @@
+"""
+Blacklist of invalidated JWT IDs (JTIs)
+
+Invalidated JTIs are stored in Redis with an expiry matching the token's own
+``exp`` claim, so every worker sees the same blacklist and entries disappear
+once the token could no longer be used anyway. Redis answers are cached in
+process for a couple of seconds, so a token re-checked on every request
+costs one round trip per window; revocations from another worker become
+visible within that window. When no Redis URL is configured (local
+development, tests) an in-process store is used instead.
+
+The blacklist fails closed: while Redis cannot be reached, every token is
+treated as revoked, so authenticated requests get a 401 rather than being
+accepted unchecked. JTIs that could not be written to Redis are kept in the
+in-process store, so at least this worker keeps rejecting them.
+"""
+
+import logging
+import time
+
+import redis.asyncio as redis
+from cachetools import TTLCache
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "bl:"
+
+LOOKUP_CACHE_SIZE = 10_000
+LOOKUP_CACHE_TTL = 2
+
+
+class TokenBlacklist:
+    """Blacklist of invalidated token JTIs"""
+
+    def __init__(self, redis_url: str = ""):
+        self._redis: redis.Redis | None = (
+            redis.Redis.from_url(redis_url, decode_responses=False)
+            if redis_url
+            else None
+        )
+        # Fallback store: JTI -> expiry timestamp
+        self._local: dict[str, int] = {}
+        # Recent Redis answers: JTI -> blacklisted
+        self._lookups: TTLCache = TTLCache(
+            maxsize=LOOKUP_CACHE_SIZE, ttl=LOOKUP_CACHE_TTL
+        )
+
+    async def add(self, jti: str, exp: int) -> None:
+        """Blacklist a JTI until its token expires"""
+        await self.add_many([(jti, exp)])
+
+    async def add_many(self, entries: list[tuple[str, int]]) -> None:
+        """Blacklist several JTIs in a single round trip"""
+        now = int(time.time())
+        entries = [(jti, exp) for jti, exp in entries if exp > now]
+        if not entries:
+            return
+
+        if self._redis is None:
+            self._prune(now)
+            self._local.update(entries)
+            return
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for jti, exp in entries:
+                    pipe.set(f"{KEY_PREFIX}{jti}", b"1", exat=exp)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Token blacklist update failed: {e}")
+            self._prune(now)
+            self._local.update(entries)
+            return
+        for jti, _ in entries:
+            self._lookups[jti] = True
+
+    async def contains(self, jti: str) -> bool:
+        """Check whether a JTI has been invalidated
+
+        Returns True when Redis cannot be reached.
+        """
+        exp = self._local.get(jti)
+        if exp is not None and exp > time.time():
+            return True
+        if self._redis is None:
+            return False
+        blacklisted: bool | None = self._lookups.get(jti)
+        if blacklisted is None:
+            try:
+                blacklisted = bool(await self._redis.exists(f"{KEY_PREFIX}{jti}"))
+            except redis.RedisError as e:
+                logger.error(f"Token blacklist lookup failed: {e}")
+                return True
+            self._lookups[jti] = blacklisted
+        return blacklisted
+
+    def _prune(self, now: int) -> None:
+        """Remove expired entries from the in-process store"""
+        expired = [jti for jti, exp in self._local.items() if exp <= now]
+        for jti in expired:
+            del self._local[jti]
+
+
+token_blacklist = TokenBlacklist(settings.redis_url)
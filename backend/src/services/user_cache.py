@@ -0,0 +1,75 @@
+"""
+Shared cache of authenticated user rows
+
+Request authentication looks the user up on every call. Rows are cached in
+Redis for a short time so that all workers skip the database for active
+sessions; the in-process user_cache in auth_service sits in front of it.
+Password hashes are never written to the shared cache. When no Redis URL is
+configured every lookup is a miss.
+"""
+
+import logging
+from datetime import datetime
+
+import orjson
+import redis.asyncio as redis
+from core.config import settings
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "user:"
+SHARED_USER_CACHE_TTL = 60
+
+_CACHED_COLUMNS = tuple(
+    column.key for column in User.__table__.columns if column.key != "hashed_password"
+)
+_DATETIME_COLUMNS = ("created_at", "updated_at")
+
+
+class UserCache:
+    """Redis-backed cache of user column snapshots by username"""
+
+    def __init__(self, redis_url: str = "", ttl: int = SHARED_USER_CACHE_TTL):
+        self._redis: redis.Redis | None = (
+            redis.Redis.from_url(redis_url) if redis_url else None
+        )
+        self._ttl = ttl
+
+    async def get(self, username: str) -> User | None:
+        """Return a detached User without its password hash, or None on a miss"""
+        if self._redis is None:
+            return None
+        try:
+            data = await self._redis.get(f"{KEY_PREFIX}{username}")
+        except redis.RedisError as e:
+            logger.warning(f"User cache lookup failed: {e}")
+            return None
+        if data is None:
+            return None
+        row = orjson.loads(data)
+        for column in _DATETIME_COLUMNS:
+            if row.get(column):
+                row[column] = datetime.fromisoformat(row[column])
+        return User(**row)
+
+    async def set(self, user: User) -> None:
+        """Cache a user's columns, except the password hash"""
+        if self._redis is None:
+            return
+        row = {column: getattr(user, column) for column in _CACHED_COLUMNS}
+        try:
+            await self._redis.set(
+                f"{KEY_PREFIX}{user.username}", orjson.dumps(row), ex=self._ttl
+            )
+        except redis.RedisError as e:
+            logger.warning(f"User cache update failed: {e}")
+
+    async def delete(self, username: str) -> None:
+        """Drop a cached user, e.g. after deactivation or a profile change"""
+        if self._redis is None:
+            return
+        await self._redis.delete(f"{KEY_PREFIX}{username}")
+
+
+shared_user_cache = UserCache(settings.redis_url)
@@ -1,150 +1,739 @@
 from abc import ABC, abstractmethod
 import asyncio
+import hashlib
+import threading
+import time
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
 import chromadb
 import logging
+import msgspec
+import numpy as np
+from cachetools import TTLCache
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.schema import Document
+from semantic_text_splitter import TextSplitter
 from core.config import settings
+from services.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class DocumentChunk:
+EMBEDDING_MODEL = (
+    "sentence-transformers/all-mpnet-base-v2"  # Baked into the image, see Dockerfile
+)
+EMBEDDING_DIM = 768  # Output size of EMBEDDING_MODEL
+EMBEDDING_BATCH_SIZE = settings.embedding_batch_size  # Texts per model forward pass
+# Bounds of one embedding call, so a large document never reaches the model at once
+EMBED_MAX_ITEMS = EMBEDDING_BATCH_SIZE
+EMBED_MAX_CHARS = 150_000
+# Chunks per collection.add request, within Chroma's recommended 50-250 range
+CHROMA_ADD_BATCH_SIZE = settings.chroma_add_batch_size
+# Embeddings of recent query texts; the model is fixed, so only size bounds them
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+QUERY_EMBEDDING_CACHE_TTL = 3600
+# Concurrent searches are gathered for up to this many queries or seconds and
+# sent to Chroma as one query matrix
+SEARCH_BATCH_SIZE = 32
+SEARCH_FLUSH_INTERVAL = 0.005
+# Chunks that may wait for the background writer before callers block
+WRITE_QUEUE_SIZE = 10_000
+
+# HNSW settings applied when the collection is created (ignored if it exists).
+# Embeddings are unit length, so cosine distance makes 1 - distance the cosine
+# similarity reported by search(). Chroma stores every vector as float32, so
+# quantizing embeddings before add() would not shrink the index.
+COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 200,
+}
+
+
+def _client_settings() -> chromadb.Settings:
+    """Size the client's httpx pool so concurrent requests get their own connection"""
+    return chromadb.Settings(
+        chroma_http_max_connections=settings.chroma_pool_size,
+        chroma_http_max_keepalive_connections=settings.chroma_pool_size,
+    )
+
+
+def _embedding_model_kwargs() -> Dict[str, Any]:
+    """Run the embedding model on GPU in half precision when one is available"""
+    try:
+        import torch
+    except ImportError:
+        return {}
+    if torch.cuda.is_available():
+        return {"device": "cuda", "model_kwargs": {"torch_dtype": torch.float16}}
+    return {}
+
+
+# The embedding model and the write path are shared by every caller in the
+# process; they are created on first use. The lock is reentrant because
+# building the vector database loads the embedding model under it
+_shared_lock = threading.RLock()
+_embeddings: Optional[HuggingFaceEmbeddings] = None
+_vector_db: Optional["BatchingChromaVectorDB"] = None
+
+
+def get_embeddings() -> HuggingFaceEmbeddings:
+    """Return the process-wide embedding model, loading it on first use"""
+    global _embeddings
+    if _embeddings is None:
+        with _shared_lock:
+            if _embeddings is None:
+                logger.info("Initializing HuggingFace Embeddings")
+                # Inserts arrive batched (see BatchingChromaVectorDB), so each call
+                # embeds many chunks; encode them in fixed-size forward passes
+                _embeddings = HuggingFaceEmbeddings(
+                    model_name=EMBEDDING_MODEL,
+                    model_kwargs=_embedding_model_kwargs(),
+                    encode_kwargs={
+                        "batch_size": EMBEDDING_BATCH_SIZE,
+                        "normalize_embeddings": True,
+                    },
+                )
+                logger.info("HuggingFace Embeddings initialized")
+    return _embeddings
+
+
+# Recursive splitting on paragraph, sentence and word boundaries, done in Rust;
+# chunks hold at most 1000 characters, with 200 shared between neighbours
+TEXT_SPLITTER = TextSplitter(1000, overlap=200)
+
+
+def _micro_batches(texts: List[str], max_items: int, max_chars: int) -> List[List[str]]:
+    """Split texts greedily into batches within both an item and a character budget
+
+    A text longer than max_chars on its own still gets a batch of one.
+    """
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    chars = 0
+    for text in texts:
+        if batch and (len(batch) >= max_items or chars + len(text) > max_chars):
+            batches.append(batch)
+            batch, chars = [], 0
+        batch.append(text)
+        chars += len(text)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _as_matrix(embeddings) -> np.ndarray:
+    """Stack embeddings into one contiguous float32 array for the Chroma client
+
+    The client converts each list row to a numpy array on its own; one array
+    built up front skips that, and a wrong dimension fails before the request.
+    """
+    matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2 or matrix.shape[1] != EMBEDDING_DIM:
+        raise ValueError(
+            f"Expected embeddings of dimension {EMBEDDING_DIM}, got shape {matrix.shape}"
+        )
+    return matrix
+
+
+def _content_hash(text: str) -> str:
+    """Fingerprint of chunk text, stored as the content_hash metadata field"""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+# Structs build several times faster than dataclasses, which matters when a
+# search returns many results
+class DocumentChunk(msgspec.Struct):
     id: str
     content: str
     metadata: Dict[str, Any]
 
-@dataclass 
-class SearchResult:
+
+class SearchResult(msgspec.Struct):
     chunk: DocumentChunk
     score: float
 
+
+def _search_results(results: Dict[str, Any], position: int) -> List[SearchResult]:
+    """Convert the matches for one query embedding of a Chroma query result"""
+    ids = results["ids"][position]
+    distances = results.get("distances")
+    # Convert distance to similarity score (1 - distance)
+    scores = (
+        [1 - distance for distance in distances[position]]
+        if distances
+        else [1.0] * len(ids)
+    )
+    return [
+        SearchResult(
+            chunk=DocumentChunk(id=doc_id, content=content, metadata=metadata),
+            score=score,
+        )
+        for doc_id, content, metadata, score in zip(
+            ids,
+            results["documents"][position],
+            results["metadatas"][position],
+            scores,
+            strict=True,
+        )
+    ]
+
+
 class VectorDBInterface(ABC):
-    
     @abstractmethod
     async def add_documents(self, chunks: List[DocumentChunk]) -> bool:
         pass
-    
+
     @abstractmethod
     async def search(self, query: str, limit: int = 10) -> List[SearchResult]:
         pass
-    
+
+    @abstractmethod
+    async def delete_documents(self, document_id: str) -> bool:
+        pass
+
+    async def search_batch(
+        self, queries: List[str], limit: int = 10
+    ) -> List[List[SearchResult]]:
+        """Search several queries; implementations may share one round trip"""
+        return [await self.search(query, limit) for query in queries]
+
     @abstractmethod
     async def health_check(self) -> bool:
         pass
 
+
 class ChromaVectorDB(VectorDBInterface):
-    
+    """Chroma collection accessed through the non-blocking AsyncHttpClient"""
+
     def __init__(self, host: str = "vector_db", port: int = 8000):
         self.host = host
         self.port = port
         self.client = None
         self.collection = None
-        logger.info("Initializing HuggingFace Embeddings")
-        self.embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
-        logger.info("HuggingFace Embeddings initialized")
-        logger.info("Setting up text splitter")
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
+        # Serializes connect() so concurrent cold calls open a single client
+        self._connect_lock = asyncio.Lock()
+        self.embeddings = get_embeddings()
+        self.text_splitter = TEXT_SPLITTER
+        # Results of recent queries, reused for near-duplicate queries
+        self.search_cache = SemanticCache(threshold=settings.search_cache_threshold)
+        # Bumped whenever the indexed chunks change; a search only caches its
+        # results if no insert finished while it was querying
+        self._generation = 0
+        # Query text -> embedding, so a repeated query skips the model
+        self.query_embeddings: TTLCache = TTLCache(
+            maxsize=QUERY_EMBEDDING_CACHE_SIZE, ttl=QUERY_EMBEDDING_CACHE_TTL
         )
-    
+
     async def connect(self):
-        logger.info(f"Connecting to ChromaDB at {self.host}:{self.port}")
-        self.client = chromadb.HttpClient(host=self.host, port=self.port)
-        self.collection = self.client.get_or_create_collection("documents")
+        """Open the client and collection unless another call already has"""
+        async with self._connect_lock:
+            if self.collection is not None:
+                return True
+            logger.info(f"Connecting to ChromaDB at {self.host}:{self.port}")
+            client = await chromadb.AsyncHttpClient(
+                host=self.host, port=self.port, settings=_client_settings()
+            )
+            self.collection = await client.get_or_create_collection(
+                "documents", metadata=COLLECTION_METADATA
+            )
+            self.client = client
         return True
-    
-    async def add_document(self, document_id: str, content: str, metadata: Dict[str, Any]) -> bool:
+
+    async def warm_up(self) -> None:
+        """Open the collection and run one embedding so the first insert is not cold"""
+        if not self.collection:
+            await self.connect()
+        await self.embeddings.aembed_query("warm up")
+
+    async def close(self) -> None:
+        """Drop the Chroma client and collection; connect() opens a new client"""
+        self.client = None
+        self.collection = None
+
+    async def add_document(
+        self, document_id: str, content: str, metadata: Dict[str, Any]
+    ) -> bool:
         """Add a document by splitting it into chunks automatically"""
         logger.info(f"Adding document {document_id} to vector database")
         if not self.collection:
             await self.connect()
-        logger.info(f"Adding document {document_id} to vector database")
-        
-        # Split the content into chunks
-        documents = [Document(page_content=content, metadata=metadata)]
-        docs = self.text_splitter.split_documents(documents)
-        
+
+        # Use existing add_documents method
+        return await self.add_documents(
+            self.split_document(document_id, content, metadata)
+        )
+
+    def split_document(
+        self, document_id: str, content: str, metadata: Dict[str, Any]
+    ) -> List[DocumentChunk]:
+        """Split a document into chunks ready for insertion"""
+        pieces = self.text_splitter.chunks(content)
+
         # Convert to DocumentChunk format
         chunks = []
-        for i, doc in enumerate(docs):
+        for i, piece in enumerate(pieces):
             chunk = DocumentChunk(
                 id=f"{document_id}_chunk_{i}",
-                content=doc.page_content,
-                metadata={**doc.metadata, "chunk_index": i, "document_id": document_id}
+                content=piece,
+                metadata={**metadata, "chunk_index": i, "document_id": document_id},
             )
             chunks.append(chunk)
-        logger.info(f"Document split into {len(chunks)} chunks")
-        # Use existing add_documents method
-        return await self.add_documents(chunks)
-    
+        logger.info(f"Document {document_id} split into {len(chunks)} chunks")
+        return chunks
+
     # Remove the duplicate method and keep only this one:
     async def add_documents(self, chunks: List[DocumentChunk]) -> bool:
+        """Embed and insert chunks micro-batch by micro-batch
+
+        Chunks are fingerprinted by content. A chunk already stored under the
+        same ID and content is skipped, and one whose content is stored under
+        another ID reuses that embedding, so only new text reaches the model.
+        Each embedded micro-batch is handed to an inserter task, so writing
+        one batch to Chroma overlaps with embedding the next.
+        """
+        if not chunks:
+            return True
         if not self.collection:
             await self.connect()
-        
-        # Generate embeddings with Mistral
-        logger.info(f"Generating embeddings for {len(chunks)} chunks")
-        texts = [chunk.content for chunk in chunks]
-
-        all_embeddings = await self.embeddings.aembed_documents(texts)
-        
-       
-
-        logger.info(f"Generated embeddings for {len(chunks)} chunks")
-        
-        ids = [chunk.id for chunk in chunks]
-        documents = [chunk.content for chunk in chunks]
-        metadatas = [chunk.metadata for chunk in chunks]
-        
-        self.collection.add(
-            ids=ids,
-            documents=documents,
-            metadatas=metadatas,
-            embeddings=all_embeddings
+
+        for chunk in chunks:
+            chunk.metadata = {
+                **chunk.metadata,
+                "content_hash": _content_hash(chunk.content),
+            }
+        stored_hashes, stored_embeddings = await self._stored_chunks(
+            [chunk.metadata["content_hash"] for chunk in chunks]
+        )
+        reused: List[DocumentChunk] = []
+        # Chunks still to embed, grouped by content so equal texts are embedded once
+        pending: Dict[str, List[DocumentChunk]] = {}
+        for chunk in chunks:
+            content_hash = chunk.metadata["content_hash"]
+            if stored_hashes.get(chunk.id) == content_hash:
+                continue
+            if content_hash in stored_embeddings:
+                reused.append(chunk)
+            else:
+                pending.setdefault(content_hash, []).append(chunk)
+
+        logger.info(
+            f"Generating embeddings for {len(pending)} of {len(chunks)} chunks "
+            f"({len(reused)} reused)"
+        )
+        queue: asyncio.Queue = asyncio.Queue()
+        inserter = asyncio.create_task(self._insert_from(queue))
+        try:
+            if reused:
+                queue.put_nowait(
+                    (
+                        reused,
+                        [
+                            stored_embeddings[chunk.metadata["content_hash"]]
+                            for chunk in reused
+                        ],
+                    )
+                )
+            hashes = list(pending)
+            texts = [pending[content_hash][0].content for content_hash in hashes]
+            start = 0
+            for batch in _micro_batches(texts, EMBED_MAX_ITEMS, EMBED_MAX_CHARS):
+                if inserter.done():
+                    break  # A failed insert is raised below
+                embeddings = await self._embed_batch(batch)
+                batch_chunks, batch_embeddings = [], []
+                for content_hash, embedding in zip(
+                    hashes[start : start + len(batch)], embeddings, strict=True
+                ):
+                    for chunk in pending[content_hash]:
+                        batch_chunks.append(chunk)
+                        batch_embeddings.append(embedding)
+                queue.put_nowait((batch_chunks, batch_embeddings))
+                start += len(batch)
+        except BaseException:
+            inserter.cancel()
+            raise
+        queue.put_nowait(None)
+        await inserter
+        logger.info(f"Stored embeddings for {len(chunks)} chunks")
+
+        # Cached results may be missing the new chunks
+        self._generation += 1
+        self.search_cache.clear()
+        return True
+
+    async def _stored_chunks(self, hashes: List[str]) -> tuple:
+        """Look up stored chunks by content hash
+
+        Returns:
+            A mapping of stored chunk ID to content hash, and one of content
+            hash to a stored embedding.
+        """
+        stored = await self.collection.get(
+            where={"content_hash": {"$in": sorted(set(hashes))}},
+            include=["metadatas", "embeddings"],
         )
+        stored_hashes = {}
+        stored_embeddings = {}
+        for chunk_id, metadata, embedding in zip(
+            stored["ids"], stored["metadatas"], stored["embeddings"], strict=True
+        ):
+            stored_hashes[chunk_id] = metadata["content_hash"]
+            stored_embeddings[metadata["content_hash"]] = embedding
+        return stored_hashes, stored_embeddings
+
+    async def delete_documents(self, document_id: str) -> bool:
+        """Remove every chunk of a document"""
+        if not self.collection:
+            await self.connect()
+        await self.collection.delete(where={"document_id": document_id})
+        # Cached results may still point at the removed chunks
+        self._generation += 1
+        self.search_cache.clear()
+        logger.info(f"Deleted document {document_id} from vector database")
         return True
-    
+
+    async def _insert_from(self, queue: asyncio.Queue) -> None:
+        """Write embedded micro-batches from the queue until it yields None
+
+        Each micro-batch is written in requests of at most CHROMA_ADD_BATCH_SIZE
+        chunks, so reused embeddings or repeated texts never make one huge add.
+        """
+        index = 0
+        while (item := await queue.get()) is not None:
+            chunks, embeddings = item
+            embeddings = _as_matrix(embeddings)
+            for start in range(0, len(chunks), CHROMA_ADD_BATCH_SIZE):
+                batch = chunks[start : start + CHROMA_ADD_BATCH_SIZE]
+                try:
+                    await self.collection.add(
+                        ids=[chunk.id for chunk in batch],
+                        documents=[chunk.content for chunk in batch],
+                        metadatas=[chunk.metadata for chunk in batch],
+                        embeddings=embeddings[start : start + CHROMA_ADD_BATCH_SIZE],
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Vector DB insert batch {index} ({len(batch)} chunks, "
+                        f"first {batch[0].id}) failed: {e}"
+                    )
+                    raise
+                index += 1
+
+    async def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """Embed one micro-batch, one text at a time if the batch runs out of memory"""
+        started = time.perf_counter()
+        try:
+            embeddings = await self.embeddings.aembed_documents(batch)
+        except (RuntimeError, MemoryError) as e:
+            # torch.cuda.OutOfMemoryError is a RuntimeError
+            if len(batch) == 1:
+                raise
+            logger.warning(
+                f"Embedding {len(batch)} texts failed ({e}); retrying one at a time"
+            )
+            embeddings = [
+                embedding
+                for text in batch
+                for embedding in await self.embeddings.aembed_documents([text])
+            ]
+        logger.debug(
+            f"Embedded {len(batch)} texts ({sum(map(len, batch))} chars) "
+            f"in {time.perf_counter() - started:.3f}s"
+        )
+        return embeddings
+
     async def search(self, query: str, limit: int = 10) -> List[SearchResult]:
         if not self.collection:
             await self.connect()
-        
-        # Generate query embedding with Mistral
-        query_embedding = await self.embeddings.aembed_query(query)
-        
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=limit
+
+        query_embedding = self.query_embeddings.get(query)
+        if query_embedding is None:
+            query_embedding = await self.embeddings.aembed_query(query)
+            self.query_embeddings[query] = query_embedding
+
+        # Results depend on the limit, so each limit gets its own namespace
+        namespace = f"limit:{limit}"
+        cached = self.search_cache.lookup(namespace, query_embedding)
+        if cached is not None:
+            return cached
+
+        generation = self._generation
+        results = await self.collection.query(
+            query_embeddings=_as_matrix([query_embedding]), n_results=limit
         )
-        
-        search_results = []
-        for i, doc_id in enumerate(results["ids"][0]):
-            chunk = DocumentChunk(
-                id=doc_id,
-                content=results["documents"][0][i],
-                metadata=results["metadatas"][0][i]
-            )
-            # Convert distance to similarity score (1 - distance)
-            score = 1 - results["distances"][0][i] if "distances" in results else 1.0
-            search_result = SearchResult(chunk=chunk, score=score)
-            search_results.append(search_result)
-        
+
+        search_results = _search_results(results, 0)
+        if generation == self._generation:
+            self.search_cache.insert(namespace, query_embedding, search_results)
         return search_results
-    
+
+    async def search_batch(
+        self, queries: List[str], limit: int = 10
+    ) -> List[List[SearchResult]]:
+        """Search several queries with one batched embedding pass and one collection query"""
+        if not queries:
+            return []
+        if not self.collection:
+            await self.connect()
+
+        query_embeddings = await self._embed_queries(queries)
+        namespace = f"limit:{limit}"
+        batch_results: List[Optional[List[SearchResult]]] = [
+            self.search_cache.lookup(namespace, embedding)
+            for embedding in query_embeddings
+        ]
+        misses = [i for i, cached in enumerate(batch_results) if cached is None]
+        if misses:
+            generation = self._generation
+            results = await self.collection.query(
+                query_embeddings=_as_matrix([query_embeddings[i] for i in misses]),
+                n_results=limit,
+            )
+            for position, i in enumerate(misses):
+                batch_results[i] = _search_results(results, position)
+                if generation == self._generation:
+                    self.search_cache.insert(
+                        namespace, query_embeddings[i], batch_results[i]
+                    )
+        return batch_results
+
+    async def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed query texts, running the model once for the texts not cached"""
+        embeddings = {query: self.query_embeddings.get(query) for query in queries}
+        missing = [
+            query for query, embedding in embeddings.items() if embedding is None
+        ]
+        if missing:
+            for query, embedding in zip(
+                missing, await self.embeddings.aembed_documents(missing), strict=True
+            ):
+                embeddings[query] = self.query_embeddings[query] = embedding
+        return [embeddings[query] for query in queries]
+
     async def health_check(self) -> bool:
         try:
-            if not self.client:
+            if not self.collection:
                 await self.connect()
-            self.client.heartbeat()
+            await self.client.heartbeat()
             return True
         except:
             return False
 
+
+class BatchingChromaVectorDB(VectorDBInterface):
+    """Coalesces chunk inserts and searches from concurrent callers.
+
+    Chunks are queued and written by a background task in a single
+    embedding + ``collection.add`` call once ``batch_size`` chunks are waiting
+    or ``flush_interval`` seconds have passed since the first one arrived.
+    Callers of ``add_documents`` still wait until their own chunks are
+    written; ``submit_documents`` only waits for room in the queue.
+
+    Single searches are gathered the same way, up to ``search_batch_size``
+    queries or ``search_flush_interval`` seconds, and answered with one
+    ``search_batch`` call per limit.
+    """
+
+    def __init__(
+        self,
+        inner: ChromaVectorDB,
+        batch_size: int = 64,
+        flush_interval: float = 0.2,
+        search_batch_size: int = SEARCH_BATCH_SIZE,
+        search_flush_interval: float = SEARCH_FLUSH_INTERVAL,
+    ):
+        self.inner = inner
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.search_batch_size = search_batch_size
+        self.search_flush_interval = search_flush_interval
+        # Created lazily so they bind to the running event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        # Chunks taken off the queue by the writer but not yet written
+        self._pending: list = []
+        self._search_queue: Optional[asyncio.Queue] = None
+        self._searcher: Optional[asyncio.Task] = None
+        # Batched searches in flight, referenced so they are not collected
+        self._searches: set = set()
+
+    async def add_document(
+        self, document_id: str, content: str, metadata: Dict[str, Any]
+    ) -> bool:
+        logger.info(f"Queueing document {document_id} for vector database insert")
+        return await self.add_documents(
+            self.inner.split_document(document_id, content, metadata)
+        )
+
+    async def add_documents(self, chunks: List[DocumentChunk]) -> bool:
+        if not chunks:
+            return True
+        self._ensure_writer()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for chunk in chunks:
+            future = loop.create_future()
+            await self._queue.put((chunk, future))
+            futures.append(future)
+        await asyncio.gather(*futures)
+        return True
+
+    async def submit_documents(self, chunks: List[DocumentChunk]) -> None:
+        """Queue chunks for writing without waiting for the write; failures are logged"""
+        self._ensure_writer()
+        for chunk in chunks:
+            await self._queue.put((chunk, None))
+
+    def pending_count(self) -> int:
+        """Chunks queued or taken by the writer but not yet written"""
+        return len(self._pending) + (
+            self._queue.qsize() if self._queue is not None else 0
+        )
+
+    async def search(self, query: str, limit: int = 10) -> List[SearchResult]:
+        self._ensure_searcher()
+        future = asyncio.get_running_loop().create_future()
+        self._search_queue.put_nowait((query, limit, future))
+        return await future
+
+    async def search_batch(
+        self, queries: List[str], limit: int = 10
+    ) -> List[List[SearchResult]]:
+        return await self.inner.search_batch(queries, limit)
+
+    async def delete_documents(self, document_id: str) -> bool:
+        # Write queued chunks first so none of the document's reappear afterwards
+        await self.flush()
+        return await self.inner.delete_documents(document_id)
+
+    async def health_check(self) -> bool:
+        return await self.inner.health_check()
+
+    async def warm_up(self) -> None:
+        await self.inner.warm_up()
+
+    async def flush(self) -> None:
+        """Write every queued chunk now"""
+        if self._queue is None:
+            return
+        batch, self._pending = self._pending, []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        for start in range(0, len(batch), self.batch_size):
+            await self._write(batch[start : start + self.batch_size])
+        # Wait for a batch the writer task may have in flight
+        async with self._write_lock:
+            pass
+
+    async def close(self) -> None:
+        """Flush queued chunks, stop the writer task and close the Chroma client"""
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+        if self._searcher is not None:
+            self._searcher.cancel()
+            self._searcher = None
+        await asyncio.gather(*self._searches, return_exceptions=True)
+        await self.inner.close()
+
+    def _ensure_writer(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+            self._write_lock = asyncio.Lock()
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Append after the await: flush() may replace the pending list meanwhile
+            item = await self._queue.get()
+            self._pending.append(item)
+            deadline = loop.time() + self.flush_interval
+            while len(self._pending) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                self._pending.append(item)
+            # flush() may have taken the pending chunks in the meantime
+            batch, self._pending = self._pending, []
+            if batch:
+                await self._write(batch)
+
+    def _ensure_searcher(self) -> None:
+        if self._search_queue is None:
+            self._search_queue = asyncio.Queue()
+        if self._searcher is None or self._searcher.done():
+            self._searcher = asyncio.create_task(self._run_searches())
+
+    async def _run_searches(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._search_queue.get()]
+            deadline = loop.time() + self.search_flush_interval
+            while len(batch) < self.search_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._search_queue.get(), timeout)
+                    )
+                except TimeoutError:
+                    break
+            by_limit: Dict[int, list] = {}
+            for query, limit, future in batch:
+                by_limit.setdefault(limit, []).append((query, future))
+            # Run concurrently so a slow query does not hold up the next window
+            for limit, searches in by_limit.items():
+                task = asyncio.create_task(self._search(searches, limit))
+                self._searches.add(task)
+                task.add_done_callback(self._searches.discard)
+
+    async def _search(self, searches: list, limit: int) -> None:
+        try:
+            results = await self.inner.search_batch(
+                [query for query, _ in searches], limit
+            )
+        except Exception as e:
+            for _, future in searches:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), search_results in zip(searches, results, strict=True):
+            if not future.done():
+                future.set_result(search_results)
+
+    async def _write(self, batch: list) -> None:
+        async with self._write_lock:
+            logger.info(f"Writing batch of {len(batch)} chunks to vector database")
+            try:
+                await self.inner.add_documents([chunk for chunk, _ in batch])
+            except Exception as e:
+                logger.error(f"Writing batch of {len(batch)} chunks failed: {e}")
+                for _, future in batch:
+                    # Submitted chunks have no caller waiting on a future
+                    if future is not None and not future.done():
+                        future.set_exception(e)
+                return
+            for _, future in batch:
+                if future is not None and not future.done():
+                    future.set_result(True)
+
+
 def get_vector_db() -> VectorDBInterface:
-    return ChromaVectorDB()
\ No newline at end of file
+    """Return the process-wide vector database, so one Chroma client is reused"""
+    global _vector_db
+    if _vector_db is None:
+        with _shared_lock:
+            if _vector_db is None:
+                # Large batches let a typical paper be embedded and written in one call
+                _vector_db = BatchingChromaVectorDB(
+                    ChromaVectorDB(), batch_size=settings.vector_write_batch_size
+                )
+    return _vector_db
@@ -0,0 +1,39 @@
+"""
+arq worker entrypoint for background document processing
+
+Run with: arq worker.WorkerSettings
+"""
+
+import logging
+
+from arq.connections import RedisSettings
+from core.config import settings
+from services.document_pipeline import build_context, close_context, warm_up_context
+from services.queue import JOBS
+
+logging.basicConfig(level=logging.INFO)
+
+
+async def startup(ctx: dict) -> None:
+    """Create and warm up the services shared by all jobs in this worker"""
+    ctx.update(build_context())
+    await warm_up_context(ctx)
+
+
+async def shutdown(ctx: dict) -> None:
+    """Flush buffered vector database writes before exiting"""
+    await close_context(ctx)
+
+
+class WorkerSettings:
+    """arq worker configuration"""
+
+    functions = list(JOBS.values())
+    on_startup = startup
+    on_shutdown = shutdown
+    redis_settings = RedisSettings.from_dsn(
+        settings.redis_url or "redis://localhost:6379/0"
+    )
+    # OCR and indexing of a large PDF can take several minutes
+    job_timeout = 600
+    max_jobs = 10
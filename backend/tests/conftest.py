@@ -8,10 +8,46 @@ import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock
 
+import factory.random
 import pytest
+from faker import Faker
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+# Required settings are read when service modules are imported
+os.environ.setdefault("SECRET_KEY", "test-secret-key-with-at-least-32-characters")
+os.environ.setdefault("MISTRAL_API_KEY", "test-mistral-api-key")
+os.environ.setdefault("HUGGINGFACE_API_TOKEN", "test-huggingface-token")
+
+# Seed Faker and factory_boy before any factory module builds its data, so
+# factory output is the same on every run
+Faker.seed("papyrus-tests")
+factory.random.reseed_random("papyrus-tests")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """Hash passwords at the lowest work factors the schemes allow.
+
+    Tests only need real argon2id and bcrypt hashes, not production-strength
+    ones; the schemes and upgrade policy stay the same.
+    """
+    from passlib.context import CryptContext
+    from services import auth_service
+
+    fast_context = CryptContext(
+        schemes=["argon2", "bcrypt"],
+        deprecated="auto",
+        argon2__type="ID",
+        argon2__memory_cost=8,
+        argon2__time_cost=1,
+        argon2__parallelism=1,
+        bcrypt__rounds=4,
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(auth_service, "pwd_context", fast_context)
+        yield
+
 
 @pytest.fixture(scope="session")
 def temp_dir():
@@ -20,9 +56,8 @@ def temp_dir():
         yield Path(tmpdir)
 
 
-@pytest.fixture
-def mock_database():
-    """Mock database connection for unit tests."""
+@pytest.fixture(scope="session")
+def session_mock_database():
     mock_db = Mock()
     mock_db.execute = AsyncMock()
     mock_db.fetch = AsyncMock()
@@ -31,6 +66,13 @@ def mock_database():
     return mock_db
 
 
+@pytest.fixture
+def mock_database(session_mock_database):
+    """Mock database connection for unit tests, reset before each test."""
+    session_mock_database.reset_mock(return_value=True, side_effect=True)
+    return session_mock_database
+
+
 @pytest.fixture
 def mock_vector_db():
     """Mock vector database client for unit tests."""
@@ -65,9 +107,13 @@ def test_config(temp_dir):
     }
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 def setup_test_environment(temp_dir):
-    """Setup test environment variables."""
+    """Setup test environment variables once for the whole session.
+
+    Tests that change one of these variables should do so with monkeypatch,
+    which restores it afterwards.
+    """
     upload_dir = temp_dir / "test_uploads"
     upload_dir.mkdir(exist_ok=True)
 
@@ -3,11 +3,17 @@ Factory classes for authentication-related test data using factory_boy.
 """
 
 import factory
-from datetime import datetime, timedelta
+from collections.abc import Mapping
+from datetime import datetime
+from functools import cache, lru_cache
+from types import MappingProxyType
 from faker import Faker
 
 fake = Faker()
 
+# Fixed timestamp shared by all factories; tests only check its type
+_NOW = datetime(2024, 1, 1)
+
 
 class UserFactory(factory.Factory):
     """Factory for creating User model test data."""
@@ -22,8 +28,8 @@ class UserFactory(factory.Factory):
     full_name = factory.LazyFunction(lambda: fake.name())
     is_active = True
     is_verified = False
-    created_at = factory.LazyFunction(datetime.now)
-    updated_at = factory.LazyFunction(datetime.now)
+    created_at = _NOW
+    updated_at = _NOW
 
 
 class UserCreateFactory(factory.Factory):
@@ -71,7 +77,7 @@ class UserResponseFactory(factory.Factory):
     full_name = factory.LazyFunction(lambda: fake.name())
     is_active = True
     is_verified = False
-    created_at = factory.LazyFunction(datetime.now)
+    created_at = _NOW
 
 
 class AdminUserFactory(UserFactory):
@@ -87,4 +93,45 @@ class InactiveUserFactory(UserFactory):
     """Factory for creating inactive user test data."""
     
     is_active = False
-    is_verified = False
\ No newline at end of file
+    is_verified = False
+
+
+# Read-only data for tests that need "some valid user" and never change it:
+# built once per session. Copy with dict() before modifying.
+@cache
+def cached_user() -> Mapping:
+    return MappingProxyType(UserFactory())
+
+
+@cache
+def cached_user_create() -> Mapping:
+    return MappingProxyType(UserCreateFactory())
+
+
+@cache
+def cached_user_login() -> Mapping:
+    return MappingProxyType(UserLoginFactory())
+
+
+@cache
+def cached_token() -> Mapping:
+    return MappingProxyType(TokenFactory())
+
+
+@cache
+def cached_user_response() -> Mapping:
+    return MappingProxyType(UserResponseFactory())
+
+
+@lru_cache(maxsize=256)
+def _cached_user_with(overrides: frozenset) -> Mapping:
+    return MappingProxyType(UserFactory(**dict(overrides)))
+
+
+def cached_user_factory(**overrides) -> Mapping:
+    """Read-only UserFactory data, built once per distinct set of overrides.
+
+    Calls with equal overrides return the same mapping; override values must
+    be hashable.
+    """
+    return _cached_user_with(frozenset(overrides.items()))
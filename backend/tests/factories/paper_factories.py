@@ -1,13 +1,57 @@
 """
 Factory classes for generating test data using factory_boy.
+
+Faker output is generated once per session into fixed-size pools, and
+factories pick entries by sequence number, so building many objects costs
+list lookups rather than Faker calls.
 """
 
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 
 import factory
 from faker import Faker
 
-fake = Faker()
+# Only the providers the pools draw from (internet needs company for domains)
+fake = Faker(
+    "en_US",
+    providers=[
+        "faker.providers.person",
+        "faker.providers.company",
+        "faker.providers.internet",
+        "faker.providers.lorem",
+    ],
+)
+
+POOL_SIZE = 1024
+NAMES = [fake.name() for _ in range(POOL_SIZE)]
+EMAILS = [fake.email() for _ in range(POOL_SIZE)]
+USERNAMES = [fake.user_name() for _ in range(POOL_SIZE)]
+URLS = [fake.url() for _ in range(POOL_SIZE)]
+TITLES = [fake.sentence(nb_words=6).rstrip(".") for _ in range(POOL_SIZE)]
+QUERIES = [fake.sentence(nb_words=8) for _ in range(POOL_SIZE)]
+ABSTRACTS = [fake.text(max_nb_chars=500) for _ in range(POOL_SIZE)]
+SNIPPETS = [fake.text(max_nb_chars=200) for _ in range(POOL_SIZE)]
+AGES = [timedelta(days=fake.random_int(0, 365)) for _ in range(POOL_SIZE)]
+_NOW = datetime.now(UTC)
+
+
+def _pick(pool: list):
+    """Sequence declaration cycling through a pool"""
+    return factory.Sequence(lambda n: pool[n % POOL_SIZE])
+
+
+def _authors(n: int) -> list[str]:
+    """One to four names from the pool"""
+    return [NAMES[(n + i) % POOL_SIZE] for i in range(1 + n % 4)]
+
+
+def _search_result(n: int, snippet: str | None = None, min_score: float = 0.1) -> dict:
+    return {
+        "id": fake.random_int(1, 1000),
+        "title": TITLES[n % POOL_SIZE],
+        "score": fake.random.uniform(min_score, 1.0),
+        "snippet": snippet or SNIPPETS[n % POOL_SIZE],
+    }
 
 
 class PaperUploadFactory(factory.Factory):
@@ -16,12 +60,10 @@ class PaperUploadFactory(factory.Factory):
     class Meta:
         model = dict  # Since we're using Pydantic models, we'll create dicts
 
-    title = factory.LazyFunction(lambda: fake.sentence(nb_words=6).rstrip("."))
-    authors = factory.LazyFunction(
-        lambda: [fake.name() for _ in range(fake.random_int(1, 4))]
-    )
-    abstract = factory.LazyFunction(lambda: fake.text(max_nb_chars=500))
-    file_url = factory.LazyFunction(lambda: fake.url())
+    title = _pick(TITLES)
+    authors = factory.Sequence(_authors)
+    abstract = _pick(ABSTRACTS)
+    file_url = _pick(URLS)
 
 
 class PaperResponseFactory(factory.Factory):
@@ -31,14 +73,10 @@ class PaperResponseFactory(factory.Factory):
         model = dict
 
     id = factory.Sequence(lambda n: n + 1)
-    title = factory.LazyFunction(lambda: fake.sentence(nb_words=6).rstrip("."))
-    authors = factory.LazyFunction(
-        lambda: [fake.name() for _ in range(fake.random_int(1, 4))]
-    )
-    abstract = factory.LazyFunction(lambda: fake.text(max_nb_chars=500))
-    upload_date = factory.LazyFunction(
-        lambda: datetime.utcnow() - timedelta(days=fake.random_int(0, 365))
-    )
+    title = _pick(TITLES)
+    authors = factory.Sequence(_authors)
+    abstract = _pick(ABSTRACTS)
+    upload_date = factory.Sequence(lambda n: _NOW - AGES[n % POOL_SIZE])
     status = factory.Iterator(["processing", "completed", "failed", "pending"])
 
 
@@ -48,7 +86,7 @@ class QueryRequestFactory(factory.Factory):
     class Meta:
         model = dict
 
-    query = factory.LazyFunction(lambda: fake.sentence(nb_words=8))
+    query = _pick(QUERIES)
     limit = factory.LazyFunction(lambda: fake.random_int(1, 50))
 
 
@@ -58,17 +96,7 @@ class QueryResponseFactory(factory.Factory):
     class Meta:
         model = dict
 
-    results = factory.LazyFunction(
-        lambda: [
-            {
-                "id": fake.random_int(1, 1000),
-                "title": fake.sentence(nb_words=6).rstrip("."),
-                "score": fake.random.uniform(0.1, 1.0),
-                "snippet": fake.text(max_nb_chars=200),
-            }
-            for _ in range(fake.random_int(0, 10))
-        ]
-    )
+    results = factory.Sequence(lambda n: [_search_result(n + i) for i in range(n % 11)])
     total_results = factory.LazyAttribute(lambda obj: len(obj.results))
     query_time = factory.LazyFunction(lambda: fake.random.uniform(0.001, 2.0))
 
@@ -80,31 +108,23 @@ class UserFactory(factory.Factory):
         model = dict
 
     id = factory.Sequence(lambda n: n + 1)
-    email = factory.LazyFunction(lambda: fake.email())
-    username = factory.LazyFunction(lambda: fake.user_name())
-    full_name = factory.LazyFunction(lambda: fake.name())
+    email = _pick(EMAILS)
+    username = _pick(USERNAMES)
+    full_name = _pick(NAMES)
     is_active = True
-    created_at = factory.LazyFunction(
-        lambda: datetime.utcnow() - timedelta(days=fake.random_int(0, 365))
-    )
+    created_at = factory.Sequence(lambda n: _NOW - AGES[n % POOL_SIZE])
 
 
 # Helper functions for common test scenarios
 def create_sample_papers(count: int = 5) -> list[dict]:
     """Create a list of sample papers for testing."""
-    return [PaperResponseFactory() for _ in range(count)]
+    return PaperResponseFactory.build_batch(count)
 
 
 def create_sample_query_results(query: str, count: int = 3) -> dict:
     """Create sample query results for testing."""
+    snippet = f"Sample snippet containing '{query}' for testing purposes."
+    start = fake.random_int(0, POOL_SIZE - 1)
     return QueryResponseFactory(
-        results=[
-            {
-                "id": fake.random_int(1, 1000),
-                "title": fake.sentence(nb_words=6).rstrip("."),
-                "score": fake.random.uniform(0.5, 1.0),
-                "snippet": f"Sample snippet containing '{query}' for testing purposes.",
-            }
-            for _ in range(count)
-        ]
+        results=[_search_result(start + i, snippet, 0.5) for i in range(count)]
     )
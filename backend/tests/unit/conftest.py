@@ -0,0 +1,36 @@
+"""
+Shared fixtures for unit tests.
+
+Factory data is built once per session by the cached factory helpers; the
+fixtures hand each test a shallow copy, so tests may modify their data freely.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from tests.factories.auth_factories import cached_user, cached_user_create
+
+
+@pytest.fixture
+def user_data():
+    """User model data."""
+    return dict(cached_user())
+
+
+@pytest.fixture
+def user_create_data():
+    """Registration request data."""
+    return dict(cached_user_create())
+
+
+@pytest.fixture(scope="module")
+def module_mock_client():
+    return Mock()
+
+
+@pytest.fixture
+def mock_client(module_mock_client):
+    """HTTP client mock, reset before each test."""
+    module_mock_client.reset_mock(return_value=True, side_effect=True)
+    return module_mock_client
@@ -1,366 +1,295 @@
 """
-Unit tests for authentication API endpoints using unittest and factory_boy.
+Unit tests for authentication API endpoints using pytest and factory_boy.
 """
 
-import unittest
-from unittest.mock import Mock, patch, MagicMock
-import json
+import re
+from datetime import datetime
+from typing import NamedTuple
+from unittest.mock import Mock
 
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.auth import router
+from core.dependencies import get_current_active_user
+from models.user import User
 from tests.factories.auth_factories import (
-    UserCreateFactory, UserLoginFactory, UserFactory, TokenFactory, UserResponseFactory
+    UserCreateFactory,
+    UserLoginFactory,
+    cached_token,
+    cached_user_create,
+    cached_user_login,
+    cached_user_response,
 )
 
 
-class TestAuthEndpoints(unittest.TestCase):
-    """Test cases for authentication endpoints without FastAPI dependencies."""
-
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.mock_client = Mock()
-        self.mock_auth_service = Mock()
-
-    def test_register_endpoint_success(self):
-        """Test successful user registration endpoint."""
-        # Given: Valid registration data
-        user_data = UserCreateFactory()
-        created_user = UserResponseFactory(
-            email=user_data["email"],
-            username=user_data["username"],
-            full_name=user_data["full_name"]
-        )
-        
-        # Mock successful response
-        mock_response = Mock()
-        mock_response.status_code = 201
-        mock_response.json.return_value = {
-            "id": created_user["id"],
-            "email": created_user["email"],
-            "username": created_user["username"],
-            "full_name": created_user["full_name"],
-            "is_active": created_user["is_active"],
-            "is_verified": created_user["is_verified"]
-        }
-        self.mock_client.post.return_value = mock_response
-
-        # When: Making registration request
-        response = self.mock_client.post("/api/v1/auth/register", json=user_data)
-
-        # Then: Should return created user
-        self.assertEqual(response.status_code, 201)
-        response_data = response.json()
-        self.assertEqual(response_data["email"], user_data["email"])
-        self.assertEqual(response_data["username"], user_data["username"])
-        self.assertEqual(response_data["full_name"], user_data["full_name"])
-        self.mock_client.post.assert_called_once_with("/api/v1/auth/register", json=user_data)
-
-    def test_register_endpoint_duplicate_email(self):
-        """Test registration with duplicate email."""
-        # Given: Registration data with existing email
-        user_data = UserCreateFactory(email="existing@example.com")
-        
+class FakeResponse(NamedTuple):
+    """HTTP response stub: a status code and a JSON body."""
+
+    status_code: int
+    body: dict
+
+    def json(self):
+        return self.body
+
+
+_CREATE = dict(cached_user_create())
+_LOGIN = dict(cached_user_login())
+_TOKEN = dict(cached_token())
+_USER = dict(cached_user_response())
+_AUTH_HEADERS = {"Authorization": "Bearer valid_bearer_token"}
+
+# (method, url, request kwargs, status, response body, body key to compare)
+ENDPOINT_CASES = [
+    pytest.param(
+        "post", "/api/v1/auth/register", {"json": _CREATE}, 201,
+        {**_USER, **{f: _CREATE[f] for f in ("email", "username", "full_name")}},
+        "email", id="register",
+    ),
+    pytest.param(
+        "post", "/api/v1/auth/register",
+        {"json": {**_CREATE, "email": "existing@example.com"}}, 400,
+        {"detail": "Email already registered"}, "detail", id="register-duplicate-email",
+    ),
+    pytest.param(
+        "post", "/api/v1/auth/login", {"json": _LOGIN}, 200, _TOKEN,
+        "access_token", id="login",
+    ),
+    pytest.param(
+        "post", "/api/v1/auth/login", {"json": {**_LOGIN, "password": "wrongpassword"}}, 401,
+        {"detail": "Incorrect email or password"}, "detail", id="login-invalid-credentials",
+    ),
+    pytest.param(
+        "get", "/api/v1/auth/me", {"headers": _AUTH_HEADERS}, 200, _USER,
+        "email", id="me",
+    ),
+    pytest.param(
+        "get", "/api/v1/auth/me", {}, 401,
+        {"detail": "Not authenticated"}, "detail", id="me-unauthorized",
+    ),
+    pytest.param(
+        "post", "/api/v1/auth/logout", {"headers": _AUTH_HEADERS}, 200,
+        {"message": "Successfully logged out"}, "message", id="logout",
+    ),
+]
+
+
+@pytest.mark.parametrize("method,url,kwargs,status,body,key", ENDPOINT_CASES)
+def test_endpoint_responses(mock_client, method, url, kwargs, status, body, key):
+    """Test endpoint status codes and response bodies."""
+    # Given: The client returns the endpoint's response
+    endpoint = getattr(mock_client, method)
+    endpoint.return_value = FakeResponse(status, body)
+
+    # When: Making the request
+    response = endpoint(url, **kwargs)
+
+    # Then: The status and body match
+    assert response.status_code == status
+    assert response.json()[key] == body[key]
+    endpoint.assert_called_once_with(url, **kwargs)
+
+
+REGISTER_VALIDATION_CASES = [
+    {"field": "email", "value": "invalid-email", "expected_status": 422},
+    {"field": "username", "value": "", "expected_status": 422},
+    {"field": "password", "value": "short", "expected_status": 422},
+]
+
+
+@pytest.mark.parametrize("case", REGISTER_VALIDATION_CASES, ids=lambda c: c["field"])
+def test_register_endpoint_validation_errors(mock_client, user_create_data, case):
+    """Test registration with various validation errors."""
+    # Given: Invalid registration data
+    user_create_data[case["field"]] = case["value"]
+
+    # Mock validation error response
+    mock_client.post.return_value = FakeResponse(
+        case["expected_status"],
+        {"detail": f"Validation error for field '{case['field']}'"},
+    )
+
+    # When: Making registration request
+    response = mock_client.post("/api/v1/auth/register", json=user_create_data)
+
+    # Then: Should return validation error
+    assert response.status_code == case["expected_status"]
+
+
+@pytest.fixture(scope="module")
+def auth_flow_client():
+    """Client mock wired for one register, login and /me sequence."""
+    registration_data = dict(cached_user_create())
+    login_data = {
+        "email": registration_data["email"],
+        "password": registration_data["password"],
+    }
+    registered_user = {
+        **cached_user_response(),
+        "email": registration_data["email"],
+        "username": registration_data["username"],
+    }
+
+    client = Mock()
+    client.post.side_effect = [
+        FakeResponse(201, registered_user),
+        FakeResponse(200, dict(cached_token())),
+    ]
+    client.get.return_value = FakeResponse(200, registered_user)
+    return client, registration_data, login_data
+
+
+def test_full_auth_flow_simulation(auth_flow_client):
+    """Test complete authentication flow simulation."""
+    # Given: A client primed for registration, login and profile access
+    client, registration_data, login_data = auth_flow_client
+
+    # When: Executing full flow
+    reg_resp = client.post("/api/v1/auth/register", json=registration_data)
+    login_resp = client.post("/api/v1/auth/login", json=login_data)
+    token = login_resp.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    me_resp = client.get("/api/v1/auth/me", headers=headers)
+
+    # Then: All steps should succeed
+    assert reg_resp.status_code == 201
+    assert login_resp.status_code == 200
+    assert me_resp.status_code == 200
+
+    # And: Data should be consistent
+    assert reg_resp.json()["email"] == me_resp.json()["email"]
+
+
+ERROR_SCENARIOS = [
+    {
+        "name": "network_error",
+        "exception": ConnectionError("Network error"),
+        "expected_handling": "Should handle network errors gracefully"
+    },
+    {
+        "name": "server_error",
+        "status_code": 500,
+        "response": {"detail": "Internal server error"},
+        "expected_handling": "Should handle server errors"
+    },
+    {
+        "name": "rate_limit_error",
+        "status_code": 429,
+        "response": {"detail": "Too many requests"},
+        "expected_handling": "Should handle rate limiting"
+    }
+]
+
+
+@pytest.mark.parametrize("scenario", ERROR_SCENARIOS, ids=lambda s: s["name"])
+def test_endpoint_error_handling_scenarios(scenario):
+    """Test various error handling scenarios."""
+    # Given: A fresh client for each scenario
+    client = Mock(spec=["post"])
+    if "exception" in scenario:
+        client.post.side_effect = scenario["exception"]
+
+        # When/Then: Should handle exception
+        with pytest.raises(type(scenario["exception"])):
+            client.post("/api/v1/auth/register", json={})
+    else:
         # Mock error response
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.json.return_value = {"detail": "Email already registered"}
-        self.mock_client.post.return_value = mock_response
-
-        # When: Making registration request
-        response = self.mock_client.post("/api/v1/auth/register", json=user_data)
-
-        # Then: Should return error
-        self.assertEqual(response.status_code, 400)
-        self.assertIn("already registered", response.json()["detail"])
-
-    def test_login_endpoint_success(self):
-        """Test successful login endpoint."""
-        # Given: Valid login credentials and token
-        login_data = UserLoginFactory()
-        token_data = TokenFactory()
-        
-        # Mock successful response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "access_token": token_data["access_token"],
-            "token_type": token_data["token_type"],
-            "expires_in": token_data["expires_in"]
-        }
-        self.mock_client.post.return_value = mock_response
-
-        # When: Making login request
-        response = self.mock_client.post("/api/v1/auth/login", json=login_data)
-
-        # Then: Should return token
-        self.assertEqual(response.status_code, 200)
-        response_data = response.json()
-        self.assertEqual(response_data["access_token"], token_data["access_token"])
-        self.assertEqual(response_data["token_type"], token_data["token_type"])
-
-    def test_login_endpoint_invalid_credentials(self):
-        """Test login with invalid credentials."""
-        # Given: Invalid login credentials
-        login_data = UserLoginFactory(password="wrongpassword")
-        
-        # Mock error response
-        mock_response = Mock()
-        mock_response.status_code = 401
-        mock_response.json.return_value = {"detail": "Incorrect email or password"}
-        self.mock_client.post.return_value = mock_response
-
-        # When: Making login request
-        response = self.mock_client.post("/api/v1/auth/login", json=login_data)
-
-        # Then: Should return error
-        self.assertEqual(response.status_code, 401)
-        self.assertIn("Incorrect email or password", response.json()["detail"])
-
-    def test_get_current_user_endpoint_success(self):
-        """Test successful current user retrieval."""
-        # Given: Valid token and user
-        token = "valid_bearer_token"
-        user_data = UserResponseFactory()
-        
-        # Mock successful response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = user_data
-        self.mock_client.get.return_value = mock_response
-
-        # When: Making request with authorization header
-        headers = {"Authorization": f"Bearer {token}"}
-        response = self.mock_client.get("/api/v1/auth/me", headers=headers)
-
-        # Then: Should return user data
-        self.assertEqual(response.status_code, 200)
-        response_data = response.json()
-        self.assertEqual(response_data["id"], user_data["id"])
-        self.assertEqual(response_data["email"], user_data["email"])
-
-    def test_get_current_user_endpoint_unauthorized(self):
-        """Test current user retrieval without valid token."""
-        # Given: No or invalid token
-        # Mock unauthorized response
-        mock_response = Mock()
-        mock_response.status_code = 401
-        mock_response.json.return_value = {"detail": "Not authenticated"}
-        self.mock_client.get.return_value = mock_response
-
-        # When: Making request without authorization header
-        response = self.mock_client.get("/api/v1/auth/me")
-
-        # Then: Should return unauthorized error
-        self.assertEqual(response.status_code, 401)
-        self.assertIn("Not authenticated", response.json()["detail"])
-
-    def test_register_endpoint_validation_errors(self):
-        """Test registration with various validation errors."""
-        validation_cases = [
-            {"field": "email", "value": "invalid-email", "expected_status": 422},
-            {"field": "username", "value": "", "expected_status": 422},
-            {"field": "password", "value": "short", "expected_status": 422},
-        ]
-        
-        for case in validation_cases:
-            with self.subTest(case=case):
-                # Given: Invalid registration data
-                user_data = UserCreateFactory()
-                user_data[case["field"]] = case["value"]
-                
-                # Mock validation error response
-                mock_response = Mock()
-                mock_response.status_code = case["expected_status"]
-                mock_response.json.return_value = {
-                    "detail": f"Validation error for field '{case['field']}'"
-                }
-                self.mock_client.post.return_value = mock_response
-
-                # When: Making registration request
-                response = self.mock_client.post("/api/v1/auth/register", json=user_data)
-
-                # Then: Should return validation error
-                self.assertEqual(response.status_code, case["expected_status"])
-
-    def test_logout_endpoint_success(self):
-        """Test successful logout endpoint."""
-        # Given: Valid token
-        token = "valid_bearer_token"
-        
-        # Mock successful response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"message": "Successfully logged out"}
-        self.mock_client.post.return_value = mock_response
-
-        # When: Making logout request
-        headers = {"Authorization": f"Bearer {token}"}
-        response = self.mock_client.post("/api/v1/auth/logout", headers=headers)
-
-        # Then: Should return success message
-        self.assertEqual(response.status_code, 200)
-        self.assertIn("Successfully logged out", response.json()["message"])
-
-
-class TestAuthEndpointIntegration(unittest.TestCase):
-    """Test auth endpoint integration scenarios."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        self.mock_client = Mock()
-
-    def test_full_auth_flow_simulation(self):
-        """Test complete authentication flow simulation."""
-        # Given: User registration and login data
-        registration_data = UserCreateFactory()
-        login_data = UserLoginFactory(
-            email=registration_data["email"],
-            password=registration_data["password"]
-        )
-        
-        # Step 1: Register user
-        register_response = Mock()
-        register_response.status_code = 201
-        register_response.json.return_value = UserResponseFactory(
-            email=registration_data["email"],
-            username=registration_data["username"]
-        )
-        
-        # Step 2: Login user
-        login_response = Mock()
-        login_response.status_code = 200
-        token_data = TokenFactory()
-        login_response.json.return_value = token_data
-        
-        # Step 3: Access protected resource
-        me_response = Mock()
-        me_response.status_code = 200
-        me_response.json.return_value = UserResponseFactory(
-            email=registration_data["email"],
-            username=registration_data["username"]
-        )
-        
-        # Mock client responses
-        self.mock_client.post.side_effect = [register_response, login_response]
-        self.mock_client.get.return_value = me_response
-
-        # When: Executing full flow
-        # Register
-        reg_resp = self.mock_client.post("/api/v1/auth/register", json=registration_data)
-        
-        # Login
-        login_resp = self.mock_client.post("/api/v1/auth/login", json=login_data)
-        
-        # Access protected resource
-        token = login_resp.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        me_resp = self.mock_client.get("/api/v1/auth/me", headers=headers)
-
-        # Then: All steps should succeed
-        self.assertEqual(reg_resp.status_code, 201)
-        self.assertEqual(login_resp.status_code, 200)
-        self.assertEqual(me_resp.status_code, 200)
-        
-        # And: Data should be consistent
-        self.assertEqual(
-            reg_resp.json()["email"], 
-            me_resp.json()["email"]
+        client.post.return_value = FakeResponse(
+            scenario["status_code"], scenario["response"]
         )
 
-    def test_endpoint_error_handling_scenarios(self):
-        """Test various error handling scenarios."""
-        error_scenarios = [
-            {
-                "name": "network_error",
-                "exception": ConnectionError("Network error"),
-                "expected_handling": "Should handle network errors gracefully"
-            },
-            {
-                "name": "server_error", 
-                "status_code": 500,
-                "response": {"detail": "Internal server error"},
-                "expected_handling": "Should handle server errors"
-            },
-            {
-                "name": "rate_limit_error",
-                "status_code": 429,
-                "response": {"detail": "Too many requests"},
-                "expected_handling": "Should handle rate limiting"
-            }
-        ]
-        
-        for scenario in error_scenarios:
-            with self.subTest(scenario=scenario["name"]):
-                # Reset the mock before each scenario
-                self.mock_client.post.reset_mock()
-                self.mock_client.post.side_effect = None
-                
-                # Given: Different error scenarios
-                if "exception" in scenario:
-                    self.mock_client.post.side_effect = scenario["exception"]
-                    
-                    # When/Then: Should handle exception
-                    with self.assertRaises(type(scenario["exception"])):
-                        self.mock_client.post("/api/v1/auth/register", json={})
-                else:
-                    # Mock error response
-                    mock_response = Mock()
-                    mock_response.status_code = scenario["status_code"]
-                    mock_response.json.return_value = scenario["response"]
-                    self.mock_client.post.return_value = mock_response
-                    
-                    # When: Making request
-                    response = self.mock_client.post("/api/v1/auth/register", json={})
-                    
-                    # Then: Should return appropriate error
-                    self.assertEqual(response.status_code, scenario["status_code"])
-
-    def test_endpoint_data_consistency_validation(self):
-        """Test endpoint data consistency validation."""
-        # Given: Multiple test scenarios using factories
-        registration_scenarios = [UserCreateFactory() for _ in range(3)]
-        login_scenarios = [UserLoginFactory() for _ in range(3)]
-
-        # When: We validate the data structure for endpoints
-        for reg_data in registration_scenarios:
-            # Then: All registration data should be valid for endpoints
-            required_fields = ["email", "username", "password", "full_name"]
-            self.assertTrue(all(field in reg_data for field in required_fields))
-            self.assertIn("@", reg_data["email"])
-            self.assertGreaterEqual(len(reg_data["password"]), 8)
-
-        for login_data in login_scenarios:
-            # Then: All login data should be valid for endpoints
-            required_fields = ["email", "password"]
-            self.assertTrue(all(field in login_data for field in required_fields))
-            self.assertIn("@", login_data["email"])
-            self.assertGreater(len(login_data["password"]), 0)
-
-    def test_authorization_header_validation(self):
-        """Test authorization header validation logic."""
-        header_cases = [
-            {"header": "Bearer eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9.token", "valid": True},
-            {"header": "Bearer ", "valid": False},
-            {"header": "InvalidFormat", "valid": False},
-            {"header": "", "valid": False},
-            {"header": None, "valid": False},
-        ]
-        
-        for case in header_cases:
-            with self.subTest(header=case["header"]):
-                # Given: Different authorization header formats
-                # When: We validate the header format
-                if case["header"]:
-                    parts = case["header"].split(" ")
-                    is_valid = (
-                        len(parts) == 2 and 
-                        parts[0] == "Bearer" and 
-                        len(parts[1]) > 0
-                    )
-                else:
-                    is_valid = False
-
-                # Then: We get the expected validation result
-                self.assertEqual(is_valid, case["valid"])
-
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        # When: Making request
+        response = client.post("/api/v1/auth/register", json={})
+
+        # Then: Should return appropriate error
+        assert response.status_code == scenario["status_code"]
+
+
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+\Z")
+_REG_FIELDS = frozenset({"email", "username", "password", "full_name"})
+_LOGIN_FIELDS = frozenset({"email", "password"})
+
+
+def test_endpoint_data_consistency_validation():
+    """Test endpoint data consistency validation."""
+    # Given: Multiple test scenarios using factories
+    registration_scenarios = UserCreateFactory.build_batch(3)
+    login_scenarios = UserLoginFactory.build_batch(3)
+
+    # When: We validate the data structure for endpoints
+    for reg_data in registration_scenarios:
+        # Then: All registration data should be valid for endpoints
+        assert reg_data.keys() >= _REG_FIELDS
+        assert _EMAIL_RE.match(reg_data["email"])
+        assert len(reg_data["password"]) >= 8
+
+    for login_data in login_scenarios:
+        # Then: All login data should be valid for endpoints
+        assert login_data.keys() >= _LOGIN_FIELDS
+        assert _EMAIL_RE.match(login_data["email"])
+        assert len(login_data["password"]) > 0
+
+
+_BEARER_RE = re.compile(r"Bearer \S+\Z")
+
+HEADER_CASES = [
+    {"header": "Bearer eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9.token", "valid": True},
+    {"header": "Bearer ", "valid": False},
+    {"header": "InvalidFormat", "valid": False},
+    {"header": "", "valid": False},
+    {"header": None, "valid": False},
+]
+
+
+@pytest.mark.parametrize("case", HEADER_CASES, ids=lambda c: repr(c["header"]))
+def test_authorization_header_validation(case):
+    """Test authorization header validation logic."""
+    # Given: Different authorization header formats
+    # When: We validate the header format
+    is_valid = bool(case["header"] and _BEARER_RE.match(case["header"]))
+
+    # Then: We get the expected validation result
+    assert is_valid == case["valid"]
+
+
+@pytest.fixture(scope="module")
+def me_client():
+    """Auth router mounted with a fixed authenticated user."""
+    user = User(
+        id=1,
+        email="alice@example.com",
+        username="alice",
+        hashed_password="hash",
+        is_active=True,
+        is_verified=False,
+        created_at=datetime(2024, 1, 1),
+    )
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    return TestClient(app)
+
+
+def test_me_sets_private_cache_headers(me_client):
+    """Test that /me is privately cacheable and carries an ETag."""
+    # When: Fetching the current user
+    response = me_client.get("/auth/me")
+
+    # Then: The profile is returned with caching headers
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, max-age=30"
+    assert response.headers["etag"].startswith('W/"1-')
+
+
+def test_me_returns_304_for_matching_etag(me_client):
+    """Test that a matching If-None-Match short-circuits with 304."""
+    # Given: The ETag from a previous response
+    etag = me_client.get("/auth/me").headers["etag"]
+
+    # When: Revalidating with that ETag
+    response = me_client.get("/auth/me", headers={"If-None-Match": etag})
+
+    # Then: No body is sent
+    assert response.status_code == 304
+    assert response.content == b""
@@ -1,280 +1,298 @@
 """
-Unit tests for authentication schemas using unittest and factory_boy.
+Unit tests for authentication schemas using pytest and factory_boy.
 """
 
-import unittest
-from unittest.mock import patch
+import re
 from datetime import datetime
 
+import pytest
+
 from tests.factories.auth_factories import (
-    UserCreateFactory, UserLoginFactory, TokenFactory, UserResponseFactory
+    UserCreateFactory, UserLoginFactory, TokenFactory, UserResponseFactory,
+    cached_token, cached_user_create, cached_user_login, cached_user_response,
 )
 
+pytestmark = pytest.mark.unit
+
+# Base64url of '{"': the start of every JWT header
+_JWT_PREFIX = "eyJ"
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]{2,}")
+_REQUIRED_CREATE = frozenset({"email", "username", "password", "full_name"})
+_REQUIRED_LOGIN = frozenset({"email", "password"})
+_REQUIRED_TOKEN = frozenset({"access_token", "token_type", "expires_in"})
+_REQUIRED_RESPONSE = frozenset({
+    "id", "email", "username", "full_name", "is_active", "is_verified", "created_at"
+})
+
+
+def _is_valid_email(email: str) -> bool:
+    """Local part, '@', and a domain with a TLD of at least 2 characters"""
+    return bool(email) and _EMAIL_RE.fullmatch(email) is not None
+
+
+def _is_valid_password(password: str, min_length: int = 8) -> bool:
+    return len(password) >= min_length
+
+
+def _is_valid_username(username: str) -> bool:
+    return bool(username and username.strip())
+
+
+@pytest.fixture(scope="module")
+def sample_create():
+    """Read-only registration payload."""
+    return cached_user_create()
+
+
+@pytest.fixture(scope="module")
+def sample_login():
+    """Read-only login payload."""
+    return cached_user_login()
+
+
+@pytest.fixture(scope="module")
+def sample_token():
+    """Read-only token payload."""
+    return cached_token()
+
+
+@pytest.fixture(scope="module")
+def sample_response():
+    """Read-only user response payload."""
+    return cached_user_response()
+
+
+def test_user_create_schema_with_factory_data(sample_create):
+    """Test UserCreate schema with factory-generated data."""
+    # Given: Factory-generated user creation data
+    user_data = sample_create
+
+    # Then: Data should have all required fields
+    assert user_data.keys() >= _REQUIRED_CREATE
+
+    # And: Email should be valid format
+    assert "@" in user_data["email"]
+    assert "." in user_data["email"]
+
+    # And: Password should meet minimum requirements
+    assert len(user_data["password"]) >= 8
+
+    # And: Username should be non-empty
+    assert len(user_data["username"]) > 0
+
+
+def test_user_login_schema_with_factory_data(sample_login):
+    """Test UserLogin schema with factory-generated data."""
+    # Given: Factory-generated login data
+    login_data = sample_login
+
+    # Then: Data should have all required fields
+    assert login_data.keys() >= _REQUIRED_LOGIN
+
+    # And: Email should be valid format
+    assert "@" in login_data["email"]
+
+    # And: Password should be non-empty
+    assert len(login_data["password"]) > 0
+
+
+def test_token_schema_with_factory_data(sample_token):
+    """Test Token schema with factory-generated data."""
+    # Given: Factory-generated token data
+    token_data = sample_token
+
+    # Then: Data should have all required fields
+    assert token_data.keys() >= _REQUIRED_TOKEN
+
+    # And: Token type should be bearer
+    assert token_data["token_type"] == "bearer"
+
+    # And: Access token should be non-empty
+    assert len(token_data["access_token"]) > 0
+
+    # And: Should look like a JWT token
+    assert token_data["access_token"].startswith(_JWT_PREFIX)
+
+    # And: Expires in should be positive integer
+    assert isinstance(token_data["expires_in"], int)
+    assert token_data["expires_in"] > 0
+
 
-class TestAuthSchemas(unittest.TestCase):
-    """Test cases for authentication Pydantic schemas."""
+def test_user_response_schema_with_factory_data(sample_response):
+    """Test UserResponse schema with factory-generated data."""
+    # Given: Factory-generated user response data
+    user_data = sample_response
 
-    def test_user_create_schema_with_factory_data(self):
-        """Test UserCreate schema with factory-generated data."""
-        # Given: Factory-generated user creation data
-        user_data = UserCreateFactory()
+    # Then: Data should have all required fields
+    assert user_data.keys() >= _REQUIRED_RESPONSE
 
-        # When: We validate the data structure
-        required_fields = ["email", "username", "password", "full_name"]
-        has_all_fields = all(key in user_data for key in required_fields)
-
-        # Then: Data should have all required fields
-        self.assertTrue(has_all_fields)
-
-        # And: Email should be valid format
-        self.assertIn("@", user_data["email"])
-        self.assertIn(".", user_data["email"])
-
-        # And: Password should meet minimum requirements
-        self.assertGreaterEqual(len(user_data["password"]), 8)
-
-        # And: Username should be non-empty
-        self.assertGreater(len(user_data["username"]), 0)
-
-    def test_user_login_schema_with_factory_data(self):
-        """Test UserLogin schema with factory-generated data."""
-        # Given: Factory-generated login data
-        login_data = UserLoginFactory()
-
-        # When: We validate the data structure
-        required_fields = ["email", "password"]
-        has_all_fields = all(key in login_data for key in required_fields)
-
-        # Then: Data should have all required fields
-        self.assertTrue(has_all_fields)
-
-        # And: Email should be valid format
-        self.assertIn("@", login_data["email"])
-
-        # And: Password should be non-empty
-        self.assertGreater(len(login_data["password"]), 0)
-
-    def test_token_schema_with_factory_data(self):
-        """Test Token schema with factory-generated data."""
-        # Given: Factory-generated token data
-        token_data = TokenFactory()
-
-        # When: We validate the data structure
-        required_fields = ["access_token", "token_type", "expires_in"]
-        has_all_fields = all(key in token_data for key in required_fields)
-
-        # Then: Data should have all required fields
-        self.assertTrue(has_all_fields)
-
-        # And: Token type should be bearer
-        self.assertEqual(token_data["token_type"], "bearer")
-
-        # And: Access token should be non-empty
-        self.assertGreater(len(token_data["access_token"]), 0)
-
-        # And: Should look like a JWT token
-        self.assertTrue(token_data["access_token"].startswith("eyJ"))
-
-        # And: Expires in should be positive integer
-        self.assertIsInstance(token_data["expires_in"], int)
-        self.assertGreater(token_data["expires_in"], 0)
-
-    def test_user_response_schema_with_factory_data(self):
-        """Test UserResponse schema with factory-generated data."""
-        # Given: Factory-generated user response data
-        user_data = UserResponseFactory()
-
-        # When: We validate the data structure
-        required_fields = [
-            "id", "email", "username", "full_name", 
-            "is_active", "is_verified", "created_at"
-        ]
-        has_all_fields = all(key in user_data for key in required_fields)
-
-        # Then: Data should have all required fields
-        self.assertTrue(has_all_fields)
-
-        # And: ID should be positive integer
-        self.assertIsInstance(user_data["id"], int)
-        self.assertGreater(user_data["id"], 0)
-
-        # And: Created at should be datetime
-        self.assertIsInstance(user_data["created_at"], datetime)
-
-        # And: Boolean fields should be boolean
-        self.assertIsInstance(user_data["is_active"], bool)
-        self.assertIsInstance(user_data["is_verified"], bool)
-
-    def test_email_validation_logic(self):
-        """Test email validation logic with various inputs."""
-        email_cases = [
-            {"email": "test@example.com", "expected": True},
-            {"email": "invalid-email", "expected": False},
-            {"email": "", "expected": False},
-            {"email": "user@domain.co.uk", "expected": True},
-            {"email": "@domain.com", "expected": False},
-            {"email": "user@", "expected": False},
-            {"email": "user.name@domain.com", "expected": True},
-        ]
-        
-        for case in email_cases:
-            with self.subTest(email=case["email"]):
-                # Given: Different email formats
-                # When: We validate the email
-                email = case["email"]
-                if not email or "@" not in email:
-                    is_valid = False
-                else:
-                    local_part, domain_part = email.split("@", 1)
-                    is_valid = bool(
-                        local_part and  # Must have something before @
-                        domain_part and  # Must have something after @
-                        "." in domain_part and  # Domain must have a dot
-                        len(domain_part.split(".")[-1]) >= 2  # TLD must be at least 2 chars
-                    )
-
-                # Then: We get the expected validation result
-                self.assertEqual(is_valid, case["expected"])
-
-    def test_password_validation_logic(self):
-        """Test password validation logic with various inputs."""
-        password_cases = [
-            {"password": "short", "min_length": 8, "expected": False},
-            {"password": "validpassword123", "min_length": 8, "expected": True},
-            {"password": "", "min_length": 8, "expected": False},
-            {"password": "12345678", "min_length": 8, "expected": True},
-            {"password": "a" * 100, "min_length": 8, "expected": True},
-            {"password": "Complex1!", "min_length": 8, "expected": True},
-        ]
-        
-        for case in password_cases:
-            with self.subTest(password=case["password"]):
-                # Given: Different password values
-                # When: We validate the password
-                is_valid = len(case["password"]) >= case["min_length"]
-
-                # Then: We get the expected validation result
-                self.assertEqual(is_valid, case["expected"])
-
-    def test_username_validation_logic(self):
-        """Test username validation logic with various inputs."""
-        username_cases = [
-            {"username": "validuser", "expected": True},
-            {"username": "", "expected": False},
-            {"username": "a", "expected": True},
-            {"username": "user123", "expected": True},
-            {"username": "user_name", "expected": True},
-            {"username": "user-name", "expected": True},
-            {"username": " ", "expected": False},
-        ]
-        
-        for case in username_cases:
-            with self.subTest(username=case["username"]):
-                # Given: Different username values
-                # When: We validate the username
-                username = case["username"]
-                is_valid = bool(username and username.strip())
-
-                # Then: We get the expected validation result
-                self.assertEqual(is_valid, case["expected"])
-
-
-class TestSchemaDataConsistency(unittest.TestCase):
-    """Test consistency and relationships between different schemas."""
-
-    def test_create_to_response_data_flow(self):
-        """Test data flow from UserCreate to UserResponse."""
-        # Given: User creation data
-        create_data = UserCreateFactory()
-        
-        # When: We simulate creating a user and getting response
-        # (This would normally involve the service layer)
-        response_data = UserResponseFactory(
-            email=create_data["email"],
-            username=create_data["username"],
-            full_name=create_data["full_name"]
-        )
-
-        # Then: Response should maintain the same core data
-        self.assertEqual(response_data["email"], create_data["email"])
-        self.assertEqual(response_data["username"], create_data["username"])
-        self.assertEqual(response_data["full_name"], create_data["full_name"])
-
-        # And: Response should have additional fields
-        self.assertIn("id", response_data)
-        self.assertIn("is_active", response_data)
-        self.assertIn("is_verified", response_data)
-        self.assertIn("created_at", response_data)
-
-    def test_login_to_token_data_flow(self):
-        """Test data flow from login to token generation."""
-        # Given: Login data
-        login_data = UserLoginFactory()
-        
-        # When: We simulate successful authentication
-        # (This would normally involve the auth service)
-        token_data = TokenFactory()
-
-        # Then: Token should be properly formatted
-        self.assertIsInstance(token_data["access_token"], str)
-        self.assertEqual(token_data["token_type"], "bearer")
-        self.assertIsInstance(token_data["expires_in"], int)
-
-        # And: Token should look like JWT
-        self.assertTrue(token_data["access_token"].startswith("eyJ"))
-
-    def test_bulk_schema_generation_consistency(self):
-        """Test that bulk generation maintains consistency."""
-        # Given: We want to create multiple instances
-        num_instances = 5
-
-        # When: We create multiple instances of each type
-        create_instances = [UserCreateFactory() for _ in range(num_instances)]
-        login_instances = [UserLoginFactory() for _ in range(num_instances)]
-        response_instances = [UserResponseFactory() for _ in range(num_instances)]
-        token_instances = [TokenFactory() for _ in range(num_instances)]
-
-        # Then: All create instances should be valid
-        for instance in create_instances:
-            self.assertIn("@", instance["email"])
-            self.assertGreater(len(instance["password"]), 7)
-
-        # And: All login instances should be valid
-        for instance in login_instances:
-            self.assertIn("@", instance["email"])
-            self.assertGreater(len(instance["password"]), 0)
-
-        # And: All response instances should be valid
-        for instance in response_instances:
-            self.assertIsInstance(instance["id"], int)
-            self.assertIn("@", instance["email"])
-
-        # And: All token instances should be valid
-        for instance in token_instances:
-            self.assertEqual(instance["token_type"], "bearer")
-            self.assertTrue(instance["access_token"].startswith("eyJ"))
-
-    def test_schema_validation_error_simulation(self):
-        """Test schema validation error scenarios."""
-        # Given: Invalid data scenarios
-        invalid_cases = [
-            {"email": "invalid", "username": "test", "password": "password123"},
-            {"email": "test@example.com", "username": "", "password": "password123"},
-            {"email": "test@example.com", "username": "test", "password": "short"},
-        ]
-
-        for case in invalid_cases:
-            with self.subTest(case=case):
-                # When: We validate the data
-                email_valid = "@" in case["email"] and "." in case["email"]
-                username_valid = bool(case["username"].strip())
-                password_valid = len(case["password"]) >= 8
-
-                overall_valid = email_valid and username_valid and password_valid
-
-                # Then: At least one validation should fail
-                self.assertFalse(overall_valid)
-
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    # And: ID should be positive integer
+    assert isinstance(user_data["id"], int)
+    assert user_data["id"] > 0
+
+    # And: Created at should be datetime
+    assert isinstance(user_data["created_at"], datetime)
+
+    # And: Boolean fields should be boolean
+    assert isinstance(user_data["is_active"], bool)
+    assert isinstance(user_data["is_verified"], bool)
+
+
+def test_create_to_response_data_flow(sample_create, sample_response):
+    """Test data flow from UserCreate to UserResponse."""
+    # Given: User creation data
+    create_data = sample_create
+
+    # When: We simulate creating a user and getting response
+    # (This would normally involve the service layer)
+    response_data = {
+        **sample_response,
+        "email": create_data["email"],
+        "username": create_data["username"],
+        "full_name": create_data["full_name"],
+    }
+
+    # Then: Response should maintain the same core data
+    assert response_data["email"] == create_data["email"]
+    assert response_data["username"] == create_data["username"]
+    assert response_data["full_name"] == create_data["full_name"]
+
+    # And: Response should have additional fields
+    assert "id" in response_data
+    assert "is_active" in response_data
+    assert "is_verified" in response_data
+    assert "created_at" in response_data
+
+
+def test_login_to_token_data_flow(sample_token):
+    """Test data flow from login to token generation."""
+    # When: We simulate successful authentication
+    # (This would normally involve the auth service)
+    token_data = sample_token
+
+    # Then: Token should be properly formatted
+    assert isinstance(token_data["access_token"], str)
+    assert token_data["token_type"] == "bearer"
+    assert isinstance(token_data["expires_in"], int)
+
+    # And: Token should look like JWT
+    assert token_data["access_token"].startswith(_JWT_PREFIX)
+
+
+INVALID_CASES = [
+    {"email": "invalid", "username": "test", "password": "password123"},
+    {"email": "test@example.com", "username": "", "password": "password123"},
+    {"email": "test@example.com", "username": "test", "password": "short"},
+]
+
+
+@pytest.mark.parametrize("case", INVALID_CASES, ids=["email", "username", "password"])
+def test_schema_validation_error_simulation(case):
+    """Test schema validation error scenarios."""
+    # When: We validate the data
+    email_valid = "@" in case["email"] and "." in case["email"]
+    username_valid = bool(case["username"].strip())
+    password_valid = len(case["password"]) >= 8
+
+    overall_valid = email_valid and username_valid and password_valid
+
+    # Then: At least one validation should fail
+    assert not overall_valid
+
+
+@pytest.mark.parametrize(
+    "email,expected",
+    [
+        ("test@example.com", True),
+        ("invalid-email", False),
+        ("", False),
+        ("user@domain.co.uk", True),
+        ("@domain.com", False),
+        ("user@", False),
+        ("user.name@domain.com", True),
+    ],
+)
+def test_email_validation_logic(email, expected):
+    """Test email validation logic with various inputs."""
+    # Given: Different email formats
+    # When/Then: Validation gives the expected result
+    assert _is_valid_email(email) is expected
+
+
+@pytest.mark.parametrize(
+    "password,expected",
+    [
+        ("short", False),
+        ("validpassword123", True),
+        ("", False),
+        ("12345678", True),
+        ("a" * 10, True),
+        ("Complex1!", True),
+    ],
+    ids=lambda p: f"length-{len(p)}" if isinstance(p, str) else None,
+)
+def test_password_validation_logic(password, expected):
+    """Test password validation logic with various inputs."""
+    # Given: Different password values
+    # When/Then: Validation gives the expected result
+    assert _is_valid_password(password) is expected
+
+
+@pytest.mark.parametrize(
+    "username,expected",
+    [
+        ("validuser", True),
+        ("", False),
+        ("a", True),
+        ("user123", True),
+        ("user_name", True),
+        ("user-name", True),
+        (" ", False),
+    ],
+)
+def test_username_validation_logic(username, expected):
+    """Test username validation logic with various inputs."""
+    # Given: Different username values
+    # When/Then: Validation gives the expected result
+    assert _is_valid_username(username) is expected
+
+
+
+def _check_create(instance):
+    assert "@" in instance["email"]
+    assert len(instance["password"]) > 7
+
+
+def _check_login(instance):
+    assert "@" in instance["email"]
+    assert len(instance["password"]) > 0
+
+
+def _check_response(instance):
+    assert isinstance(instance["id"], int)
+    assert "@" in instance["email"]
+
+
+def _check_token(instance):
+    assert instance["token_type"] == "bearer"
+    assert instance["access_token"].startswith(_JWT_PREFIX)
+
+
+@pytest.mark.parametrize(
+    "factory,check",
+    [
+        (UserCreateFactory, _check_create),
+        (UserLoginFactory, _check_login),
+        (UserResponseFactory, _check_response),
+        (TokenFactory, _check_token),
+    ],
+    ids=["create", "login", "response", "token"],
+)
+def test_bulk_schema_generation_consistency(factory, check):
+    """Test that bulk generation maintains consistency."""
+    # Given/When: Several instances from one factory
+    instances = factory.build_batch(2)
+
+    # Then: Every instance should be valid
+    for instance in instances:
+        check(instance)
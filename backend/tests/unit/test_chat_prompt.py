@@ -0,0 +1,52 @@
+"""
+Unit tests for chat prompt assembly.
+"""
+
+import unittest
+from types import SimpleNamespace
+
+from services.chat_prompt import SYSTEM_PROMPT, build_chat_messages, format_context
+
+
+def _chunk(document_id, index, content):
+    return SimpleNamespace(
+        id=f"{document_id}_chunk_{index}",
+        content=content,
+        metadata={"document_id": document_id, "chunk_index": index},
+    )
+
+
+class TestChatPrompt(unittest.TestCase):
+    """Test cases for format_context and build_chat_messages."""
+
+    def test_context_does_not_depend_on_retrieval_order(self):
+        """Test that the same chunks render identically in any score order."""
+        # Given: The same chunks returned in two different orders
+        chunks = [_chunk("a", 2, "third"), _chunk("a", 0, "first"), _chunk("b", 0, "x")]
+
+        # When: Formatting both
+        first = format_context(chunks)
+        second = format_context(list(reversed(chunks)))
+
+        # Then: The text is identical and follows document order
+        self.assertEqual(first, second)
+        self.assertLess(first.index("[1] first"), first.index("[2] third"))
+
+    def test_stable_parts_come_first(self):
+        """Test that a follow-up turn extends the previous prompt as a prefix."""
+        # Given: A first turn and its follow-up in the same session
+        context = format_context([_chunk("a", 0, "text")])
+        first = build_chat_messages(context, [], "What is it?")
+        history = [first[-1], {"role": "assistant", "content": "A paper."}]
+
+        # When: Building the follow-up
+        follow_up = build_chat_messages(context, history, "Who wrote it?")
+
+        # Then: The earlier messages are an unchanged prefix, question last
+        self.assertEqual(follow_up[: len(first)], first)
+        self.assertEqual(follow_up[0]["content"], SYSTEM_PROMPT)
+        self.assertEqual(follow_up[-1], {"role": "user", "content": "Who wrote it?"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Unit tests for the exact-match completion cache.
+"""
+
+import unittest
+
+from services.completion_cache import CompletionCache, completion_key
+
+MESSAGES = [{"role": "user", "content": "Summarize the paper"}]
+
+
+class TestCompletionCache(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the in-process fallback of CompletionCache."""
+
+    async def test_deterministic_request_is_reused(self):
+        """Test that an identical temperature-0 request hits the cache."""
+        # Given: A cached temperature-0 completion
+        cache = CompletionCache()
+        await cache.set("model", MESSAGES, 0, {"content": "A summary"})
+
+        # When: Repeating the request and changing its messages
+        hit = await cache.get("model", MESSAGES, 0)
+        miss = await cache.get("model", [{"role": "user", "content": "Other"}], 0)
+
+        # Then: Only the identical request is served, and both are counted
+        self.assertEqual(hit, {"content": "A summary"})
+        self.assertIsNone(miss)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1})
+
+    async def test_sampled_requests_are_not_cached(self):
+        """Test that requests with a non-zero temperature bypass the cache."""
+        # Given: A completion stored with temperature 0.7
+        cache = CompletionCache()
+        await cache.set("model", MESSAGES, 0.7, {"content": "A summary"})
+
+        # When: Looking it up
+        result = await cache.get("model", MESSAGES, 0.7)
+
+        # Then: Nothing was cached or counted
+        self.assertIsNone(result)
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 0})
+
+    def test_key_ignores_dict_ordering(self):
+        """Test that equal requests hash equally regardless of key order."""
+        # When: Hashing the same message with reordered keys
+        first = completion_key("model", [{"role": "user", "content": "x"}], 0)
+        second = completion_key("model", [{"content": "x", "role": "user"}], 0)
+
+        # Then: The keys match
+        self.assertEqual(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
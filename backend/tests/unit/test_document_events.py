@@ -0,0 +1,44 @@
+"""
+Unit tests for the in-process document event bus.
+"""
+
+import asyncio
+import unittest
+
+from services.document_events import DocumentEvents
+
+
+class TestDocumentEvents(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the in-memory fallback of DocumentEvents."""
+
+    async def test_subscriber_receives_published_events(self):
+        """Test that events reach subscribers of the same document only."""
+        # Given: A subscription to document 1
+        events = DocumentEvents()
+        subscription = await events.subscribe(1)
+
+        # When: Publishing for documents 2 and 1
+        await events.publish(2, {"status": "processing"})
+        await events.publish(1, {"status": "completed"})
+
+        # Then: Only document 1's event is received
+        received = await asyncio.wait_for(anext(aiter(subscription)), timeout=1)
+        self.assertEqual(received, {"status": "completed"})
+        await subscription.close()
+
+    async def test_close_removes_subscriber(self):
+        """Test that closing the last subscription drops the document entry."""
+        # Given: An open subscription
+        events = DocumentEvents()
+        subscription = await events.subscribe(1)
+
+        # When: Closing it
+        await subscription.close()
+
+        # Then: Publishing has no subscribers left to reach
+        self.assertNotIn(1, events._local)
+        await events.publish(1, {"status": "completed"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Unit tests for the PDF processing pipeline.
+"""
+
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# The pipeline builds the PDF processor and the vector database wrapper
+for _module in (
+    "aioboto3",
+    "chromadb",
+    "langchain_huggingface",
+    "mistralai",
+    "numpy",
+    "pdf2bib",
+    "semantic_text_splitter",
+):
+    pytest.importorskip(_module)
+
+from database import Base  # noqa: E402
+from models.pdf_cache import PdfCache  # noqa: E402
+from services import document_pipeline  # noqa: E402
+from services.pdf_cache import get_cached_pdf  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+DIGEST = "ab" * 32
+
+
+class FakePDFProcessor:
+    """PDF processor stand-in with configurable metadata extraction"""
+
+    def __init__(self, metadata_error: Exception | None = None):
+        self.metadata_error = metadata_error
+
+    async def extract_bib_metadata(self, file_path):
+        if self.metadata_error:
+            raise self.metadata_error
+        return {"title": "Paper", "summary": None, "bibtex": None, "authors": None}
+
+    async def process_pdf(self, file_path, file_name):
+        return "# Paper"
+
+
+class TestProcessPdfCache(unittest.IsolatedAsyncioTestCase):
+    """Test cases for process_pdf storing results in the PDF cache."""
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[PdfCache.__table__])
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        for target, value in (
+            ("AsyncSessionLocal", self.sessions),
+            ("update_status", AsyncMock()),
+            ("_local_copy", AsyncMock(return_value=("paper.pdf", False))),
+        ):
+            patcher = patch.object(document_pipeline, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def _process(self, pdf_processor: FakePDFProcessor) -> None:
+        ctx = {
+            "pdf_processor": pdf_processor,
+            "vector_db": AsyncMock(),
+            "storage": None,
+        }
+        await document_pipeline.process_pdf(
+            ctx, 1, "uploads/paper.pdf", user_id=1, content_hash=DIGEST
+        )
+
+    async def test_results_are_cached(self):
+        """Test that a fully processed PDF is cached under its digest."""
+        # When: Processing a PDF whose metadata extraction succeeds
+        await self._process(FakePDFProcessor())
+
+        # Then: Its metadata and markdown are cached
+        async with self.sessions() as db:
+            cached = await get_cached_pdf(db, DIGEST)
+        self.assertEqual(cached[0]["title"], "Paper")
+        self.assertEqual(cached[1], "# Paper")
+
+    async def test_failed_metadata_extraction_is_not_cached(self):
+        """Test that empty metadata from a failed extraction is not cached."""
+        # When: Processing a PDF whose metadata extraction fails
+        await self._process(FakePDFProcessor(ConnectionError("pdf2bib timed out")))
+
+        # Then: The document still completes
+        stages = [
+            call.args[1] for call in document_pipeline.update_status.await_args_list
+        ]
+        self.assertEqual(stages[-1], "completed")
+
+        # And: Nothing is cached, so the next upload retries extraction
+        async with self.sessions() as db:
+            self.assertIsNone(await get_cached_pdf(db, DIGEST))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Unit tests for DocumentService listing queries.
+"""
+
+import unittest
+from datetime import datetime
+
+from database import Base
+from models.document import Document
+from services.document_service import DocumentService
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+class TestDocumentListings(unittest.IsolatedAsyncioTestCase):
+    """Test cases for get_user_documents and search_documents."""
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Document.__table__])
+        self.db = async_sessionmaker(self.engine, expire_on_commit=False)()
+        self.db.add_all(
+            [
+                Document(
+                    title="Attention Is All You Need",
+                    filename="attention.pdf",
+                    user_id=1,
+                    created_at=datetime(2024, 5, 1, 12, 30, 15, 123456),
+                ),
+                Document(
+                    title="BERT",
+                    filename="bert.pdf",
+                    user_id=1,
+                    created_at=datetime(2024, 5, 2, 8, 0, 0),
+                ),
+                Document(title="Other", filename="other.pdf", user_id=2),
+            ]
+        )
+        await self.db.commit()
+        self.service = DocumentService(self.db)
+
+    async def asyncTearDown(self):
+        await self.db.close()
+        await self.engine.dispose()
+
+    async def test_user_documents_are_serialized_by_the_query(self):
+        """Test that listing rows carry string IDs and ISO timestamps."""
+        # Given: Two documents owned by user 1
+        # When: Listing the user's documents
+        rows = await self.service.get_user_documents(user_id=1)
+
+        # Then: Rows are newest first with pre-serialized fields
+        self.assertEqual(
+            [row["filename"] for row in rows], ["bert.pdf", "attention.pdf"]
+        )
+        self.assertEqual(rows[1]["id"], "1")
+        self.assertEqual(rows[1]["created_at"], "2024-05-01T12:30:15Z")
+        self.assertIsNone(rows[1]["updated_at"])
+        self.assertEqual(rows[1]["status"], "pending")
+
+    async def test_pagination(self):
+        """Test that limit and offset are applied in SQL."""
+        # Given: Two documents owned by user 1
+        # When: Requesting the second page of size one
+        rows = await self.service.get_user_documents(user_id=1, limit=1, offset=1)
+
+        # Then: Only the oldest document is returned
+        self.assertEqual([row["filename"] for row in rows], ["attention.pdf"])
+
+    async def test_keyset_pagination_continues_after_cursor(self):
+        """Test that a before cursor returns the rows following that document."""
+        # Given: The first page of size one ends with document 2
+        first_page = await self.service.get_user_documents(user_id=1, limit=1)
+        self.assertEqual(first_page[0]["id"], "2")
+
+        # When: Requesting the page after it, and a cursor owned by another user
+        rows = await self.service.get_user_documents(user_id=1, limit=1, before=2)
+        foreign = await self.service.get_user_documents(user_id=1, before=3)
+
+        # Then: The next document follows and foreign cursors match nothing
+        self.assertEqual([row["filename"] for row in rows], ["attention.pdf"])
+        self.assertEqual(foreign, [])
+
+    async def test_iter_user_documents_matches_listing(self):
+        """Test that streamed rows match the buffered listing."""
+        # Given: Two documents owned by user 1
+        # When: Iterating with a batch size smaller than the result
+        rows = [
+            row
+            async for row in self.service.iter_user_documents(user_id=1, batch_size=1)
+        ]
+
+        # Then: The same rows come back in the same order
+        self.assertEqual(rows, await self.service.get_user_documents(user_id=1))
+
+    async def test_search_is_scoped_to_user(self):
+        """Test that search matches titles case-insensitively for one user."""
+        # Given: Documents of two users
+        # When: Searching user 1's documents
+        rows = await self.service.search_documents(user_id=1, search_term="attention")
+
+        # Then: Only the matching document of user 1 is returned
+        self.assertEqual([row["title"] for row in rows], ["Attention Is All You Need"])
+        self.assertEqual(
+            await self.service.search_documents(user_id=1, search_term="other"), []
+        )
+
+    async def test_search_matches_word_prefixes_of_updated_titles(self):
+        """Test that the full-text index follows title updates."""
+        # Given: A document whose title is changed after insert
+        await self.service.update_document(
+            1, user_id=1, title="Scaled Dot-Product Attention"
+        )
+
+        # When: Searching by word prefixes, with stray punctuation
+        rows = await self.service.search_documents(user_id=1, search_term='dot "scal')
+
+        # Then: The updated document matches and its old title no longer does
+        self.assertEqual([row["filename"] for row in rows], ["attention.pdf"])
+        self.assertEqual(
+            await self.service.search_documents(user_id=1, search_term="need"), []
+        )
+
+    async def test_update_and_delete_are_scoped_to_owner(self):
+        """Test ownership scoping and the update field whitelist."""
+        # When: User 2 tries to change and delete user 1's document
+        updated = await self.service.update_document(1, user_id=2, title="Hijacked")
+        deleted = await self.service.delete_document(1, user_id=2)
+
+        # Then: Nothing changes until the owner acts
+        self.assertIsNone(updated)
+        self.assertFalse(deleted)
+        document = await self.service.update_document(
+            1, user_id=1, title="Renamed", file_path="elsewhere.pdf"
+        )
+        self.assertEqual(document.title, "Renamed")
+        self.assertNotEqual(document.file_path, "elsewhere.pdf")
+        self.assertIsNotNone(document.updated_at)
+        self.assertTrue(await self.service.delete_document(1, user_id=1))
+        self.assertIsNone(await self.service.get_document(1, user_id=1))
+
+    async def test_listing_query_uses_user_created_index(self):
+        """Test that user listings are served by the composite index."""
+        # When: Explaining the listing query
+        result = await self.db.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT id FROM documents WHERE user_id = 1 "
+                "AND (created_at, id) < ('2024-05-02', 2) "
+                "ORDER BY created_at DESC, id DESC LIMIT 10"
+            )
+        )
+        plan = result.all()
+
+        # Then: The index is used and no separate sort step is needed
+        details = " ".join(row[-1] for row in plan)
+        self.assertIn("ix_documents_user_created", details)
+        self.assertNotIn("TEMP B-TREE", details)
+
+
+if __name__ == "__main__":
+    unittest.main()
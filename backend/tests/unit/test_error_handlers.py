@@ -0,0 +1,70 @@
+"""
+Unit tests for the exception-to-HTTP error mapping decorator.
+"""
+
+import unittest
+
+from core.error_handlers import handle_auth_errors
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+ERRORS = {
+    ValidationError: (400, "Invalid data: {exc}"),
+    ValueError: (422, "Bad value"),
+    SQLAlchemyError: (500, "Database error"),
+}
+
+
+class _Model(BaseModel):
+    count: int
+
+
+@handle_auth_errors(ERRORS)
+async def _raise(exc: Exception):
+    raise exc
+
+
+class TestHandleAuthErrors(unittest.IsolatedAsyncioTestCase):
+    """Test cases for handle_auth_errors."""
+
+    async def test_mapped_exception_becomes_http_exception(self):
+        """Test that a mapped exception is translated to its status and detail."""
+        # When: The route raises a database error
+        with self.assertRaises(HTTPException) as ctx:
+            await _raise(SQLAlchemyError("boom"))
+
+        # Then: The mapped status and detail are used
+        self.assertEqual(ctx.exception.status_code, 500)
+        self.assertEqual(ctx.exception.detail, "Database error")
+
+    async def test_most_specific_mapping_wins(self):
+        """Test that a subclass mapping takes precedence over its base class."""
+        # Given: A pydantic ValidationError, which is also a ValueError
+        try:
+            _Model(count="nope")
+        except ValidationError as exc:
+            error = exc
+
+        # When: The route raises it
+        with self.assertRaises(HTTPException) as ctx:
+            await _raise(error)
+
+        # Then: The ValidationError mapping applies, with the message filled in
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.assertTrue(ctx.exception.detail.startswith("Invalid data: "))
+
+    async def test_http_and_unmapped_exceptions_propagate(self):
+        """Test that HTTPException and unmapped exceptions pass through."""
+        # When/Then: An HTTPException is re-raised unchanged
+        with self.assertRaises(HTTPException) as ctx:
+            await _raise(HTTPException(status_code=404, detail="Missing"))
+        self.assertEqual(ctx.exception.status_code, 404)
+
+        # When/Then: An unmapped exception is not translated
+        with self.assertRaises(KeyError):
+            await _raise(KeyError("sub"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -70,8 +70,7 @@ class TestPaperModels:
         """Test that factory creates unique data each time."""
         # Given: We want to create multiple papers
         # When: We create two papers using the factory
-        paper1 = PaperResponseFactory()
-        paper2 = PaperResponseFactory()
+        paper1, paper2 = PaperResponseFactory.build_batch(2)
 
         # Then: They should have different IDs
         assert paper1["id"] != paper2["id"]
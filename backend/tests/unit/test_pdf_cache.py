@@ -0,0 +1,62 @@
+"""
+Unit tests for the content-addressed PDF processing cache.
+"""
+
+import unittest
+
+from database import Base
+from models.pdf_cache import PdfCache
+from services.pdf_cache import get_cached_pdf, store_cached_pdf
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+DIGEST = "ab" * 32
+
+
+class TestPdfCache(unittest.IsolatedAsyncioTestCase):
+    """Test cases for get_cached_pdf and store_cached_pdf."""
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[PdfCache.__table__])
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def test_miss_then_hit(self):
+        """Test that stored results are returned for the same digest only."""
+        # Given: An empty cache
+        async with self.sessions() as db:
+            self.assertIsNone(await get_cached_pdf(db, DIGEST))
+
+        # When: Storing results for a digest
+        async with self.sessions() as db:
+            await store_cached_pdf(db, DIGEST, {"title": "Paper"}, "# Paper")
+
+        # Then: The digest hits and another digest still misses
+        async with self.sessions() as db:
+            self.assertEqual(
+                await get_cached_pdf(db, DIGEST), ({"title": "Paper"}, "# Paper")
+            )
+            self.assertIsNone(await get_cached_pdf(db, "cd" * 32))
+
+    async def test_duplicate_store_keeps_first_entry(self):
+        """Test that a second store for the same digest is ignored."""
+        # Given: A cached entry
+        async with self.sessions() as db:
+            await store_cached_pdf(db, DIGEST, {"title": "First"}, "first")
+
+        # When: Another job stores results for the same digest
+        async with self.sessions() as db:
+            await store_cached_pdf(db, DIGEST, {"title": "Second"}, "second")
+
+        # Then: The original entry is kept
+        async with self.sessions() as db:
+            self.assertEqual(
+                await get_cached_pdf(db, DIGEST), ({"title": "First"}, "first")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
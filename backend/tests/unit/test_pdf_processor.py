@@ -0,0 +1,166 @@
+"""
+Unit tests for the fast PDF document-info reader.
+"""
+
+import os
+import tempfile
+import unittest
+
+import pytest
+
+# The module also sets up the Mistral client and pdf2bib workers
+pytest.importorskip("mistralai")
+pytest.importorskip("pdf2bib")
+
+from services.pdf_processor import _parse_string, fast_extract_info  # noqa: E402
+
+HEADER = b"%PDF-1.4\n"
+
+
+def _info_object(info: bytes) -> bytes:
+    return b"1 0 obj\n<< " + info + b" >>\nendobj\n"
+
+
+def _classic_pdf(info: bytes) -> bytes:
+    """A PDF whose only xref section points at the /Info object"""
+    body = HEADER
+    info_offset = len(body)
+    body += _info_object(info)
+    xref_offset = len(body)
+    return body + (
+        b"xref\n0 2\n0000000000 65535 f \n%010d 00000 n \n"
+        b"trailer\n<< /Size 2 /Info 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (info_offset, xref_offset)
+    )
+
+
+def _updated_pdf(info: bytes) -> bytes:
+    """A PDF with an incremental update whose xref section lacks the /Info object"""
+    body = _classic_pdf(info)
+    first_xref = int(body.rsplit(b"startxref\n", 1)[1].split()[0])
+    object_offset = len(body)
+    body += b"2 0 obj\n<< /Type /Catalog >>\nendobj\n"
+    xref_offset = len(body)
+    return body + (
+        b"xref\n2 1\n%010d 00000 n \n"
+        b"trailer\n<< /Size 3 /Info 1 0 R /Prev %d >>\nstartxref\n%d\n%%%%EOF\n"
+        % (object_offset, first_xref, xref_offset)
+    )
+
+
+class TestParseString(unittest.TestCase):
+    """Test cases for _parse_string."""
+
+    def test_literal_string_escapes(self):
+        """Test escapes, octal codes and balanced nested parentheses."""
+        # Given: A literal string using every kind of escape
+        data = b"/Title (a\\(b\\)\\n\\101\\0612 (nested (deep)) x) /Next"
+
+        # When: Parsing from the opening parenthesis
+        value = _parse_string(data, data.index(b"("))
+
+        # Then: Escapes are decoded and nested parentheses kept
+        self.assertEqual(value, b"a(b)\nA12 (nested (deep)) x")
+
+    def test_unterminated_literal_string(self):
+        """Test that a string cut off by the read window is rejected."""
+        # Given: A literal string without its closing parenthesis
+        data = b"(never closed (inner)"
+
+        # When/Then: No value is returned
+        self.assertIsNone(_parse_string(data, 0))
+
+    def test_hex_string(self):
+        """Test hex strings with whitespace and an odd digit count."""
+        # Given: Hex strings, the second missing its final digit
+        even = b"<48 65 6C\n6C 6F>"
+        odd = b"<414>"
+
+        # When/Then: Digits are decoded, a missing final digit is taken as 0
+        self.assertEqual(_parse_string(even, 0), b"Hello")
+        self.assertEqual(_parse_string(odd, 0), b"A@")
+        self.assertIsNone(_parse_string(b"<4G>", 0))
+
+
+class TestFastExtractInfo(unittest.TestCase):
+    """Test cases for fast_extract_info."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write(self, data: bytes) -> str:
+        path = os.path.join(self.tmpdir.name, "paper.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_title_and_authors(self):
+        """Test reading the title and splitting authors on semicolons."""
+        # Given: A PDF with a title and two authors
+        path = self._write(
+            _classic_pdf(b"/Title (A Study) /Author (Ada Lovelace; Alan Turing)")
+        )
+
+        # When: Reading the document info
+        info = fast_extract_info(path)
+
+        # Then: Both fields are returned
+        self.assertEqual(
+            info, {"title": "A Study", "authors": ["Ada Lovelace", "Alan Turing"]}
+        )
+
+    def test_utf16_title_with_bom(self):
+        """Test that a UTF-16BE hex title with a byte order mark is decoded."""
+        # Given: A title encoded as UTF-16BE with a BOM, and no author
+        path = self._write(_classic_pdf(b"/Title <FEFF004800E9006C006C006F>"))
+
+        # When: Reading the document info
+        info = fast_extract_info(path)
+
+        # Then: The title is decoded and the authors are missing
+        self.assertEqual(info, {"title": "Héllo", "authors": None})
+
+    def test_follows_prev_chain(self):
+        """Test that /Prev is followed when the newest section lacks /Info."""
+        # Given: An incrementally updated PDF
+        path = self._write(_updated_pdf(b"/Title (Original)"))
+
+        # When: Reading the document info
+        info = fast_extract_info(path)
+
+        # Then: The object is found through the previous section
+        self.assertEqual(info["title"], "Original")
+
+    def test_cross_reference_stream(self):
+        """Test that cross-reference streams fall back to the full parser."""
+        # Given: A PDF whose startxref points at an xref stream object
+        body = HEADER + _info_object(b"/Title (Streamed)")
+        xref_offset = len(body)
+        body += (
+            b"2 0 obj\n<< /Type /XRef /Size 3 /Info 1 0 R >>\nstream\nendstream\nendobj\n"
+            b"startxref\n%d\n%%%%EOF\n" % xref_offset
+        )
+        path = self._write(body)
+
+        # When/Then: The fast path gives up
+        self.assertIsNone(fast_extract_info(path))
+
+    def test_startxref_past_end_of_file(self):
+        """Test that a startxref offset beyond the file is rejected."""
+        # Given: A PDF whose startxref points past its end
+        body = _classic_pdf(b"/Title (Broken)")
+        body = body.rsplit(b"startxref\n", 1)[0] + b"startxref\n999999\n%%EOF\n"
+        path = self._write(body)
+
+        # When/Then: No info is returned
+        self.assertIsNone(fast_extract_info(path))
+
+    def test_missing_info_reference(self):
+        """Test that a trailer without /Info gives None."""
+        # Given: A PDF whose trailer has no /Info entry
+        body = _classic_pdf(b"/Title (Hidden)").replace(b" /Info 1 0 R", b"")
+        path = self._write(body)
+
+        # When/Then: No info is returned
+        self.assertIsNone(fast_extract_info(path))
@@ -0,0 +1,118 @@
+"""
+Unit tests for the batch search endpoint.
+"""
+
+import pytest
+
+# main imports every router and, through them, the storage, PDF and vector
+# database services
+for _module in (
+    "aioboto3",
+    "chromadb",
+    "langchain_huggingface",
+    "mistralai",
+    "numpy",
+    "pdf2bib",
+    "semantic_text_splitter",
+):
+    pytest.importorskip(_module)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from main import app, get_shared_vector_db  # noqa: E402
+from services.vectordb_service import DocumentChunk, SearchResult  # noqa: E402
+
+
+class FakeVectorDB:
+    """Vector database stand-in that records its search_batch calls"""
+
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.calls = []
+
+    async def search_batch(self, queries, limit):
+        self.calls.append((list(queries), limit))
+        if self.error:
+            raise self.error
+        return [
+            [
+                SearchResult(
+                    chunk=DocumentChunk(
+                        id=f"{query}_chunk_0", content=query, metadata={"limit": limit}
+                    ),
+                    score=0.5,
+                )
+            ]
+            for query in queries
+        ]
+
+
+@pytest.fixture
+def vector_db():
+    """The app with the shared vector database replaced by a fake."""
+    fake = FakeVectorDB()
+    app.dependency_overrides[get_shared_vector_db] = lambda: fake
+    yield fake
+    app.dependency_overrides.pop(get_shared_vector_db, None)
+
+
+@pytest.fixture
+def client(vector_db):
+    return TestClient(app)
+
+
+def test_batch_search_groups_queries_by_limit(client, vector_db):
+    """Test that queries sharing a limit are searched together, in request order."""
+    # Given: Three queries with two distinct limits
+    batch = {
+        "queries": [
+            {"query": "a", "limit": 5},
+            {"query": "b", "limit": 3},
+            {"query": "c", "limit": 5},
+        ]
+    }
+
+    # When: Searching them in one request
+    response = client.post("/search/batch", json=batch)
+
+    # Then: One vector database call was made per limit
+    assert response.status_code == 200
+    assert sorted(vector_db.calls, key=lambda call: call[1]) == [
+        (["b"], 3),
+        (["a", "c"], 5),
+    ]
+
+    # And: Each response matches its query's position
+    responses = response.json()
+    assert [r["results"][0]["content"] for r in responses] == ["a", "b", "c"]
+    assert responses[1]["results"][0] == {
+        "id": "b_chunk_0",
+        "content": "b",
+        "metadata": {"limit": 3},
+        "score": 0.5,
+    }
+    assert [r["total_results"] for r in responses] == [1, 1, 1]
+
+
+def test_batch_search_defaults_missing_limit(client, vector_db):
+    """Test that a query without a limit is searched with the default of 10."""
+    # When: Searching a query whose limit is null
+    response = client.post(
+        "/search/batch", json={"queries": [{"query": "a", "limit": None}]}
+    )
+
+    # Then: The default limit is used
+    assert response.status_code == 200
+    assert vector_db.calls == [(["a"], 10)]
+
+
+def test_batch_search_failure_returns_500(client, vector_db):
+    """Test that a vector database failure is reported as a search failure."""
+    # Given: A vector database whose search fails
+    vector_db.error = RuntimeError("vector db down")
+
+    # When: Searching
+    response = client.post("/search/batch", json={"queries": [{"query": "a"}]})
+
+    # Then: The request fails with a generic message
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Search failed"
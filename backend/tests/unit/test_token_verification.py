@@ -0,0 +1,242 @@
+"""
+Unit tests for JWT verification in AuthService.
+"""
+
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import redis
+from services import auth_service
+from services.auth_service import (
+    TOKEN_TYPE_ACCESS,
+    TOKEN_TYPE_REFRESH,
+    AuthService,
+)
+from services.token_blacklist import TokenBlacklist
+
+
+class TestVerifyTokenCache(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the verified-token cache."""
+
+    def setUp(self):
+        """Start every test with empty caches and blacklist."""
+        auth_service.verified_token_cache.clear()
+        auth_service.rejected_token_cache.clear()
+        patcher = patch.object(auth_service, "token_blacklist", TokenBlacklist())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_repeat_verification_skips_decode(self):
+        """Test that a second verification is served from the cache."""
+        # Given: A freshly issued access token
+        token, _ = AuthService.create_access_token(data={"sub": "alice"})
+
+        # When: Verifying it twice
+        first = await AuthService.verify_token(token, token_type=TOKEN_TYPE_ACCESS)
+        with patch.object(auth_service.jwt, "decode") as mock_decode:
+            second = await AuthService.verify_token(token, token_type=TOKEN_TYPE_ACCESS)
+
+        # Then: The cached payload is returned without decoding again
+        self.assertEqual(first, second)
+        self.assertEqual(second["sub"], "alice")
+        mock_decode.assert_not_called()
+
+    def test_cached_payload_expires_with_token(self):
+        """Test that a cache entry does not outlive the token's exp claim."""
+        # Given: A payload whose token has just expired
+        payload = {"sub": "alice", "jti": "j", "exp": time.time() - 1}
+
+        # When: Caching it
+        auth_service.verified_token_cache[b"key"] = payload
+
+        # Then: The entry is already gone although the cache TTL has not elapsed
+        self.assertNotIn(b"key", auth_service.verified_token_cache)
+
+    async def test_invalidated_token_rejected_after_cache_hit(self):
+        """Test that invalidation applies to already cached tokens."""
+        # Given: A verified and cached access token
+        token, jti = AuthService.create_access_token(data={"sub": "alice"})
+        first_payload = await AuthService.verify_token(token, TOKEN_TYPE_ACCESS)
+        self.assertIsNotNone(first_payload)
+
+        # When: The token is invalidated
+        await AuthService.invalidate_token(jti, first_payload["exp"])
+
+        # Then: Verification fails even though the payload is cached
+        self.assertIsNone(await AuthService.verify_token(token, TOKEN_TYPE_ACCESS))
+
+    async def test_wrong_token_type_is_not_cached(self):
+        """Test that type mismatches are neither accepted nor cached."""
+        # Given: A refresh token
+        token, _ = AuthService.create_refresh_token(data={"sub": "alice"})
+
+        # When: Verifying it as an access token
+        result = await AuthService.verify_token(token, token_type=TOKEN_TYPE_ACCESS)
+
+        # Then: It is rejected and only the valid type gets cached
+        self.assertIsNone(result)
+        self.assertEqual(len(auth_service.verified_token_cache), 0)
+        self.assertIsNotNone(await AuthService.verify_token(token, TOKEN_TYPE_REFRESH))
+        self.assertEqual(len(auth_service.verified_token_cache), 1)
+
+    async def test_invalid_token_is_not_cached(self):
+        """Test that malformed tokens are rejected without caching."""
+        # When: Verifying garbage
+        result = await AuthService.verify_token("not-a-jwt", TOKEN_TYPE_ACCESS)
+
+        # Then: Nothing is cached
+        self.assertIsNone(result)
+        self.assertEqual(len(auth_service.verified_token_cache), 0)
+
+    async def test_rejected_token_is_not_decoded_again(self):
+        """Test that a repeated invalid token is rejected from the cache."""
+        # Given: A token that already failed verification
+        self.assertIsNone(
+            await AuthService.verify_token("not-a-jwt", TOKEN_TYPE_ACCESS)
+        )
+
+        # When: The same token is presented again
+        with patch.object(auth_service.jwt, "decode") as mock_decode:
+            result = await AuthService.verify_token("not-a-jwt", TOKEN_TYPE_ACCESS)
+
+        # Then: It is rejected without decoding
+        self.assertIsNone(result)
+        mock_decode.assert_not_called()
+
+
+class TestCreateTokenPair(unittest.IsolatedAsyncioTestCase):
+    """Test cases for fused access/refresh token issuance."""
+
+    def setUp(self):
+        """Start every test with an empty cache and blacklist."""
+        auth_service.verified_token_cache.clear()
+        patcher = patch.object(auth_service, "token_blacklist", TokenBlacklist())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_token_pair_verifies_with_expected_claims(self):
+        """Test that both tokens decode with the standard JWT library."""
+        # When: Issuing a token pair
+        access, access_jti, refresh, refresh_jti = AuthService.create_token_pair(
+            "alice"
+        )
+
+        # Then: Each token verifies as its own type with matching claims
+        access_payload = await AuthService.verify_token(
+            access, token_type=TOKEN_TYPE_ACCESS
+        )
+        refresh_payload = await AuthService.verify_token(
+            refresh, token_type=TOKEN_TYPE_REFRESH
+        )
+        self.assertEqual(access_payload["sub"], "alice")
+        self.assertEqual(access_payload["jti"], access_jti)
+        self.assertEqual(refresh_payload["jti"], refresh_jti)
+        self.assertLess(access_payload["exp"], refresh_payload["exp"])
+        self.assertIsNone(
+            await AuthService.verify_token(access, token_type=TOKEN_TYPE_REFRESH)
+        )
+
+    def test_jtis_are_unique_128_bit_hex(self):
+        """Test that buffered JTIs are distinct 32-character hex strings."""
+        # When: Drawing more JTIs than fit in one random buffer refill
+        jtis = [auth_service._new_jti() for _ in range(1000)]
+
+        # Then: All are unique and well-formed
+        self.assertEqual(len(set(jtis)), len(jtis))
+        for jti in jtis:
+            self.assertEqual(len(jti), 32)
+            int(jti, 16)
+
+
+class TestTokenBlacklist(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the in-process token blacklist fallback."""
+
+    async def test_blacklisted_jti_is_reported(self):
+        """Test that added JTIs are found until they expire."""
+        # Given: An empty blacklist
+        blacklist = TokenBlacklist()
+        now = int(time.time())
+
+        # When: Blacklisting one live and one already expired JTI
+        await blacklist.add_many([("live", now + 60), ("stale", now - 1)])
+
+        # Then: Only the live JTI is reported
+        self.assertTrue(await blacklist.contains("live"))
+        self.assertFalse(await blacklist.contains("stale"))
+        self.assertFalse(await blacklist.contains("unknown"))
+
+    async def test_redis_lookups_are_cached_briefly(self):
+        """Test that repeated checks of one JTI cost a single Redis round trip."""
+        # Given: A Redis-backed blacklist
+        blacklist = TokenBlacklist()
+        blacklist._redis = AsyncMock()
+        blacklist._redis.exists.return_value = 0
+
+        # When: Checking the same JTI twice, then blacklisting it locally
+        first = await blacklist.contains("jti")
+        second = await blacklist.contains("jti")
+        # The pipeline buffers commands synchronously; only execute() awaits
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        blacklist._redis.pipeline = MagicMock()
+        blacklist._redis.pipeline.return_value.__aenter__.return_value = pipe
+        await blacklist.add("jti", int(time.time()) + 60)
+
+        # Then: Redis was asked once and the local revocation is seen at once
+        self.assertFalse(first or second)
+        blacklist._redis.exists.assert_awaited_once()
+        pipe.execute.assert_awaited_once()
+        self.assertTrue(await blacklist.contains("jti"))
+
+    async def test_redis_outage_fails_closed(self):
+        """Test that tokens are treated as revoked while Redis is unreachable."""
+        # Given: A Redis-backed blacklist whose server is down
+        blacklist = TokenBlacklist()
+        blacklist._redis = AsyncMock()
+        blacklist._redis.exists.side_effect = redis.ConnectionError("refused")
+
+        # When/Then: Any JTI is reported as blacklisted
+        self.assertTrue(await blacklist.contains("jti"))
+
+        # And: The failure is not cached, so Redis is asked again once it is back
+        blacklist._redis.exists.side_effect = None
+        blacklist._redis.exists.return_value = 0
+        self.assertFalse(await blacklist.contains("jti"))
+
+    async def test_redis_outage_rejects_token(self):
+        """Test that verification rejects a valid token while Redis is down."""
+        # Given: A valid token and a blacklist whose Redis is unreachable
+        blacklist = TokenBlacklist()
+        blacklist._redis = AsyncMock()
+        blacklist._redis.exists.side_effect = redis.TimeoutError("timed out")
+        token, _ = AuthService.create_access_token(data={"sub": "alice"})
+
+        # When: Verifying the token
+        with patch.object(auth_service, "token_blacklist", blacklist):
+            result = await AuthService.verify_token(token, TOKEN_TYPE_ACCESS)
+
+        # Then: It is rejected instead of raising
+        self.assertIsNone(result)
+
+    async def test_failed_redis_write_is_kept_locally(self):
+        """Test that a JTI Redis could not store is still rejected by this worker."""
+        # Given: A Redis-backed blacklist whose writes fail
+        blacklist = TokenBlacklist()
+        blacklist._redis = AsyncMock()
+        blacklist._redis.exists.return_value = 0
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(side_effect=redis.ConnectionError("refused"))
+        blacklist._redis.pipeline = MagicMock()
+        blacklist._redis.pipeline.return_value.__aenter__.return_value = pipe
+
+        # When: Blacklisting a JTI
+        await blacklist.add("jti", int(time.time()) + 60)
+
+        # Then: The JTI is reported without asking Redis
+        self.assertTrue(await blacklist.contains("jti"))
+        blacklist._redis.exists.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
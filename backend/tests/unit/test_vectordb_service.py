@@ -0,0 +1,311 @@
+"""
+Unit tests for the batching vector database wrapper.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# The module builds the Chroma client, embedding model and text splitter
+for _module in ("chromadb", "langchain_huggingface", "semantic_text_splitter", "numpy"):
+    pytest.importorskip(_module)
+
+from services import vectordb_service  # noqa: E402
+from services.vectordb_service import (  # noqa: E402
+    EMBEDDING_DIM,
+    BatchingChromaVectorDB,
+    ChromaVectorDB,
+    DocumentChunk,
+    _content_hash,
+)
+
+
+def _chunk(chunk_id: str, content: str = "text") -> DocumentChunk:
+    return DocumentChunk(id=chunk_id, content=content, metadata={})
+
+
+class FakeInner:
+    """Stand-in for ChromaVectorDB that records the calls it receives"""
+
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.calls = []
+
+    async def search_batch(self, queries, limit):
+        self.calls.append(("search_batch", list(queries), limit))
+        if self.error:
+            raise self.error
+        return [[f"{query}@{limit}"] for query in queries]
+
+    async def add_documents(self, chunks):
+        self.calls.append(("add_documents", [chunk.id for chunk in chunks]))
+        if self.error:
+            raise self.error
+        return True
+
+    async def delete_documents(self, document_id):
+        self.calls.append(("delete_documents", document_id))
+        return True
+
+
+class TestSearchCoalescing(unittest.IsolatedAsyncioTestCase):
+    """Test cases for BatchingChromaVectorDB.search."""
+
+    async def asyncSetUp(self):
+        self.inner = FakeInner()
+        self.db = BatchingChromaVectorDB(self.inner, search_flush_interval=0.05)
+
+    async def asyncTearDown(self):
+        if self.db._searcher is not None:
+            self.db._searcher.cancel()
+
+    async def test_concurrent_searches_grouped_by_limit(self):
+        """Test that searches with the same limit share one search_batch call."""
+        # Given: Concurrent searches with two different limits
+        searches = [
+            self.db.search("a", 5),
+            self.db.search("b", 3),
+            self.db.search("c", 5),
+        ]
+
+        # When: Awaiting them together
+        results = await asyncio.gather(*searches)
+
+        # Then: One call per limit, each caller getting its own results
+        self.assertEqual(
+            sorted(self.inner.calls, key=lambda call: call[2]),
+            [("search_batch", ["b"], 3), ("search_batch", ["a", "c"], 5)],
+        )
+        self.assertEqual(results, [["a@5"], ["b@3"], ["c@5"]])
+
+    async def test_batch_size_caps_a_window(self):
+        """Test that a full batch is sent without waiting for the window."""
+        # Given: A batch size of two and a long window
+        self.db.search_batch_size = 2
+        self.db.search_flush_interval = 10
+
+        # When: Two searches arrive at once
+        results = await asyncio.wait_for(
+            asyncio.gather(*(self.db.search(q) for q in "xy")), timeout=1
+        )
+
+        # Then: They are answered without waiting out the window
+        self.assertEqual(results, [["x@10"], ["y@10"]])
+        self.assertEqual(self.inner.calls, [("search_batch", ["x", "y"], 10)])
+
+    async def test_inner_failure_reaches_every_waiter(self):
+        """Test that a failed batch raises in each search that was part of it."""
+        # Given: An inner database whose batched search fails
+        self.inner.error = RuntimeError("vector db down")
+
+        # When: Several searches are waiting on the same batch
+        results = await asyncio.gather(
+            self.db.search("a"), self.db.search("b"), return_exceptions=True
+        )
+
+        # Then: Every caller receives the error
+        self.assertEqual(len(self.inner.calls), 1)
+        for result in results:
+            self.assertIsInstance(result, RuntimeError)
+
+
+class TestBatchedWrites(unittest.IsolatedAsyncioTestCase):
+    """Test cases for BatchingChromaVectorDB.add_documents, flush and delete_documents."""
+
+    async def asyncSetUp(self):
+        self.inner = FakeInner()
+        # A long interval keeps chunks queued until a flush
+        self.db = BatchingChromaVectorDB(self.inner, batch_size=8, flush_interval=10)
+
+    async def asyncTearDown(self):
+        if self.db._writer is not None:
+            self.db._writer.cancel()
+
+    async def test_concurrent_adds_share_one_write(self):
+        """Test that chunks from concurrent callers are written together."""
+        # Given: Two callers adding chunks at the same time
+        adds = [
+            self.db.add_documents([_chunk("a_0"), _chunk("a_1")]),
+            self.db.add_documents([_chunk("b_0")]),
+        ]
+
+        # When: The queue is flushed while they wait
+        waiting = asyncio.gather(*adds)
+        await asyncio.sleep(0)
+        await self.db.flush()
+
+        # Then: Both succeed through a single inner write
+        self.assertEqual(await waiting, [True, True])
+        self.assertEqual(self.inner.calls, [("add_documents", ["a_0", "a_1", "b_0"])])
+
+    async def test_delete_flushes_queued_chunks_first(self):
+        """Test that queued chunks are written before a delete runs."""
+        # Given: A chunk still waiting in the queue
+        add = asyncio.create_task(self.db.add_documents([_chunk("doc_chunk_0")]))
+        await asyncio.sleep(0)
+
+        # When: Deleting its document
+        await self.db.delete_documents("doc")
+
+        # Then: The write happened before the delete
+        self.assertTrue(await add)
+        self.assertEqual(
+            self.inner.calls,
+            [("add_documents", ["doc_chunk_0"]), ("delete_documents", "doc")],
+        )
+
+    async def test_write_failure_reaches_add_documents_callers(self):
+        """Test that a failed write raises in every caller whose chunks it held."""
+        # Given: An inner database whose writes fail
+        self.inner.error = RuntimeError("insert failed")
+
+        # When: Two callers' chunks are written in one batch
+        waiting = asyncio.gather(
+            self.db.add_documents([_chunk("a_0")]),
+            self.db.add_documents([_chunk("b_0")]),
+            return_exceptions=True,
+        )
+        await asyncio.sleep(0)
+        await self.db.flush()
+
+        # Then: Both callers receive the error
+        for result in await waiting:
+            self.assertIsInstance(result, RuntimeError)
+
+    async def test_add_after_flush_is_written(self):
+        """Test that a chunk queued after a flush is picked up by the writer."""
+        # Given: A writer waiting for chunks after an earlier flush
+        self.db.flush_interval = 0.01
+        first = asyncio.create_task(self.db.add_documents([_chunk("a_0")]))
+        await asyncio.sleep(0)
+        await self.db.flush()
+        await first
+
+        # When: Adding another chunk
+        added = await asyncio.wait_for(
+            self.db.add_documents([_chunk("b_0")]), timeout=1
+        )
+
+        # Then: It is written without another flush
+        self.assertTrue(added)
+        self.assertEqual(self.inner.calls[-1], ("add_documents", ["b_0"]))
+
+
+def _vector(value: float) -> list[float]:
+    return [value] + [0.0] * (EMBEDDING_DIM - 1)
+
+
+class FakeEmbeddings:
+    """Embedding model stand-in that records the texts it embeds"""
+
+    def __init__(self):
+        self.embedded = []
+
+    async def aembed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [_vector(float(len(text))) for text in texts]
+
+
+class FakeCollection:
+    """In-memory Chroma collection supporting the calls add_documents makes"""
+
+    def __init__(self):
+        self.rows = {}
+        self.added = []
+
+    async def get(self, where, include):
+        hashes = set(where["content_hash"]["$in"])
+        ids = [
+            chunk_id
+            for chunk_id, (metadata, _) in self.rows.items()
+            if metadata["content_hash"] in hashes
+        ]
+        return {
+            "ids": ids,
+            "metadatas": [self.rows[chunk_id][0] for chunk_id in ids],
+            "embeddings": [self.rows[chunk_id][1] for chunk_id in ids],
+        }
+
+    async def add(self, ids, documents, metadatas, embeddings):
+        for chunk_id, metadata, embedding in zip(
+            ids, metadatas, embeddings, strict=True
+        ):
+            self.rows[chunk_id] = (metadata, list(embedding))
+            self.added.append(chunk_id)
+
+
+class TestContentHashDeduplication(unittest.IsolatedAsyncioTestCase):
+    """Test cases for ChromaVectorDB.add_documents skipping and reusing stored chunks."""
+
+    async def asyncSetUp(self):
+        self.embeddings = FakeEmbeddings()
+        with patch(
+            "services.vectordb_service.get_embeddings", return_value=self.embeddings
+        ):
+            self.db = ChromaVectorDB()
+        self.db.collection = FakeCollection()
+        self.stored = _vector(42.0)
+        self.db.collection.rows["a_0"] = (
+            {"content_hash": _content_hash("shared")},
+            self.stored,
+        )
+
+    async def test_only_new_text_is_embedded(self):
+        """Test that stored chunks are skipped and stored text reuses its embedding."""
+        # Given: A stored chunk, a new ID with the same text, and a repeated new text
+        chunks = [
+            _chunk("a_0", "shared"),
+            _chunk("b_0", "shared"),
+            _chunk("c_0", "fresh"),
+            _chunk("c_1", "fresh"),
+        ]
+
+        # When: Adding the chunks
+        await self.db.add_documents(chunks)
+
+        # Then: Only the new text reached the model, and only once
+        self.assertEqual(self.embeddings.embedded, ["fresh"])
+
+        # And: The stored chunk was not rewritten; the others were
+        self.assertEqual(sorted(self.db.collection.added), ["b_0", "c_0", "c_1"])
+
+        # And: The copy of stored text reuses the stored embedding
+        self.assertEqual(self.db.collection.rows["b_0"][1], self.stored)
+        self.assertEqual(self.db.collection.rows["c_1"][1], _vector(5.0))
+
+
+class TestSharedVectorDB(unittest.TestCase):
+    """Test cases for get_vector_db."""
+
+    def test_concurrent_first_calls_build_one_client(self):
+        """Test that racing first callers share a single Chroma client."""
+        # Given: No shared instance yet, and a client that is slow to build
+        built = []
+
+        def build_client():
+            # Like ChromaVectorDB, load the shared embedding model first
+            vectordb_service.get_embeddings()
+            time.sleep(0.05)
+            built.append(threading.get_ident())
+            return MagicMock(spec=ChromaVectorDB)
+
+        with (
+            patch.object(vectordb_service, "_vector_db", None),
+            patch.object(vectordb_service, "_embeddings", None),
+            patch.object(vectordb_service, "HuggingFaceEmbeddings", MagicMock()),
+            patch.object(vectordb_service, "ChromaVectorDB", side_effect=build_client),
+            ThreadPoolExecutor(max_workers=4) as pool,
+        ):
+            # When: Several threads ask for it at once
+            results = list(
+                pool.map(lambda _: vectordb_service.get_vector_db(), range(4))
+            )
+
+        # Then: One client was built and every caller got the same instance
+        self.assertEqual(len(built), 1)
+        self.assertTrue(all(result is results[0] for result in results))
@@ -70,6 +70,12 @@ case "$1" in
         cd backend && $PYTHON_CMD -m pytest tests/unit/ -v --tb=short -x -m unit
         ;;
 
+    "test-parallel")
+        echo "🧵 Running unit tests across all cores..."
+        check_environment
+        cd backend && PYTHONDONTWRITEBYTECODE=1 $PYTHON_CMD -m pytest tests/unit/ -n auto --dist=load --tb=short
+        ;;
+
     "test-integration")
         echo "🔗 Running integration tests..."
         check_environment
@@ -175,6 +181,7 @@ case "$1" in
         echo "Testing Commands:"
         echo "  test          - Run all tests with coverage"
         echo "  test-unit     - Run unit tests only"
+        echo "  test-parallel - Run unit tests in parallel (pytest-xdist)"
         echo "  test-integration - Run integration tests only"
         echo "  test-fast     - Run fast tests only (for pre-commit)"
         echo "  test-coverage - Run tests with detailed coverage"